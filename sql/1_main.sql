@@ -19,4 +19,13 @@ CREATE TABLE
     IF NOT EXISTS ttv_tags (
         tag_name TEXT PRIMARY KEY,
         tag_content TEXT NOT NULL
+    );
+
+CREATE TABLE
+    /* Startup timelines, see `core.startup` */
+    IF NOT EXISTS ttv_startup_timelines (
+        id SERIAL PRIMARY KEY,
+        started_at TIMESTAMPTZ DEFAULT (NOW () AT TIME zone 'utc'),
+        total REAL NOT NULL,
+        phases JSONB NOT NULL
     );
\ No newline at end of file
@@ -36,8 +36,12 @@ class Env(EnvConfig):
     STEAM_IRENESTEST_PASSWORD: str
     STEAM_IRENESBOT_USERNAME: str
     STEAM_IRENESBOT_PASSWORD: str
+    STEAM_IRENESBOT_SHARDS: list[tuple[str, str]] = []
+    """Extra `(username, password)` Steam accounts for `Dota2ClientPool` shards, given as a JSON list in `.env`."""
     STRATZ_BEARER: str
     STEAM_API_KEY: str
+    STEAM_API_EXTRA_KEYS: list[str] = []
+    """Extra Steam Web API keys for `SteamWebAPIClient` key pool, given as a JSON list in `.env`."""
     SPOTIFY_AIDENWALLIS: str
     EVENTSUB: str
     WEBHOOK_LOGGER: str
@@ -47,7 +51,9 @@ class Env(EnvConfig):
 
 env = Env()  # pyright: ignore[reportCallIssue]
 
-secrets_list = list(map(str, env.model_dump().values()))
+secrets_list = list(map(str, env.model_dump(exclude={"STEAM_IRENESBOT_SHARDS", "STEAM_API_EXTRA_KEYS"}).values()))
+secrets_list += [secret for account in env.STEAM_IRENESBOT_SHARDS for secret in account]
+secrets_list += env.STEAM_API_EXTRA_KEYS
 DO_NOT_SPOIL_PATTERN = re.compile("|".join(map(re.escape, secrets_list)))
 
 
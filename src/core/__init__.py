@@ -1,3 +1,4 @@
 from .bases import *
 from .bot import *
 from .logs import *
+from .startup import *
@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import graphlib
+import itertools
 import logging
 import platform
 import pprint
-import sys
+import random
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, TypedDict, override
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, overload, override
 
 import discord
-import steam
+import orjson
 import twitchio
 from discord.utils import MISSING
 from twitchio import eventsub
@@ -18,16 +20,22 @@ from twitchio.ext import commands
 from twitchio.web import StarletteAdapter
 
 from config import env
-from modules import PUBLIC_D9MMRBOT, get_modules
-from utils import const, dota2 as dota2utils, errors
+from modules import PUBLIC_D9MMRBOT, get_modules, module_graph
+from utils import const, errors
 
 from .bases import IreContext
 from .error_manager import ErrorManager
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
     from aiohttp import ClientSession
 
     from types_.database import PoolTypedWithAny
+    from utils import dota2 as dota2utils
+    from utils.connector import HTTPStats
+
+    from .startup import StartupTimeline
 
     class LoadTokensQueryRow(TypedDict):
         user_id: str
@@ -167,6 +175,8 @@ class IreBot(commands.AutoBot):
         self,
         *,
         session: ClientSession,
+        http_stats: HTTPStats,
+        startup: StartupTimeline,
         pool: PoolTypedWithAny,
         subscriptions: list[eventsub.SubscriptionPayload],
         scopes_only: bool,
@@ -197,8 +207,21 @@ class IreBot(commands.AutoBot):
             force_subscribe=force_subscribe,  # Set to `True` if we need urgent manual refreshing eventsub subs.
         )
         self.session: ClientSession = session
+        self.http_stats: HTTPStats = http_stats
+        """Per-host timings of `session` requests."""
+        self.startup: StartupTimeline = startup
         self.pool: PoolTypedWithAny = pool
         self.scopes_only: bool = scopes_only
+        self.token_validation_limit: int = 10
+        """Max amount of tokens validated against Twitch at the same time in `load_tokens`."""
+        self.eventsub_batch_size: int = 50
+        """Max amount of EventSub subscriptions in one `multi_subscribe` batch."""
+        self.eventsub_batch_limit: int = 4
+        """Max amount of EventSub subscription batches sent at the same time.
+        Twitch gives the app 800 requests per minute, so ~200 subscriptions in flight leave room for the rest.
+        """
+        self.eventsub_max_retries: int = 3
+        """Max amount of retries for subscriptions that failed with a rate limit or a Twitch server error."""
 
         self.test_subset_mode: bool = platform.system() == "Windows"
         """A boolean flag indicating whether we launch the whole bot (on VPS machine)
@@ -207,6 +230,9 @@ class IreBot(commands.AutoBot):
         """
 
         self.modules_to_load: tuple[str, ...] = get_modules(test=self.test_subset_mode)
+        self.startup.expect("pool", "eventsub_subscriptions", "tokens", "modules")
+        if PUBLIC_D9MMRBOT in self.modules_to_load:
+            self.startup.expect("steam_login", "gc_ready", "fill_friends", "storage_warmup")
         self.error_manager = ErrorManager(self)
 
         self.streamers: dict[str, Streamer] = {}
@@ -214,8 +240,11 @@ class IreBot(commands.AutoBot):
         self.friends_index_ready: asyncio.Event = asyncio.Event()
 
         # initialized later
+        self.dota2_pool: dota2utils.Dota2ClientPool = MISSING
         self.dota2: dota2utils.Dota2Client = MISSING
+        """The primary client of `self.dota2_pool`."""
         self.launch_time: datetime.datetime
+        self.startup_report_task: asyncio.Task[None]
         self.logs_via_webhook_handler: logging.Handler
 
     def show_oauth_helper(self, scopes: list[str], prefix: str) -> str:
@@ -297,13 +326,79 @@ class IreBot(commands.AutoBot):
             log.warning(msg)
             return
 
-        for module in self.modules_to_load:
-            log.debug("Loading module: %s", module)
+        self.startup_report_task = asyncio.create_task(self.report_startup())
+        with self.startup.phase("modules"):
+            await self.load_modules(self.modules_to_load)
+
+    async def report_startup(self) -> None:
+        """Log the startup timeline and store it once the bot is fully ready."""
+        await self.startup.ready.wait()
+        log.info("%s is fully ready in %s", self.__class__.__name__, self.startup.summary())
+        query = """
+            INSERT INTO ttv_startup_timelines (total, phases)
+            VALUES ($1, $2)
+        """
+        await self.pool.execute(query, self.startup.total, orjson.dumps(self.startup.durations()).decode())
+
+    async def load_modules(self, modules: Iterable[str], *, reload: bool = False) -> list[str]:
+        """Load (or reload) modules concurrently, every module right after the modules it depends on.
+
+        Failures are reported through `ErrorManager`; modules that depend on a failed one are not loaded at all.
+        Modules that are already loaded are skipped when not reloading, callers should check `modules` beforehand.
+
+        Returns
+        -------
+        list[str]
+            Modules that failed to (re)load, including skipped ones.
+        """
+        requested = list(modules)
+
+        def keep(module: str) -> bool:
+            # reload only what was asked for (dependencies just define the order);
+            # load dependencies too unless they are already loaded
+            return module in requested if reload else module not in self.modules
+
+        graph = {module: tuple(filter(keep, deps)) for module, deps in module_graph(requested).items() if keep(module)}
+
+        sorter = graphlib.TopologicalSorter(graph)
+        sorter.prepare()
+        pending: dict[asyncio.Task[bool], str] = {}
+        failed: list[str] = []
+
+        async def load(module: str) -> bool:
+            log.debug("%s module: %s", "Reloading" if reload else "Loading", module)
             try:
-                await self.load_module(module)
-            except commands.ModuleLoadFailure as error:
+                await (self.reload_module(module) if reload else self.load_module(module))
+            except commands.ModuleError as error:
                 embed = discord.Embed(title="Module Load Error", colour=0x12A28A)
                 await self.error_manager.register(error, embed=embed)
+                return False
+            return True
+
+        try:
+            while sorter.is_active():
+                for module in sorter.get_ready():
+                    if failed_deps := [dep for dep in graph[module] if dep in failed]:
+                        failed.append(module)
+                        sorter.done(module)
+                        log.warning("Skipping module %s because its dependencies failed to load: %s", module, failed_deps)
+                        continue
+                    pending[asyncio.create_task(load(module))] = module
+                if not pending:
+                    continue
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    module = pending.pop(task)
+                    if not task.result():
+                        failed.append(module)
+                    sorter.done(module)
+        except BaseException:
+            # something other than `ModuleError` (or we got cancelled) - don't leave other loads running unattended
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+        return failed
 
     @override
     async def event_oauth_authorized(self, payload: twitchio.authentication.UserTokenPayload) -> None:
@@ -331,6 +426,121 @@ class IreBot(commands.AutoBot):
         if resp.errors:
             log.warning("Failed to subscribe to: %r, for user: %s", resp.errors, payload.user_id)
 
+    @overload
+    async def multi_subscribe(
+        self,
+        subscriptions: Collection[eventsub.SubscriptionPayload],
+        *,
+        wait: Literal[True] = True,
+        stop_on_error: bool = False,
+    ) -> twitchio.MultiSubscribePayload: ...
+
+    @overload
+    async def multi_subscribe(
+        self,
+        subscriptions: Collection[eventsub.SubscriptionPayload],
+        *,
+        wait: Literal[False] = False,
+        stop_on_error: bool = False,
+    ) -> asyncio.Task[twitchio.MultiSubscribePayload]: ...
+
+    @override
+    async def multi_subscribe(
+        self,
+        subscriptions: Collection[eventsub.SubscriptionPayload],
+        *,
+        wait: bool = True,
+        stop_on_error: bool = False,
+    ) -> twitchio.MultiSubscribePayload | asyncio.Task[twitchio.MultiSubscribePayload]:
+        """Subscribe to EventSub subscriptions in concurrent batches with retries.
+
+        Both startup subscriptions (`AutoBot` subscribes to its `subscriptions` kwarg with this)
+        and `event_oauth_authorized` end up here. Every public streamer adds 3 subscriptions, so with hundreds of them
+        subscriptions are split into batches of `eventsub_batch_size` and `eventsub_batch_limit` batches are sent
+        at the same time. Subscriptions that failed with a rate limit or a Twitch server error are retried with backoff,
+        every batch is reported in the logs. "Already exists" conflicts (i.e. reused conduit) are not errors.
+
+        `wait` and `stop_on_error` keep their meaning from `AutoClient.multi_subscribe`: `wait=False` returns
+        the background task, `stop_on_error=True` raises the first (non-transient) error and cancels other batches.
+        """
+        if not wait:
+            return asyncio.create_task(self.subscribe_batches(subscriptions, stop_on_error=stop_on_error))
+        return await self.subscribe_batches(subscriptions, stop_on_error=stop_on_error)
+
+    async def subscribe_batches(
+        self, subscriptions: Collection[eventsub.SubscriptionPayload], *, stop_on_error: bool
+    ) -> twitchio.MultiSubscribePayload:
+        """Subscribe to all batches concurrently and merge their results, see `multi_subscribe`."""
+        batches = [list(batch) for batch in itertools.batched(subscriptions, self.eventsub_batch_size, strict=False)]
+        semaphore = asyncio.Semaphore(self.eventsub_batch_limit)
+        tasks = [
+            asyncio.create_task(self.subscribe_batch(batch, f"{i}/{len(batches)}", semaphore, stop_on_error=stop_on_error))
+            for i, batch in enumerate(batches, 1)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # batches still waiting for the semaphore are never sent
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        errors = [error for result in results for error in result.errors]
+        log.info(
+            "Subscribed to %s/%s EventSub subscriptions in %s batches.",
+            len(subscriptions) - len(errors),
+            len(subscriptions),
+            len(batches),
+        )
+        return twitchio.MultiSubscribePayload(success=[s for result in results for s in result.success], errors=errors)
+
+    async def subscribe_batch(
+        self,
+        batch: list[eventsub.SubscriptionPayload],
+        label: str,
+        semaphore: asyncio.Semaphore,
+        *,
+        stop_on_error: bool,
+    ) -> twitchio.MultiSubscribePayload:
+        """Subscribe to one batch of EventSub subscriptions, retrying transient failures with backoff.
+
+        With `stop_on_error` the first error that is neither a conflict nor retried is raised once the batch is done.
+        """
+        success: list[twitchio.MultiSubscribeSuccess] = []
+        errors: list[twitchio.MultiSubscribeError] = []
+        conflicts = retries = 0
+        async with semaphore:
+            for attempt in itertools.count():
+                resp: twitchio.MultiSubscribePayload = await super().multi_subscribe(batch)
+                success.extend(resp.success)
+                transient: list[twitchio.MultiSubscribeError] = []
+                for error in resp.errors:
+                    status = error.error.status if isinstance(error.error, twitchio.HTTPException) else None
+                    if status == 409:  # already subscribed
+                        conflicts += 1
+                    elif status is not None and (status == 429 or status >= 500):
+                        transient.append(error)
+                    else:
+                        errors.append(error)
+
+                if not transient or attempt >= self.eventsub_max_retries:
+                    errors.extend(transient)
+                    break
+                retries += len(transient)
+                batch = [error.subscription for error in transient]
+                backoff = 4.0 * 2**attempt
+                await asyncio.sleep(backoff / 2 + random.uniform(0, backoff / 2))
+
+        report = f"{len(success)} subscribed, {conflicts} already existed, {retries} retried, {len(errors)} failed"
+        if errors:
+            failed = ", ".join(f"{error.subscription.__class__.__name__} ({error.error})" for error in errors)
+            log.warning("EventSub batch %s: %s: %s", label, report, failed)
+            if stop_on_error:
+                raise errors[0].error
+        else:
+            log.debug("EventSub batch %s: %s", label, report)
+        return twitchio.MultiSubscribePayload(success=success, errors=errors)
+
     @override
     async def add_token(self, token: str, refresh: str) -> twitchio.authentication.ValidateTokenPayload:
         """Add token to the twitchio client and into the bot's database.
@@ -344,6 +554,12 @@ class IreBot(commands.AutoBot):
         resp: twitchio.authentication.ValidateTokenPayload = await super().add_token(token, refresh)
 
         # Store our tokens in a simple SQLite Database when they are authorized...
+        await self.upsert_token(resp.user_id, token, refresh)
+        log.info("Added token to the database for user: %s", resp.user_id)
+        return resp
+
+    async def upsert_token(self, user_id: str | None, token: str, refresh: str) -> None:
+        """Store user's token in the database."""
         query = """
             INSERT INTO ttv_tokens
             (user_id, token, refresh)
@@ -353,20 +569,47 @@ class IreBot(commands.AutoBot):
                 token = excluded.token,
                 refresh = excluded.refresh;
         """
-        await self.pool.execute(query, resp.user_id, token, refresh)
-        log.info("Added token to the database for user: %s", resp.user_id)
-        return resp
+        await self.pool.execute(query, user_id, token, refresh)
 
     @override
     async def load_tokens(self, _: str | None = None) -> None:  # _ is `path`
+        """Load tokens from the database into the client.
+
+        Tokens are validated against Twitch concurrently (but only `token_validation_limit` at a time)
+        and written back only if Twitch refreshed them during validation.
+        Tokens that failed validation are reported in one log message at the end.
+        """
         # We don't need to call this manually, it is called in .login() from .start() internally...
         query = """
             SELECT *
             FROM ttv_tokens
         """
-        rows: list[LoadTokensQueryRow] = await self.pool.fetch(query)
-        for row in rows:
-            await self.add_token(row["token"], row["refresh"])
+        with self.startup.phase("tokens"):
+            rows: list[LoadTokensQueryRow] = await self.pool.fetch(query)
+            semaphore = asyncio.Semaphore(self.token_validation_limit)
+            results = await asyncio.gather(*(self.load_token(row, semaphore) for row in rows))
+
+        invalid = [f"{row['user_id']} ({error})" for row, error in zip(rows, results, strict=True) if error is not None]
+        if invalid:
+            log.warning("Failed to load %s/%s tokens: %s", len(invalid), len(rows), ", ".join(invalid))
+        else:
+            log.info("Loaded %s tokens.", len(rows))
+
+    async def load_token(self, row: LoadTokensQueryRow, semaphore: asyncio.Semaphore) -> Exception | None:
+        """Validate a token from the database; returns the validation error if the token is invalid/expired."""
+        async with semaphore:
+            try:
+                # not `self.add_token` - there is no need to write the same token back into the database
+                resp = await super().add_token(row["token"], row["refresh"])
+            except (twitchio.HTTPException, twitchio.InvalidTokenException) as error:
+                return error
+
+        stored = self.tokens.get(resp.user_id or row["user_id"])
+        if stored and (stored["token"], stored["refresh"]) != (row["token"], row["refresh"]):
+            # twitchio refreshed an expired token while validating it
+            await self.upsert_token(resp.user_id, stored["token"], stored["refresh"])
+            log.info("Updated refreshed token in the database for user: %s", resp.user_id)
+        return None
 
     @override
     async def start(
@@ -378,28 +621,27 @@ class IreBot(commands.AutoBot):
         save_tokens: bool = True,
     ) -> None:
         if PUBLIC_D9MMRBOT in self.modules_to_load:
-            self.dota2 = dota2utils.Dota2Client(self)
-            try:
-                await asyncio.gather(
-                    super().start(token, with_adapter=with_adapter, load_tokens=load_tokens, save_tokens=save_tokens),
-                    self.dota2.login(),
-                )
-            # A potential workaround for steam login issues
-            # https://github.com/Gobot1234/steam.py/issues/446
-            # # TODO: Check if it works as desired.
-            except steam.errors.NoCMsFound:
-                log.warning("🔴 Encountered `steam.errors.NoCMsFound` - restarting. 🔴")
-                sys.exit(1)
-            except steam.errors.LoginError:
-                log.warning("🔴 Encountered `steam.errors.LoginError` - restarting. 🔴")
-                sys.exit(1)
+            # `steam` is only needed with the dota module, so it isn't imported with `core`
+            from utils.dota2 import Dota2ClientPool
+
+            self.dota2_pool = Dota2ClientPool(self)
+            self.dota2 = self.dota2_pool.primary
+            self.startup.track("steam_login", self.dota2_pool.wait_until_ready())
+            self.startup.track("gc_ready", self.dota2_pool.wait_until_gc_ready())
+            # Steam login errors and disconnects are handled by `Dota2ClientPool.supervise` (with reconnects)
+            await asyncio.gather(
+                super().start(token, with_adapter=with_adapter, load_tokens=load_tokens, save_tokens=save_tokens),
+                self.dota2_pool.login(),
+            )
         else:
             await super().start()
 
     @override
     async def close(self, **options: Any) -> None:
-        if hasattr(self, "dota2"):
-            await self.dota2.close()
+        if hasattr(self, "dota2_pool"):
+            await self.dota2_pool.close()
+        if hasattr(self, "startup_report_task"):
+            self.startup_report_task.cancel()
         await super().close(**options)
 
     @override
@@ -420,8 +662,8 @@ class IreBot(commands.AutoBot):
         if not hasattr(self, "launch_time"):
             # who knows maybe it triggers many times like `discord.py`
             self.launch_time = datetime.datetime.now(datetime.UTC)
-        if hasattr(self, "dota2"):
-            await self.dota2.wait_until_ready()
+        if hasattr(self, "dota2_pool"):
+            await self.dota2_pool.wait_until_ready()
 
     @staticmethod
     def add_args_field(embed: discord.Embed, field_name: str, data: dict[str, Any]) -> discord.Embed:
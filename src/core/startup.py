@@ -0,0 +1,83 @@
+"""Startup timeline profiler.
+
+Time from `main.main` to a fully working bot is spent in several (partly concurrent) phases:
+database pool, EventSub subscriptions, tokens, modules, Steam login, Game Coordinator, friend list, storages.
+`StartupTimeline` records monotonic `(start, end)` offsets of every phase, so it's visible which one regressed
+after a dependency bump or a new public streamer.
+The bot logs a summary once all expected phases are done and stores the timeline into `ttv_startup_timelines`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterator
+
+__all__ = ("StartupTimeline",)
+
+log = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """Monotonic timestamps of startup phases, relative to the process start (`main.main`)."""
+
+    def __init__(self, *, started: float | None = None) -> None:
+        self.started: float = time.monotonic() if started is None else started
+        """`time.monotonic()` at the process start; `main.main` takes it before importing the heavy stuff."""
+        self.phases: dict[str, tuple[float, float]] = {}
+        """Phase name -> `(start, end)` in seconds since `started`."""
+        self.expected: set[str] = set()
+        self.ready: asyncio.Event = asyncio.Event()
+        """Set when all `expected` phases are done."""
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    def now(self) -> float:
+        return time.monotonic() - self.started
+
+    def expect(self, *phases: str) -> None:
+        """Add phases that have to be done for the bot to count as fully ready."""
+        self.expected.update(phases)
+
+    def record(self, phase: str, start: float, end: float) -> None:
+        """Record a phase; only the first run of every phase counts (i.e. not reconnects)."""
+        if phase in self.phases:
+            return
+        self.phases[phase] = (start, end)
+        log.debug("Startup phase %s took %.2fs (done at %.2fs)", phase, end - start, end)
+        if self.expected and self.expected <= self.phases.keys():
+            self.ready.set()
+
+    @contextlib.contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Measure a phase run within this context; a phase that raised is not recorded as done."""
+        start = self.now()
+        yield
+        self.record(phase, start, self.now())
+
+    def track(self, phase: str, awaitable: Awaitable[object]) -> None:
+        """Measure a phase that is done when `awaitable` is, without waiting for it here."""
+
+        async def wait() -> None:
+            with self.phase(phase):
+                await awaitable
+
+        task = asyncio.create_task(wait())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    @property
+    def total(self) -> float:
+        """Seconds until the last phase was done."""
+        return max((end for _, end in self.phases.values()), default=0.0)
+
+    def durations(self) -> dict[str, float]:
+        """Phase name -> its duration in seconds, in order of phases' start."""
+        return {phase: end - start for phase, (start, end) in sorted(self.phases.items(), key=lambda item: item[1])}
+
+    def summary(self) -> str:
+        return f"{self.total:.1f}s total: " + ", ".join(f"{phase} {d:.1f}s" for phase, d in self.durations().items())
@@ -20,17 +20,19 @@ import asyncio
 import logging
 import platform
 import sys
+import time
 from typing import TYPE_CHECKING, Literal
 
-import aiohttp
-import asyncpg
 import click
 
-from config import env
-from core import IreBot, get_eventsub_subscriptions, setup_logging
 from utils import const
 
+# heavy dependencies (`discord`, `twitchio`, `steam`, `asyncpg`, `aiohttp`) are imported in functions below,
+# so `--help` and click's argument errors don't wait for them; see `tests/test_import_time.py`
 if TYPE_CHECKING:
+    import asyncpg
+
+    from core import StartupTimeline
     from types_.database import PoolTypedWithAny
 
 try:
@@ -45,13 +47,31 @@ else:
 
 async def create_pool() -> asyncpg.Pool[asyncpg.Record]:
     """Create AsyncPG Pool."""
+    import asyncpg
+
+    from config import env
+
     postgres_url = env.POSTGRES_VPS if platform.system() == "Linux" else env.POSTGRES_HOME
     return await asyncpg.create_pool(postgres_url, command_timeout=60, min_size=10, max_size=10, statement_cache_size=0)
 
 
-async def start_the_bot(*, scopes_only: bool, owner_id: str, force_subscribe: bool, local: bool) -> None:
+async def start_the_bot(
+    *,
+    scopes_only: bool,
+    owner_id: str,
+    force_subscribe: bool,
+    local: bool,
+    record_http: bool = False,
+    timeline: StartupTimeline | None = None,
+) -> None:
     """Start the bot."""
+    from core import IreBot, StartupTimeline, get_eventsub_subscriptions
+    from utils.connector import ConnectorConfig, HTTPStats, create_session
+    from utils.http_replay import HTTPRecorder
+
     log = logging.getLogger()
+    timeline = timeline or StartupTimeline()
+    start = timeline.now()
     try:
         # Unfortunate `asyncpg` typing crutch. Read `types_.database` for more
         pool: PoolTypedWithAny = await create_pool()  # pyright: ignore[reportAssignmentType]  # ty:ignore[invalid-assignment]
@@ -60,14 +80,20 @@ async def start_the_bot(*, scopes_only: bool, owner_id: str, force_subscribe: bo
         click.echo(msg, file=sys.stderr)
         log.exception(msg)
         return
+    timeline.record("pool", start, timeline.now())
 
-    subscriptions = await get_eventsub_subscriptions(pool, owner_id)
+    with timeline.phase("eventsub_subscriptions"):
+        subscriptions = await get_eventsub_subscriptions(pool, owner_id)
+    recorder = HTTPRecorder() if record_http else None
+    http_stats = HTTPStats()
 
     async with (
-        aiohttp.ClientSession() as session,
+        create_session(ConnectorConfig(), stats=http_stats, middlewares=(recorder,) if recorder else ()) as session,
         pool as pool,
         IreBot(
             session=session,
+            http_stats=http_stats,
+            startup=timeline,
             pool=pool,
             subscriptions=subscriptions,
             scopes_only=scopes_only,
@@ -76,7 +102,12 @@ async def start_the_bot(*, scopes_only: bool, owner_id: str, force_subscribe: bo
             local=local,
         ) as irebot,
     ):
-        await irebot.start()
+        try:
+            await irebot.start()
+        finally:
+            if recorder:
+                await recorder.flush()
+                log.info("Recorded %s HTTP requests into %s", recorder.recorded, recorder.path)
 
 
 @click.group(invoke_without_command=True, options_metavar="[options]")
@@ -118,6 +149,15 @@ async def start_the_bot(*, scopes_only: bool, owner_id: str, force_subscribe: bo
     default=True,  # usual default: True ✅
     help="Whether to use adapter with localhost (default) or remote host (currently ngrok-free for testing purposes).",
 )
+@click.option(
+    "--record-http",
+    is_flag=True,
+    default=False,  # usual default: False ✅
+    help=(
+        "Record requests to Dota/emote/translate APIs into `.temp/http_records_*.jsonl.zst`. "
+        "Recorded logs can be replayed offline with `utils.http_replay.HTTPReplayer`, i.e. `tests/http_benchmark.py`."
+    ),
+)
 def main(
     click_ctx: click.Context,
     *,
@@ -125,14 +165,26 @@ def main(
     owner: Literal["irene", "aluerie"],
     force_subscribe: bool,
     local: bool,
+    record_http: bool,
 ) -> None:
     """Launches the bot."""
     if click_ctx.invoked_subcommand is None:
+        started = time.monotonic()
+        from core import StartupTimeline, setup_logging
+
+        timeline = StartupTimeline(started=started)
         with setup_logging():
             owner_id: str = {"irene": const.UserID.Irene, "aluerie": const.UserID.Aluerie}[owner]
             try:
                 RUNTIME(
-                    start_the_bot(scopes_only=scopes_only, owner_id=owner_id, force_subscribe=force_subscribe, local=local)
+                    start_the_bot(
+                        scopes_only=scopes_only,
+                        owner_id=owner_id,
+                        force_subscribe=force_subscribe,
+                        local=local,
+                        record_http=record_http,
+                        timeline=timeline,
+                    )
                 )
             except KeyboardInterrupt:
                 print("Aborted! The bot was interrupted with `KeyboardInterrupt`!")  # noqa: T201
@@ -12,11 +12,13 @@ License
 
 from __future__ import annotations
 
+import ast
+import importlib.util
 import logging
 from pathlib import Path
 from pkgutil import iter_modules
 
-__all__ = ("get_modules",)
+__all__ = ("get_module_dependencies", "get_modules", "module_graph")
 
 try:
     import modules_subset as select_modules_to_load  # pyright: ignore[reportMissingImports]
@@ -62,9 +64,7 @@ def get_test_subset_modules(categories: dict[str, list[str]]) -> tuple[str, ...]
         "modules.beta",
     )
     # Component-based dependencies
-    if PUBLIC_D9MMRBOT in modules_to_load:
-        modules_to_load += (DEV_REQUIRED,)
-    return modules_to_load
+    return tuple(module_graph(modules_to_load))
 
 
 def get_modules(*, test: bool) -> tuple[str, ...]:
@@ -95,3 +95,33 @@ def get_modules(*, test: bool) -> tuple[str, ...]:
 
     log.debug("The list of modules (%s total) to load: %s", len(modules), modules)
     return modules
+
+
+def get_module_dependencies(module: str) -> tuple[str, ...]:
+    """Get modules that `module` depends on.
+
+    Modules declare them as a module-level `DEPENDENCIES = ("modules.dev.required",)` tuple of string literals.
+    It's read from the source code without importing the module, because twitchio executes the module
+    from scratch in `load_module` anyway.
+    """
+    spec = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return ()
+    tree = ast.parse(Path(spec.origin).read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "DEPENDENCIES" for target in node.targets):
+            return tuple(ast.literal_eval(node.value))
+    return ()
+
+
+def module_graph(modules: tuple[str, ...] | list[str]) -> dict[str, tuple[str, ...]]:
+    """Get dependency graph `module -> its dependencies` for `modules`, with dependencies added in (recursively)."""
+    graph: dict[str, tuple[str, ...]] = {}
+    queue = list(modules)
+    while queue:
+        module = queue.pop()
+        if module in graph:
+            continue
+        graph[module] = get_module_dependencies(module)
+        queue.extend(graph[module])
+    return graph
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 from typing import TYPE_CHECKING, Annotated
 
@@ -23,6 +24,18 @@ def to_module(_: IreContext, module: str) -> str:
     return f"modules.{module}"
 
 
+def to_modules(ctx: IreContext, modules: str) -> list[str]:
+    """Shortcut for several space-separated modules; a category (i.e. `personal`) means all loaded modules in it.
+
+    So I can use command like this `!reload personal dev.other`.
+    """
+    names: list[str] = []
+    for name in map(functools.partial(to_module, ctx), modules.split()):
+        group = [loaded for loaded in ctx.bot.modules if loaded.startswith(f"{name}.")]
+        names += group or [name]
+    return names
+
+
 class Control(IreDevComponent):
     """Dev Only Commands."""
 
@@ -67,16 +80,24 @@ class Control(IreDevComponent):
         await ctx.send(f"{const.STV.DankApprove} unloaded {modules}")
 
     @commands.command()
-    async def reload(self, ctx: IreContext, *, modules: Annotated[str, to_module]) -> None:
-        """Reload the modules."""
-        await self.bot.reload_module(modules)
-        await ctx.send(f"{const.STV.DankApprove} reloaded {modules}")
+    async def reload(self, ctx: IreContext, *, modules: Annotated[list[str], to_modules]) -> None:
+        """Reload the modules (concurrently, in dependency order)."""
+        await self.send_load_result(ctx, "reloaded", modules, await self.bot.load_modules(modules, reload=True))
 
     @commands.command()
-    async def load(self, ctx: IreContext, *, modules: Annotated[str, to_module]) -> None:
-        """Load the modules."""
-        await self.bot.load_module(modules)
-        await ctx.send(f"{const.STV.DankApprove} loaded {modules}")
+    async def load(self, ctx: IreContext, *, modules: Annotated[list[str], to_modules]) -> None:
+        """Load the modules together with modules they depend on."""
+        if already_loaded := [module for module in modules if module in self.bot.modules]:
+            await ctx.send(f"{const.STV.buenoFail} already loaded: {', '.join(already_loaded)}")
+        if modules := [module for module in modules if module not in already_loaded]:
+            await self.send_load_result(ctx, "loaded", modules, await self.bot.load_modules(modules))
+
+    @staticmethod
+    async def send_load_result(ctx: IreContext, action: str, modules: list[str], failed: list[str]) -> None:
+        if failed:
+            await ctx.send(f"{const.STV.buenoFail} {action} {len(modules) - len(failed)}, failed: {', '.join(failed)}")
+        else:
+            await ctx.send(f"{const.STV.DankApprove} {action} {', '.join(modules)}")
 
     @commands.command(name="modules", aliases=["extensions", "components"])  # module != component but whatever
     async def list_modules(self, ctx: IreContext) -> None:
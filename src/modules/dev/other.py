@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import datetime
 import importlib.metadata
+import statistics
 import sys
 import unicodedata
 from typing import TYPE_CHECKING, TypedDict
 
+import orjson
 from twitchio.ext import commands
 
 from core import IreDevComponent
@@ -19,6 +21,10 @@ if TYPE_CHECKING:
         game: str
         desc: str
 
+    class StartupTimelinesQueryRow(TypedDict):
+        total: float
+        phases: str
+
 
 __all__ = ("OtherDevCommands",)
 
@@ -78,6 +84,34 @@ class OtherDevCommands(IreDevComponent):
             + " | ".join(f"{package}: {importlib.metadata.version(package)}" for package in curious_packages)
         )
 
+    @commands.command(aliases=["http_stats"])
+    async def http(self, ctx: IreContext) -> None:
+        """🔬 Get HTTP timings of the busiest hosts: connection reuse, p90 time to first byte, connect and pool wait."""
+        await ctx.send(self.bot.http_stats.summary())
+
+    @commands.command(aliases=["boot"])
+    async def startup(self, ctx: IreContext) -> None:
+        """🔬 Get the latest and the median (over the last 20 startups) startup breakdown by phases."""
+        query = """
+            SELECT total, phases
+            FROM ttv_startup_timelines
+            ORDER BY started_at DESC
+            LIMIT 20
+        """
+        rows: list[StartupTimelinesQueryRow] = await self.bot.pool.fetch(query)
+        if not rows:
+            await ctx.send("No startup timelines recorded yet.")
+            return
+
+        timelines: list[dict[str, float]] = [orjson.loads(row["phases"]) for row in rows]
+        latest = timelines[0]
+        await ctx.send(f"Latest: {rows[0]['total']:.1f}s | " + ", ".join(f"{k} {v:.1f}s" for k, v in latest.items()))
+        median = {phase: statistics.median(t[phase] for t in timelines if phase in t) for phase in latest}
+        await ctx.send(
+            f"Median of {len(rows)}: {statistics.median(row['total'] for row in rows):.1f}s | "
+            + ", ".join(f"{k} {v:.1f}s" for k, v in median.items())
+        )
+
 
 async def setup(bot: IreBot) -> None:
     """Load IreBot module. Framework of twitchio."""
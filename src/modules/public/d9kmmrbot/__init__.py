@@ -7,6 +7,9 @@ from .rp_flow import Dota2RichPresenceFlow
 if TYPE_CHECKING:
     from core import IreBot
 
+# `Dota2RichPresenceFlow` needs `bot.streamers` index filled by `StreamerIndexManagement`
+DEPENDENCIES = ("modules.dev.required",)
+
 
 async def setup(bot: IreBot) -> None:
     """Load IreBot module. Framework of twitchio."""
@@ -0,0 +1,124 @@
+"""Per-channel budget for d9kmmrbot commands.
+
+Most d9kmmrbot commands hit the Dota 2 Game Coordinator through the Steam session(-s) shared by every public channel,
+or Steam Web API with its daily quota. So one big channel spamming `!stats` should not be able to exhaust them
+for every other streamer. Each broadcaster gets a token bucket and each command spends tokens according
+to its cost class. Over-budget requests are answered with the last recent response for the same command
+and argument (if any) instead of a new upstream call.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from utils.helpers import TokenBucket
+
+if TYPE_CHECKING:
+    from core import IreContext
+
+__all__ = ("COMMAND_COSTS", "ChannelBudget", "Cost")
+
+
+class Cost(IntEnum):
+    """Cost classes of d9kmmrbot commands."""
+
+    Local = 1
+    """Database queries or data that is already cached in the bot's memory."""
+    WebAPI = 3
+    """Steam Web API or OpenDota requests."""
+    GameCoordinator = 5
+    """Dota 2 Game Coordinator requests."""
+
+
+COMMAND_COSTS: dict[str, Cost] = {
+    # Qualified command name -> cost class
+    "game_medals": Cost.Local,
+    "ranked": Cost.Local,
+    "smurfs": Cost.Local,
+    "profile": Cost.Local,
+    "match_id": Cost.Local,
+    "notable": Cost.Local,
+    "score": Cost.Local,
+    "score offline": Cost.Local,
+    "dotabuff": Cost.Local,
+    "status": Cost.Local,
+    "d2pt": Cost.Local,
+    "stats": Cost.WebAPI,
+    "lead": Cost.WebAPI,
+    "played": Cost.GameCoordinator,
+    "previous_match": Cost.GameCoordinator,
+    "party": Cost.GameCoordinator,
+    "mmr": Cost.GameCoordinator,
+}
+
+
+class ChannelBudget:
+    """Per-broadcaster token buckets for d9kmmrbot commands.
+
+    Parameters
+    ----------
+    capacity
+        Burst size in tokens, i.e. 30 tokens = 6 Game Coordinator commands in a row.
+    rate
+        Refill rate in tokens per second.
+    cache_size
+        Max amount of remembered responses (least recently used ones are evicted).
+    cache_ttl
+        Seconds a remembered response can be reused for; i.e. `!stats` from 10 minutes ago is misleading.
+    """
+
+    max_argument_length: int = 32
+    """Arguments are cut to this length in cache keys; chat messages can be up to 500 characters long."""
+
+    def __init__(self, *, capacity: float = 30.0, rate: float = 0.5, cache_size: int = 512, cache_ttl: float = 300) -> None:
+        self.capacity: float = capacity
+        self.rate: float = rate
+        self.buckets: dict[str, TokenBucket] = {}
+        self.cache_size: int = cache_size
+        self.cache_ttl: float = cache_ttl
+        self.responses: OrderedDict[tuple[str, str, str], tuple[float, str]] = OrderedDict()
+        """`cache_key` -> `(expires_at, response)`, in least recently used order."""
+
+    def cache_key(self, ctx: IreContext) -> tuple[str, str, str]:
+        """`(broadcaster_id, command name, normalized argument)`, so `!stats pa` and `!stats cm` are cached separately."""
+        name = ctx.command.qualified_name if ctx.command else ""
+        words = ctx.message.text.lower().split()
+        argument = " ".join(words[len(name.split()) :])[: self.max_argument_length]
+        return ctx.broadcaster.id, name, argument
+
+    def try_spend(self, ctx: IreContext, cost: Cost) -> bool:
+        """Spend `cost` tokens from the broadcaster's bucket if it has enough of them."""
+        bucket = self.buckets.get(ctx.broadcaster.id)
+        if bucket is None:
+            bucket = self.buckets[ctx.broadcaster.id] = TokenBucket(self.capacity, self.rate)
+        return bucket.try_spend(cost)
+
+    def remember(self, ctx: IreContext, response: str) -> None:
+        """Remember the response so it can be reused when the channel is over budget."""
+        key = self.cache_key(ctx)
+        self.responses[key] = (time.monotonic() + self.cache_ttl, response)
+        self.responses.move_to_end(key)
+        while len(self.responses) > self.cache_size:
+            self.responses.popitem(last=False)
+
+    def cached_response(self, ctx: IreContext) -> str | None:
+        """The remembered response for the same command and argument if it's not expired yet."""
+        key = self.cache_key(ctx)
+        if (entry := self.responses.get(key)) is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self.responses[key]
+            return None
+        self.responses.move_to_end(key)
+        return response
+
+    def over_budget_response(self, ctx: IreContext, cost: Cost) -> str:
+        """Response for over-budget requests: the last cached one or a "try again later" notice."""
+        if cached := self.cached_response(ctx):
+            return f"[cached] {cached}"
+        retry_after = self.buckets[ctx.broadcaster.id].retry_after(cost)
+        return f"Too many Dota 2 commands in this channel! Try again in {retry_after:.0f} sec."
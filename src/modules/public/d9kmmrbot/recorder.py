@@ -0,0 +1,67 @@
+"""Rich Presence recorder.
+
+Valve's Rich Presence data is flaky and regressions in `Dota2RichPresenceFlow` are usually only found live.
+The recorder appends every `steam_user_update` event into a zstd-compressed JSON-lines log,
+so real traffic (i.e. a Tuesday night) can later be replayed against the flow offline
+with `tests/rp_replay.py`.
+"""
+
+from __future__ import annotations
+
+import datetime
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from utils.jsonl import ZstdJSONLinesWriter, read_zstd_json_lines
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from utils.dota2 import SteamUserUpdate
+
+__all__ = ("RichPresenceRecord", "RichPresenceRecorder", "read_records")
+
+DOTA_APP_ID = 570
+
+
+@dataclass(slots=True)
+class RichPresenceRecord:
+    """One recorded `steam_user_update` event."""
+
+    timestamp: float
+    friend_id: int
+    before: dict[str, str] | None
+    after: dict[str, str] | None
+    in_dota: bool
+    """Whether the friend is playing Dota 2 after the update (`Friend.is_playing_dota`)."""
+
+
+class RichPresenceRecorder(ZstdJSONLinesWriter):
+    """Append `steam_user_update` events into a zstd-compressed JSON-lines log.
+
+    Records are buffered in memory and written by `flush` (the owner is supposed to call it periodically).
+    """
+
+    def __init__(self, path: pathlib.Path | None = None, *, level: int = 3) -> None:
+        now = datetime.datetime.now(datetime.UTC)
+        super().__init__(path or pathlib.Path(f".temp/rp_records_{now:%Y%m%d_%H%M}.jsonl.zst"), level=level)
+
+    def record(self, update: SteamUserUpdate) -> None:
+        """Buffer a `steam_user_update` event."""
+        app = update.after.app
+        record = RichPresenceRecord(
+            timestamp=time.time(),
+            friend_id=update.after.id,
+            before=update.before.rich_presence,
+            after=update.after.rich_presence,
+            in_dota=bool(app) and app.id == DOTA_APP_ID,
+        )
+        self.write(record)
+
+
+def read_records(path: pathlib.Path) -> Iterator[RichPresenceRecord]:
+    """Read recorded events from a log written by `RichPresenceRecorder`."""
+    for record in read_zstd_json_lines(path):
+        yield RichPresenceRecord(**record)
@@ -3,7 +3,6 @@ from __future__ import annotations
 import asyncio
 import datetime
 import functools
-import itertools
 import logging
 import pprint
 from dataclasses import dataclass
@@ -11,6 +10,7 @@ from operator import attrgetter
 from typing import TYPE_CHECKING, Annotated, Any, TypedDict, TypeVar, override
 from urllib import parse as url_parse
 
+import aiohttp
 import steam
 from discord.utils import MISSING
 from steam.ext import dota2
@@ -18,9 +18,12 @@ from twitchio.ext import commands
 
 from config import env
 from core import IrePublicComponent, ireloop
-from modules import DEV_REQUIRED, PUBLIC_D9MMRBOT
+from modules import PUBLIC_D9MMRBOT
 from utils import dota2 as dota2utils, errors, fmt, guards
 
+from .budget import COMMAND_COSTS, ChannelBudget
+from .recorder import RichPresenceRecorder
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Coroutine
 
@@ -56,6 +59,9 @@ LM = TypeVar("LM", bound="LiveMatch")
 __all__ = ("Dota2RichPresenceFlow",)
 
 log = logging.getLogger(__name__)
+
+COMMAND_LATENCY_BUDGET = 8.0
+"""Seconds a chat command waits for Steam Web API before answering "data is not ready yet"."""
 log.setLevel(logging.DEBUG)
 
 
@@ -205,8 +211,8 @@ class Player:
 
     @classmethod
     async def create(cls, bot: IreBot, account_id: int, player_slot: int) -> Player:
-        partial_user = bot.dota2.create_partial_user(account_id)
-        profile_card = await partial_user.dota2_profile_card()
+        async with bot.dota2_pool.acquire() as client:
+            profile_card = await client.create_partial_user(account_id).dota2_profile_card()
 
         return Player(
             friend_id=account_id,
@@ -313,7 +319,8 @@ class LiveMatch:
             return "No player data yet."
 
         hero, player_slot = dota2utils.extract_hero_index(argument, self.heroes)
-        return f"{hero} stratz.com/players/{self.players[player_slot].friend_id}"
+        hero_name = self.bot.dota2.heroes.name(hero.id)
+        return f"{hero_name} stratz.com/players/{self.players[player_slot].friend_id}"
 
     @format_match_response
     async def stats(self, argument: str) -> str:
@@ -327,28 +334,21 @@ class LiveMatch:
 
         hero, player_slot = dota2utils.extract_hero_index(argument, self.heroes)
 
-        match = await self.bot.dota2.web_api.get_real_time_stats(self.server_steam_id)
-
-        # We have to loop through teams in order to support Custom and Event Games
-        # Since the amount of players in the team can be variable.
-        for team in match["teams"]:
-            for player in team["players"]:
-                if player["heroid"] == hero:
-                    api_player = player
-                    break
-            else:
-                continue
-            break
-        else:
+        match = await self.bot.dota2.web_api.get_real_time_stats(
+            self.server_steam_id, budget=COMMAND_LATENCY_BUDGET, hedge=True
+        )
+        api_player = match.players_by_hero.get(hero.id)
+        if api_player is None:
             msg = f"Somehow couldn't find the player {player_slot=} with {hero=} in the game."
             raise errors.PlaceholderError(msg)
 
-        prefix = f"[2m delay] {api_player['name']} {dota2.Hero.try_value(api_player['heroid'])} lvl {api_player['level']}"
-        net_worth = f"NW: {api_player['net_worth']}"
-        kda = f"{api_player['kill_count']}/{api_player['death_count']}/{api_player['assists_count']}"
-        cs = f"CS: {api_player['lh_count']}"
+        hero_name = self.bot.dota2.heroes.name(api_player.hero_id)
+        prefix = f"[2m delay] {api_player.name} {hero_name} lvl {api_player.level}"
+        net_worth = f"NW: {api_player.net_worth}"
+        kda = f"{api_player.kills}/{api_player.deaths}/{api_player.assists}"
+        cs = f"CS: {api_player.last_hits}"
 
-        items = ", ".join([str(await self.bot.dota2.items.by_id(item)) for item in api_player["items"] if item != -1])
+        items = ", ".join([str(await self.bot.dota2.items.by_id(item)) for item in api_player.items if item != -1])
         response_parts = (prefix, net_worth, kda, cs, items)
         return " \N{BULLET} ".join(response_parts)
 
@@ -357,14 +357,16 @@ class LiveMatch:
         """Response for !lead command."""
         if not self.server_steam_id:
             return "This match doesn't support real time stats"
-        match = await self.bot.dota2.web_api.get_real_time_stats(self.server_steam_id)
-        radiant = match["teams"][0]
-        dire = match["teams"][1]
-
-        lead = radiant["net_worth"] - dire["net_worth"]
+        match = await self.bot.dota2.web_api.get_real_time_stats(
+            self.server_steam_id, budget=COMMAND_LATENCY_BUDGET, hedge=True
+        )
+        lead = match.net_worth_lead
         word = "Radiant" if lead > 0 else "Dire"
 
-        return f"[2m delay] Radiant {radiant['score']} - Dire {dire['score']}: {word} is leading by {abs(lead) / 1000:.1f}k"
+        return (
+            f"[2m delay] Radiant {match.radiant.score} - Dire {match.dire.score}: "
+            f"{word} is leading by {abs(lead) / 1000:.1f}k"
+        )
 
     @format_match_response
     async def match_id_command(self) -> str:
@@ -419,7 +421,8 @@ class PlayingMatch(LiveMatch):
     @ireloop(seconds=10.1, count=30)
     async def update_data(self) -> None:
         log.debug('Updating %s data for watchable_game_id "%s"', self.__class__.__name__, self.watchable_game_id)
-        match = next(iter(await self.bot.dota2.live_matches(lobby_ids=[self.lobby_id])), None)
+        async with self.bot.dota2_pool.acquire() as client:
+            match = next(iter(await client.live_matches(lobby_ids=[self.lobby_id])), None)
         if not match:
             msg = f'FindTopSourceTVGames did not find watchable_game_id "{self.watchable_game_id}".'
             raise errors.PlaceholderError(msg)
@@ -538,19 +541,17 @@ class SpectatingMatch(LiveMatch):
             self.update_data.stop()
             return
 
-        api_players = list(itertools.chain(match["teams"][0]["players"], match["teams"][1]["players"]))
-
         if not self.players_data_ready.is_set():
             # match data
-            self.match_id = int(match["match"]["match_id"])
-            self.lobby_type = dota2.LobbyType.try_value(match["match"]["lobby_type"])
-            self.game_mode = dota2.GameMode.try_value(match["match"]["game_mode"])
-            self.started_at = datetime.datetime.fromtimestamp(match["match"]["start_timestamp"], tz=datetime.UTC)
+            self.match_id = match.match_id
+            self.lobby_type = dota2.LobbyType.try_value(match.lobby_type)
+            self.game_mode = dota2.GameMode.try_value(match.game_mode)
+            self.started_at = datetime.datetime.fromtimestamp(match.start_timestamp, tz=datetime.UTC)
 
             # players
             self.players = [
-                await Player.create(self.bot, api_player["accountid"], player_slot)
-                for player_slot, api_player in enumerate(api_players)
+                await Player.create(self.bot, api_player.account_id, player_slot)
+                for player_slot, api_player in enumerate(match.players)
             ]
             if self._is_players_data_ready():
                 self.players_data_ready.set()
@@ -558,7 +559,7 @@ class SpectatingMatch(LiveMatch):
                 self.bot.dispatch("players_data_ready", self)
 
         if not self.heroes_data_ready.is_set():
-            self.heroes = [dota2.Hero.try_value(api_player["heroid"]) for api_player in api_players]
+            self.heroes = [dota2.Hero.try_value(api_player.hero_id) for api_player in match.players]
             if self._is_heroes_data_ready():
                 self.heroes_data_ready.set()
                 log.debug('%s heroes data ready for: "%s"', self.__class__.__name__, self.watching_server)
@@ -604,17 +605,19 @@ class Dota2RichPresenceFlow(IrePublicComponent):
 
         self.play_matches_index: dict[str, PlayingMatch] = {}
         self.watch_matches_index: dict[str, SpectatingMatch] = {}
+        self.reconnecting_shards: set[int] = set()
+        """Shards of `bot.dota2_pool` that are currently reconnecting. The flow is paused while it's not empty."""
 
         self.debug: bool = False
         """Set to `True` if you want to see some [debug] messages with extra information in Irene's chat."""
+        self.budget: ChannelBudget = ChannelBudget()
+        self.recorder: RichPresenceRecorder | None = None
+        """Records every `steam_user_update` for replay benchmarks when set. Toggled with `!rp_record`."""
 
     @override
     async def component_load(self) -> None:
-        if "modules.dev.required" not in self.bot.modules_to_load:
-            msg = f"Module '{PUBLIC_D9MMRBOT}' requires '{DEV_REQUIRED}' to be loaded."
-            raise errors.IreBotError(msg)
-        if not hasattr(self.bot, "dota2"):
-            msg = f"Module '{PUBLIC_D9MMRBOT}' requires Dota2Client to be attached to bot's instance as 'self.bot.dota2'."
+        if not hasattr(self.bot, "dota2_pool"):
+            msg = f"Module '{PUBLIC_D9MMRBOT}' requires Dota2ClientPool to be attached to bot's instance as 'dota2_pool'."
             raise errors.IreBotError(msg)
 
         self.starting_fill_friends.start()
@@ -622,7 +625,6 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         self.fill_completed_matches_from_gc_match_history.start()
         self.remove_way_too_old_matches.start()
         self.debug_announce_gc_ready.start()
-        self.tuesday_problems.start()
 
     @override
     async def component_teardown(self) -> None:
@@ -631,7 +633,9 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         self.fill_completed_matches_from_gc_match_history.cancel()
         self.remove_way_too_old_matches.cancel()
         self.debug_announce_gc_ready.cancel()
-        self.tuesday_problems.cancel()
+        self.flush_rp_recorder.cancel()
+        if self.recorder:
+            await self.recorder.flush()
 
     #################################
     #           EVENTS              #
@@ -643,12 +647,14 @@ class Dota2RichPresenceFlow(IrePublicComponent):
 
         Also makes initial analyse of their rich presences.
         """
-        log.debug("Indexing bot's friend list.")
-        for friend in await self.bot.dota2.user.friends():
+        log.debug("Indexing bot's friend list (all accounts of the pool).")
+        start = self.bot.startup.now()
+        for friend in await self.bot.dota2_pool.friends():
             self.friends[friend.id] = Friend(self.bot, friend._user)  # pyright: ignore[reportArgumentType, reportPrivateUsage]
 
         for friend in self.friends.values():
             await self.analyze_rich_presence(friend)
+        self.bot.startup.record("fill_friends", start, self.bot.startup.now())
 
         log.debug('Friends index ready. Setting "_friends_index_ready".')
         self.bot.friends_index_ready.set()
@@ -789,6 +795,13 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         This is not `@commands.Component.listener("steam_user_update")` because we have to manually
         `.add_listener` for this function after waiting for all the clients to start.
         """
+        if self.recorder:
+            self.recorder.record(update)
+
+        if self.reconnecting_shards:
+            # the friend index is going to be rebuilt after the reconnect anyway
+            return
+
         rp_before = RichPresence(update.before.rich_presence)
         rp_after = RichPresence(update.after.rich_presence)
 
@@ -823,6 +836,23 @@ class Dota2RichPresenceFlow(IrePublicComponent):
 
         friend.active_match = None
 
+    #################################
+    #        CHANNEL BUDGET         #
+    #################################
+
+    @override
+    async def component_before_invoke(self, ctx: IreContext) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Charge the command against the broadcaster's budget, see `budget.py`."""
+        if not ctx.command or (cost := COMMAND_COSTS.get(ctx.command.qualified_name)) is None:
+            return
+        if not self.budget.try_spend(ctx, cost):
+            raise errors.RespondWithError(self.budget.over_budget_response(ctx, cost))
+
+    async def respond(self, ctx: IreContext, response: str) -> None:
+        """Send the response for a budgeted command and remember it for over-budget requests."""
+        self.budget.remember(ctx, response)
+        await ctx.send(response)
+
     #################################
     # ACTIVE MATCH RELATED COMMANDS #
     #################################
@@ -876,14 +906,14 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         """Fetch each player rank medals in the current game."""
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.game_medals()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command()
     async def ranked(self, ctx: IreContext) -> None:
         """Show whether the current game is ranked or not."""
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.ranked()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(aliases=["lifetime"])
     async def smurfs(self, ctx: IreContext) -> None:
@@ -893,7 +923,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         """
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.smurfs()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(aliases=["items", "kda"])
     async def stats(self, ctx: IreContext, *, argument: str) -> None:
@@ -903,7 +933,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         """
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.stats(argument)
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(aliases=["player"])
     async def profile(self, ctx: IreContext, *, argument: str) -> None:
@@ -913,7 +943,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         """
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.profile(argument)
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @stats.error
     async def stats_error(self, payload: commands.CommandErrorPayload) -> None:
@@ -931,21 +961,21 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         """Show which team has a gold lead and by how much."""
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.lead()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(aliases=["matchid"])
     async def match_id(self, ctx: IreContext) -> None:
         """Show match ID for the current match."""
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.match_id_command()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(name="notable", aliases=["np"])
     async def notable_players(self, ctx: IreContext) -> None:
         """List notable players for the current match."""
         active_match = await self.find_active_match(ctx.broadcaster.id)
         response = await active_match.notable_players()
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     #################################
     #           LAST GAME           #
@@ -974,7 +1004,8 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         if not row:
             msg = "No last game found: streamer hasn't played Dota 2 in the last 2 days"
             raise errors.RespondWithError(msg)
-        last_game = await self.bot.dota2.create_partial_match(row["match_id"]).minimal()
+        async with self.bot.dota2_pool.acquire(row["friend_id"]) as client:
+            last_game = await client.create_partial_match(row["match_id"]).minimal()
         return row["friend_id"], row["hero_id"], last_game
 
     @commands.command(name="played", aliases=["last_game", "lg", "lm"])
@@ -987,7 +1018,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             response = await active_match.played_with(friend_id, last_game)
         else:
             response = 'Only matches streamer is playing in support "!last_game" command usage'
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(aliases=["pm"])
     async def previous_match(self, ctx: IreContext) -> None:
@@ -1010,13 +1041,14 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         else:
             outcome = "Unknown outcome"
         delta = datetime.datetime.now(datetime.UTC) - (match.start_time + match.duration)
+        hero_name = self.bot.dota2.heroes.name(hero_id)
 
         response = (
-            f"Last Game - {score_category.name}: {outcome} as {player.hero} {player.kills}/{player.deaths}/{player.assists} "
+            f"Last Game - {score_category.name}: {outcome} as {hero_name} {player.kills}/{player.deaths}/{player.assists} "
             f"\N{BULLET} ended {fmt.timedelta_to_words(delta, fmt=fmt.TimeDeltaFormat.Letter)} ago "
             f"\N{BULLET} stratz.com/matches/{match.id}"
         )
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     #################################
     #       COMPLETED MATCHES       #
@@ -1058,7 +1090,8 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             return
 
         # match history entities on their own do not give proper outcome (Radiant/Dire)
-        minimal = await self.bot.dota2.create_partial_match(match.id).minimal()
+        async with self.bot.dota2_pool.acquire(friend_id) as client:
+            minimal = await client.create_partial_match(match.id).minimal()
 
         query = """
             INSERT INTO ttv_dota_matches
@@ -1164,7 +1197,8 @@ class Dota2RichPresenceFlow(IrePublicComponent):
                 # Then `.minimal` won't give any results as the game is still live but streamer's RP is different
                 # So we need to deal with errors of not getting response from it.
                 # This also happens if streamer disconnects-reconnects in the middle of the match.
-                minimal = await self.bot.dota2.create_partial_match(row["match_id"]).minimal()
+                async with self.bot.dota2_pool.acquire() as client:
+                    minimal = await client.create_partial_match(row["match_id"]).minimal()
             except ValueError:
                 # this way any matches that errored out more 12 times gonna be ignored
                 # not sure how I feel about such solution;
@@ -1206,14 +1240,14 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         for row in rows:
             players = players_cache.get(row["match_id"])
             if not players:
-                match = await self.bot.dota2.opendota.matches(row["match_id"])
                 try:
-                    match["players"]
-                except KeyError:
+                    match = await self.bot.dota2.opendota.matches(row["match_id"])
+                    players = match["players"]
+                except KeyError, aiohttp.ClientResponseError:
+                    # not parsed yet or OpenDota doesn't know the match (404), try again next time
                     continue
                 else:
-                    players = match["players"]
-                    players_cache[match["match_id"]] = match["players"]
+                    players_cache[match["match_id"]] = players
 
             player = players[row["player_slot"]]
             is_abandon = bool(player["abandons"])
@@ -1271,15 +1305,16 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             known_party_members = " \N{BULLET} ".join(v[1] for v in members.values() if v[1])
             response += known_party_members
 
-        unknown_party_members = " \N{BULLET} ".join(
-            [f"{(await self.bot.dota2.fetch_user(v[0])).name} ({k})" for k, v in members.items() if not v[1]]
-        )
+        async with self.bot.dota2_pool.acquire(friend.steam_user.id) as client:
+            unknown_party_members = " \N{BULLET} ".join(
+                [f"{(await client.fetch_user(v[0])).name} ({k})" for k, v in members.items() if not v[1]]
+            )
         if response:
             response += f". And not notable to the bot: {unknown_party_members}"
         else:
             # zero known members
             response = f"Party members IDs: {unknown_party_members}"
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     async def score_response_helper(self, broadcaster_id: str, stream_started_at: datetime.datetime | None = None) -> str:
         """Helper function to get !wl commands response."""
@@ -1349,7 +1384,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
 
         response = " \N{LARGE PURPLE CIRCLE} ".join(
             # Let's make extra query to know name accounts
-            f"{u.name if (u := self.bot.dota2.get_user(friend_id)) else friend_id}: {part}"
+            f"{u.name if (u := self.bot.dota2_pool.get_user(friend_id)) else friend_id}: {part}"
             for friend_id, part in response_parts.items()
         )
         if not stream_started_at:
@@ -1368,7 +1403,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             response = await self.score_response_helper(ctx.broadcaster.id)
         else:
             response = await self.score_response_helper(ctx.broadcaster.id, streamer.started_dt)
-        await ctx.send(content=response)
+        await self.respond(ctx, response)
 
     @score.command()
     async def offline(self, ctx: IreContext) -> None:
@@ -1379,7 +1414,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         their Dota 2 matches.
         """
         response = await self.score_response_helper(ctx.broadcaster.id)
-        await ctx.send(content=response)
+        await self.respond(ctx, response)
 
     @commands.group(invoke_fallback=True)
     async def mmr(self, ctx: IreContext) -> None:
@@ -1394,7 +1429,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
 
         profile_card = await friend.steam_user.dota2_profile_card()
         response = f"Medal: {dota2utils.rank_medal_display_name(profile_card)} \N{BULLET} Database tracked MMR: {mmr}"
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.is_broadcaster()
     @mmr.command(name="set")
@@ -1416,7 +1451,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         friend = await self.find_friend_account(ctx.broadcaster.id, is_green_online_required=False)
         if not (invoked := ctx.invoked_with):
             invoked = "stratz"
-        await ctx.send(content=f"{invoked}.com/players/{friend.steam_user.id}")
+        await self.respond(ctx, f"{invoked}.com/players/{friend.steam_user.id}")
 
     @commands.command(aliases=["lastseen"])
     async def status(self, ctx: IreContext) -> None:
@@ -1433,7 +1468,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             f"changed to it {fmt.timedelta_to_words(delta, fmt=fmt.TimeDeltaFormat.Letter)} ago "
             "(while being green-online in Dota 2)"
         )
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     @commands.command(name="d2pt")
     async def dota2protracker_hero_page(self, ctx: IreContext) -> None:
@@ -1445,7 +1480,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
             response = url_parse.quote(f"dota2protracker.com/hero/{hero.display_name}")
         else:
             response = "The streamer has not picked a hero yet."
-        await ctx.send(response)
+        await self.respond(ctx, response)
 
     #################################
     # SPECIAL PEOPLE ONLY COMMANDS  #
@@ -1545,8 +1580,8 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         Unfortunately, specifically, Dota 2 Coordinator usually takes ~30 seconds to get ready.
         """
         await self.bot.wait_until_ready()
-        await self.bot.dota2.wait_until_ready()
-        await self.bot.dota2.wait_until_gc_ready()
+        await self.bot.dota2_pool.wait_until_ready()
+        await self.bot.dota2_pool.wait_until_gc_ready()
         await self.bot.streamers_index_ready.wait()
 
     @fill_completed_matches_from_gc_match_history.before_loop
@@ -1587,7 +1622,7 @@ class Dota2RichPresenceFlow(IrePublicComponent):
     @ireloop(count=1)
     async def debug_announce_gc_ready(self) -> None:
         """Announce in Irene's twitch chat that Dota 2 GC is ready."""
-        await self.bot.dota2.wait_until_gc_ready()
+        await self.bot.dota2_pool.wait_until_gc_ready()
         await self.debug_deliver("Connection to Dota 2 Game Coordinator is ready")
 
     @commands.Component.listener("heroes_data_ready")
@@ -1608,24 +1643,34 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         if friend.steam_user.id == env.STEAM_FRIEND_IRENE_ID32:
             await self.debug_deliver(f"Activity changed to: {friend.activity}")
 
-    @ireloop(count=1)
-    async def tuesday_problems(self) -> None:
-        """A crutch to try to solve infamous Tuesday Steam maintenance problems.
+    @commands.Component.listener("dota2_reconnecting")
+    async def pause_on_dota2_reconnect(self, client: dota2utils.Dota2Client) -> None:
+        """Pause the flow while `Dota2ClientPool` reconnects one of its clients.
 
-        When steam crashes - it always is a big problem for the bot;
-        It doesn't ever properly reconnect or restart on its own.
+        This replaces the old crutch of restarting the whole bot after infamous Tuesday Steam maintenance problems.
+        """
+        log.warning("Pausing Rich Presence flow while Dota 2 Client #%s reconnects.", client.shard)
+        self.reconnecting_shards.add(client.shard)
+        self.bot.friends_index_ready.clear()
+        self.fill_completed_matches_from_gc_match_history.cancel()
 
-        Let's put a crutch to simply restart the bot if that happens.
+    @commands.Component.listener("dota2_reconnected")
+    async def resume_after_dota2_reconnect(self, client: dota2utils.Dota2Client) -> None:
+        """Resume the flow once all clients are reconnected.
+
+        `Friend` objects are bound to the old client state, so the friend index is rebuilt from scratch.
         """
-        try:
-            async with asyncio.timeout(11 * 60):  # 11 minutes
-                await self.bot.dota2.wait_until_gc_ready()
-        except TimeoutError:
-            log.warning("🔴 Failed to wait for Dota 2 Game Coordinator to get ready - restarting the bot. 🔴")
-            try:
-                await asyncio.create_subprocess_shell("sudo systemctl restart irebot")
-            except Exception:
-                log.exception("Failed to Restart the bot's process", stack_info=True)
+        self.reconnecting_shards.discard(client.shard)
+        if self.reconnecting_shards:
+            return
+
+        log.info("Resuming Rich Presence flow after Dota 2 Client #%s reconnected.", client.shard)
+        if self.starting_fill_friends.is_running():
+            self.starting_fill_friends.restart()
+        else:
+            self.starting_fill_friends.start()
+        if not self.fill_completed_matches_from_gc_match_history.is_running():
+            self.fill_completed_matches_from_gc_match_history.start()
 
     @commands.is_owner()
     @commands.command(name="raw_rp")
@@ -1636,9 +1681,33 @@ class Dota2RichPresenceFlow(IrePublicComponent):
         await self.bot.error_webhook.send(content=to_send)
         await ctx.send(content="Done")
 
+    @commands.is_owner()
+    @commands.command(name="rp_record")
+    async def toggle_rp_recorder(self, ctx: IreContext) -> None:
+        """Toggle recording of all rich presence updates into `.temp/` for offline replays."""
+        if self.recorder:
+            self.flush_rp_recorder.cancel()
+            await self.recorder.flush()
+            response = f"Stopped recording: {self.recorder.recorded} updates saved to {self.recorder.path}"
+            self.recorder = None
+        else:
+            self.recorder = RichPresenceRecorder()
+            self.flush_rp_recorder.start()
+            response = f"Started recording rich presence updates into {self.recorder.path}"
+        await ctx.send(response)
+
+    @ireloop(seconds=30)
+    async def flush_rp_recorder(self) -> None:
+        """Flush buffered rich presence records to the disk."""
+        if self.recorder:
+            await self.recorder.flush()
+
     @override
     async def component_command_error(self, payload: commands.CommandErrorPayload) -> bool | None:
         """Event called when an error occurs in a command in this Component."""
+        if isinstance(payload.exception, dota2utils.APIClientUnavailableError):
+            await payload.context.send(str(payload.exception))
+            return False
         if isinstance(payload.exception, dota2utils.APIClientError):
             msg = "I'm not able to fetch data for this match, sorry!"
             await payload.context.send(msg)
@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from typing import Literal, NotRequired, TypedDict
 
-__all__ = ("OpendotaMatches", "SteamWebRealTimeStats", "StratzItems")
+__all__ = (
+    "OpendotaMatches",
+    "SteamWebRealTimeStats",
+    "StratzGameVersions",
+    "StratzHeroes",
+    "StratzItems",
+)
 
 ####################
 #   1. OPENDOTA    #
@@ -15,17 +21,26 @@ class OpendotaMatches(TypedDict):
     """Typing Dict for response json for the OpenDota's `GET matches` endpoint.
 
     I didn't include all fields; just those that I need at the moment.
+    Must match `OpenDotaClient.fields` - the rest is dropped right after decoding.
     """
 
     players: list[OpendotaMatchesPlayer]
     match_id: int
     lobby_type: int
     game_mode: int
+    version: int | None
+    """Parser version; `None` until OpenDota parses the replay."""
 
 
 class OpendotaMatchesPlayer(TypedDict):
     abandons: Literal[0, 1]
     account_id: NotRequired[int]
+    player_slot: int
+    hero_id: int
+    leaver_status: int
+    kills: int
+    deaths: int
+    assists: int
 
 
 ####################
@@ -52,42 +67,72 @@ class StratzItem(TypedDict):
     displayName: str
 
 
+class StratzHeroes(TypedDict):
+    """Schema for Stratz GraphQL `get_heroes` response."""
+
+    data: StratzHeroData
+
+
+class StratzHeroData(TypedDict):
+    constants: StratzHeroConstants
+
+
+class StratzHeroConstants(TypedDict):
+    heroes: list[StratzHero]
+
+
+class StratzHero(TypedDict):
+    id: int
+    displayName: str
+
+
+class StratzGameVersions(TypedDict):
+    """Schema for Stratz GraphQL `get_game_versions` response."""
+
+    data: StratzGameVersionData
+
+
+class StratzGameVersionData(TypedDict):
+    constants: StratzGameVersionConstants
+
+
+class StratzGameVersionConstants(TypedDict):
+    gameVersions: list[StratzGameVersion]
+
+
+class StratzGameVersion(TypedDict):
+    id: int
+    name: str
+
+
 ####################
 # 3. STEAM WEB API #
 ####################
 
 
 class SteamWebRealTimeStats(TypedDict):
-    """Schema for `get_real_time_stats` response."""
+    """Schema for `get_real_time_stats` response.
+
+    Only fields from `SteamWebAPIClient.fields` - the rest
+    (`buildings`, `graph_data`, players' positions, abilities, etc.) is dropped right after decoding.
+    """
 
     match: SteamWebRealTimeStatsMatch
     teams: list[SteamWebRealTimeStatsTeam]
-    buildings: list[SteamWebRealTimeStatsBuilding]
-    graph_data: SteamWebRealTimeStatsGraphData
 
 
 class SteamWebRealTimeStatsMatch(TypedDict):
     server_steam_id: str
     match_id: str
-    timestamp: int
-    game_time: int
     game_mode: int
-    league_id: int
-    league_node_id: int
-    game_state: int
     lobby_type: int
     start_timestamp: int
 
 
 class SteamWebRealTimeStatsTeam(TypedDict):
     team_number: Literal[2, 3]
-    team_id: int
-    team_name: str
-    team_tag: str
-    team_logo: str
     score: int
     net_worth: int
-    team_logo_url: str
     players: list[SteamWebRealTimeStatsTeamPlayer]
 
 
@@ -101,27 +146,7 @@ class SteamWebRealTimeStatsTeamPlayer(TypedDict):
     kill_count: int
     death_count: int
     assists_count: int
-    denies_count: int
     lh_count: int
-    gold: int
-    x: float
-    y: float
     net_worth: int
-    abilities: list[int]
     items: list[int]
     team_slot: Literal[0, 1, 2, 3, 4]
-
-
-class SteamWebRealTimeStatsBuilding(TypedDict):
-    team: Literal[2, 3]
-    heading: float
-    type: int
-    lane: int
-    tier: int
-    x: float
-    y: float
-    destroyed: bool
-
-
-class SteamWebRealTimeStatsGraphData(TypedDict):
-    graph_gold: list[int]
@@ -1,8 +1,25 @@
-from . import (
-    const as const,
-    errors as errors,
-    fmt as fmt,
-    fuzzy as fuzzy,
-    guards as guards,
-    helpers as helpers,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import (
+        const as const,
+        errors as errors,
+        fmt as fmt,
+        fuzzy as fuzzy,
+        guards as guards,
+        helpers as helpers,
+    )
+
+__all__ = ("const", "errors", "fmt", "fuzzy", "guards", "helpers")
+
+
+def __getattr__(name: str) -> Any:
+    # submodules are imported on first use: `fmt` pulls in `discord` and `guards` pulls in `twitchio`,
+    # while i.e. `main.py --help` only needs `const`
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,183 @@
+"""Shared HTTP session: tuned connector and per-host timing stats.
+
+Every module shares one `aiohttp.ClientSession` (Dota API clients, Discord webhooks, emote checks, Spotify, translate),
+so the connector is tuned here: keep-alive, DNS cache and a per-host connection limit,
+so one slow upstream can't take all connections from the others.
+The session keeps aiohttp's default timeouts since it's shared by everything (i.e. long Discord webhook uploads),
+clients that need tighter ones pass them per request (see `APIClient.timeout`).
+`HTTPStats` hooks into the session's `TraceConfig` to see where HTTP latency goes per host:
+waiting for a free connection, DNS, connecting, time to first byte and connection reuse.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import SimpleNamespace
+
+    from aiohttp import (
+        ClientMiddlewareType,
+        TraceConnectionCreateEndParams,
+        TraceConnectionCreateStartParams,
+        TraceConnectionQueuedEndParams,
+        TraceConnectionQueuedStartParams,
+        TraceConnectionReuseconnParams,
+        TraceDnsCacheHitParams,
+        TraceDnsResolveHostEndParams,
+        TraceDnsResolveHostStartParams,
+        TraceRequestEndParams,
+        TraceRequestExceptionParams,
+        TraceRequestStartParams,
+    )
+
+__all__ = ("ConnectorConfig", "HTTPStats", "HostStats", "create_session")
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectorConfig:
+    """Settings of the shared session's connector."""
+
+    limit: int = 100
+    """Total amount of simultaneous connections."""
+    limit_per_host: int = 20
+    """Simultaneous connections to one host; keeps a slow upstream from starving the others."""
+    keepalive_timeout: float = 30
+    """Seconds to keep an idle connection open for reuse."""
+    ttl_dns_cache: int = 300
+    """Seconds to cache resolved hosts for."""
+
+
+@dataclass(slots=True)
+class HostStats:
+    """Timings of requests to one host."""
+
+    requests: int = 0
+    errors: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    dns_cache_hits: int = 0
+    statuses: Counter[int] = field(default_factory=Counter)
+    queue_wait: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    """Seconds spent waiting for a free connection (only when the pool was full)."""
+    dns: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    connect: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    ttfb: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    """Seconds from sending the request to getting response headers."""
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else 0.0
+
+    @staticmethod
+    def p90(samples: deque[float]) -> float:
+        if len(samples) < 2:
+            return samples[0] if samples else 0.0
+        return statistics.quantiles(samples, n=10)[-1]
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} req, {self.errors} err, reuse {self.reuse_ratio:.0%}, "
+            f"p90 ttfb {self.p90(self.ttfb) * 1e3:.0f}ms, connect {self.p90(self.connect) * 1e3:.0f}ms, "
+            f"queue {self.p90(self.queue_wait) * 1e3:.0f}ms"
+        )
+
+
+class HTTPStats:
+    """Per-host HTTP timings collected with `aiohttp.TraceConfig` hooks."""
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, HostStats] = {}
+        self.trace_config: aiohttp.TraceConfig = aiohttp.TraceConfig()
+        tc = self.trace_config
+        tc.on_request_start.append(self.on_request_start)
+        tc.on_request_end.append(self.on_request_end)
+        tc.on_request_exception.append(self.on_request_exception)
+        tc.on_connection_queued_start.append(self.on_connection_queued_start)
+        tc.on_connection_queued_end.append(self.on_connection_queued_end)
+        tc.on_connection_create_start.append(self.on_connection_create_start)
+        tc.on_connection_create_end.append(self.on_connection_create_end)
+        tc.on_connection_reuseconn.append(self.on_connection_reuseconn)
+        tc.on_dns_resolvehost_start.append(self.on_dns_resolvehost_start)
+        tc.on_dns_resolvehost_end.append(self.on_dns_resolvehost_end)
+        tc.on_dns_cache_hit.append(self.on_dns_cache_hit)
+
+    def host(self, ctx: SimpleNamespace) -> HostStats:
+        return self.hosts.setdefault(ctx.host, HostStats())
+
+    @staticmethod
+    def now() -> float:
+        return asyncio.get_running_loop().time()
+
+    async def on_request_start(self, _: Any, ctx: SimpleNamespace, params: TraceRequestStartParams) -> None:
+        ctx.host = params.url.host or "?"
+        ctx.request_start = self.now()
+        self.host(ctx).requests += 1
+
+    async def on_request_end(self, _: Any, ctx: SimpleNamespace, params: TraceRequestEndParams) -> None:
+        stats = self.host(ctx)
+        stats.ttfb.append(self.now() - ctx.request_start)
+        stats.statuses[params.response.status] += 1
+
+    async def on_request_exception(self, _: Any, ctx: SimpleNamespace, __: TraceRequestExceptionParams) -> None:
+        self.host(ctx).errors += 1
+
+    async def on_connection_queued_start(self, _: Any, ctx: SimpleNamespace, __: TraceConnectionQueuedStartParams) -> None:
+        ctx.queued_start = self.now()
+
+    async def on_connection_queued_end(self, _: Any, ctx: SimpleNamespace, __: TraceConnectionQueuedEndParams) -> None:
+        self.host(ctx).queue_wait.append(self.now() - ctx.queued_start)
+
+    async def on_connection_create_start(self, _: Any, ctx: SimpleNamespace, __: TraceConnectionCreateStartParams) -> None:
+        ctx.connect_start = self.now()
+
+    async def on_connection_create_end(self, _: Any, ctx: SimpleNamespace, __: TraceConnectionCreateEndParams) -> None:
+        stats = self.host(ctx)
+        stats.connect.append(self.now() - ctx.connect_start)
+        stats.new_connections += 1
+
+    async def on_connection_reuseconn(self, _: Any, ctx: SimpleNamespace, __: TraceConnectionReuseconnParams) -> None:
+        self.host(ctx).reused_connections += 1
+
+    async def on_dns_resolvehost_start(self, _: Any, ctx: SimpleNamespace, __: TraceDnsResolveHostStartParams) -> None:
+        ctx.dns_start = self.now()
+
+    async def on_dns_resolvehost_end(self, _: Any, ctx: SimpleNamespace, __: TraceDnsResolveHostEndParams) -> None:
+        self.host(ctx).dns.append(self.now() - ctx.dns_start)
+
+    async def on_dns_cache_hit(self, _: Any, ctx: SimpleNamespace, __: TraceDnsCacheHitParams) -> None:
+        self.host(ctx).dns_cache_hits += 1
+
+    def summary(self, top: int = 3) -> str:
+        """Short summary of the busiest hosts, fits into a chat message."""
+        busiest = sorted(self.hosts.items(), key=lambda item: item[1].requests, reverse=True)[:top]
+        return " | ".join(f"{host}: {stats.summary()}" for host, stats in busiest) or "No HTTP requests yet."
+
+
+def create_session(
+    config: ConnectorConfig | None = None,
+    *,
+    stats: HTTPStats | None = None,
+    middlewares: Sequence[ClientMiddlewareType] = (),
+) -> aiohttp.ClientSession:
+    """Create the shared session with a tuned connector and, optionally, timing hooks."""
+    config = config or ConnectorConfig()
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.ttl_dns_cache,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        trace_configs=[stats.trace_config] if stats else None,
+        middlewares=tuple(middlewares),
+    )
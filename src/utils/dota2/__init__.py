@@ -1,4 +1,5 @@
 from .api_clients import *
 from .dota2client import *
 from .enums import *
+from .models import *
 from .tools import *
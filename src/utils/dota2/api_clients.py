@@ -2,67 +2,701 @@ from __future__ import annotations
 
 import abc
 import asyncio
-from typing import TYPE_CHECKING, Any, override
+import contextlib
+import datetime
+import hashlib
+import itertools
+import logging
+import pathlib
+import random
+import re
+import statistics
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, override
 
+import aiohttp
 import orjson
 
 from ..errors import IreBotError
+from ..helpers import CircuitBreaker, TokenBucket
+from .cache import CachePolicy, MatchPayloadStore, ResponseCache
+from .models import RealTimeStats
 
 if TYPE_CHECKING:
-    import aiohttp
+    from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Sequence
 
-    from types_.dota_api_schemas import OpendotaMatches, SteamWebRealTimeStats, StratzItems
+    from types_.dota_api_schemas import (
+        OpendotaMatches,
+        StratzGameVersions,
+        StratzHeroes,
+        StratzItems,
+    )
 
-__all__ = ("APIClientError", "OpenDotaClient", "SteamWebAPIClient", "StratzClient")
+__all__ = (
+    "APIClientError",
+    "APIClientUnavailableError",
+    "APIKey",
+    "APIKeyPool",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "GraphQLDocument",
+    "OpenDotaClient",
+    "RateLimitedError",
+    "SteamWebAPIClient",
+    "StratzClient",
+    "merge_documents",
+    "parse_document",
+    "select_fields",
+)
+
+log = logging.getLogger(__name__)
+
+type FieldSpec = dict[str, FieldSpec | None]
+"""Fields to keep from a JSON response.
+
+`None` keeps the value as it is, a nested spec selects fields of the object (or of every object in the list).
+"""
+
+
+def select_fields(data: Any, spec: FieldSpec) -> Any:
+    """Keep only fields declared in `spec` from decoded JSON `data`."""
+    if isinstance(data, list):
+        return [select_fields(item, spec) for item in data]  # pyright: ignore[reportUnknownVariableType]
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: data[key] if sub_spec is None else select_fields(data[key], sub_spec)
+        for key, sub_spec in spec.items()
+        if key in data
+    }
 
 
 class APIClientError(IreBotError):
     """Errors related to API Client."""
 
 
+class APIClientUnavailableError(APIClientError):
+    """API Client refused to send a request at all. The message is fine to show to chatters."""
+
+
+class RateLimitedError(APIClientUnavailableError):
+    """Raised when the client-side rate limit would make the request wait for too long."""
+
+
+class CircuitOpenError(APIClientUnavailableError):
+    """Raised when the upstream failed too many times in a row and the circuit breaker is open."""
+
+
+class DeadlineExceededError(APIClientUnavailableError):
+    """Raised when the response didn't arrive within the caller's latency budget."""
+
+
+@dataclass(slots=True)
+class GuardedCall:
+    """A request made within `APIClient.guard`; the request code reports the response status into it."""
+
+    status: int | None = None
+    """HTTP status of the response; 5xx and 429 count as upstream failures for the circuit breaker."""
+    abandoned: bool = False
+    """Set when the response says nothing about the upstream's health (i.e. a retry with another key)."""
+
+    @property
+    def failed(self) -> bool:
+        return self.status is not None and (self.status >= 500 or self.status == 429)
+
+
+@dataclass(slots=True)
+class APIKey:
+    """An API key with its own quota bucket and usage stats."""
+
+    value: str = field(repr=False)
+    bucket: TokenBucket
+    requests: int = 0
+    throttled: int = 0
+    """How many times the key got 429 Too Many Requests (or 403) back."""
+    cooldown_until: float = 0.0
+    """`time.monotonic()` until which the key is out of rotation."""
+    used_today: int = 0
+    """Requests made with the key since the start of the current UTC day."""
+
+
+class APIKeyPool:
+    """Pool of API keys of the same provider; every key has its own quota.
+
+    `acquire` picks the key with the most quota left (round-robin between equals),
+    keys that got throttled by the provider are out of rotation until their cooldown ends
+    and keys that used up their daily quota are out of rotation until the next UTC day.
+
+    Parameters
+    ----------
+    keys
+        API keys.
+    rate_limit
+        `(capacity, rate)` of a token bucket for every key, see `APIClient.rate_limit`.
+        The bucket only smooths out bursts, it knows nothing about calendar days.
+    daily_quota
+        Requests every key is allowed to make per UTC day, `None` if the provider has no daily quota.
+    """
+
+    def __init__(self, keys: Sequence[str], rate_limit: tuple[float, float], daily_quota: int | None = None) -> None:
+        if not keys:
+            msg = "API key pool needs at least one key."
+            raise ValueError(msg)
+        self.keys: list[APIKey] = [APIKey(key, TokenBucket(*rate_limit)) for key in dict.fromkeys(keys)]
+        self.cursor: int = 0
+        self.daily_quota: int | None = daily_quota
+        self.day: datetime.date = self.today()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def today() -> datetime.date:
+        """Current UTC date, daily quotas reset at UTC midnight."""
+        return datetime.datetime.now(datetime.UTC).date()
+
+    def roll_over(self) -> None:
+        """Reset daily counters of every key once the UTC day changes."""
+        today = self.today()
+        if today != self.day:
+            self.day = today
+            for key in self.keys:
+                key.used_today = 0
+
+    def exhausted(self, key: APIKey) -> bool:
+        """Whether the key used up its quota for the current UTC day."""
+        return self.daily_quota is not None and key.used_today >= self.daily_quota
+
+    def acquire(self) -> APIKey | None:
+        """Spend a request from the best key or return `None` if every key is cooling down or out of quota."""
+        self.roll_over()
+        now = time.monotonic()
+        rotated = self.keys[self.cursor :] + self.keys[: self.cursor]
+        self.cursor = (self.cursor + 1) % len(self.keys)
+        available = [
+            key for key in rotated if key.cooldown_until <= now and not self.exhausted(key) and key.bucket.remaining() >= 1
+        ]
+        if not available:
+            return None
+        key = max(available, key=lambda key: key.bucket.remaining())
+        key.bucket.try_spend()
+        key.requests += 1
+        key.used_today += 1
+        return key
+
+    def retry_after(self) -> float:
+        """Seconds until some key is back in rotation."""
+        self.roll_over()
+        now = time.monotonic()
+        next_day = datetime.datetime.combine(self.day + datetime.timedelta(days=1), datetime.time(), tzinfo=datetime.UTC)
+        until_next_day = (next_day - datetime.datetime.now(datetime.UTC)).total_seconds()
+        return min(
+            until_next_day if self.exhausted(key) else max(key.cooldown_until - now, key.bucket.retry_after())
+            for key in self.keys
+        )
+
+    def cooldown(self, key: APIKey, seconds: float) -> None:
+        """Take a throttled key out of rotation for `seconds`."""
+        key.throttled += 1
+        key.cooldown_until = time.monotonic() + seconds
+        log.warning("API key #%s is throttled, cooling down for %.0f sec.", self.keys.index(key), seconds)
+
+
 class APIClient(abc.ABC):
+    """Base class for API clients.
+
+    Client methods call `invoke(endpoint, **params)` which looks into the response cache first
+    (per-endpoint `cache_policies`, otherwise `default_cache_policy`) and only then `send`s the request.
+    Callers can pass a latency `budget` so they get `DeadlineExceededError` instead of waiting for too long
+    and ask to `hedge` the request: send a second one if the first is slower than usual (p90) for the endpoint.
+    Every request should go through `guard()` which provides
+    * a token bucket matching the provider's documented quota (`rate_limit`);
+    * a circuit breaker so a degraded provider fails fast instead of making every command wait for aiohttp timeouts;
+    * `stats` counters for requests, throttled, failed and open-circuit (rejected) requests as well as cache hits/misses.
+    """
+
+    name: ClassVar[str] = "API"
+    rate_limit: ClassVar[tuple[float, float]] = (60, 1)
+    """`(capacity, rate)` of the token bucket: burst size and tokens per second."""
+    max_throttle_wait: ClassVar[float] = 5.0
+    """Requests that would have to wait for a token longer than this are rejected right away."""
+    timeout: ClassVar[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(total=60, connect=10)
+    """Timeout of every request, so stuck requests don't hold the shared session's connections forever.
+    `connect` includes waiting for a free connection in the pool.
+    """
+    failure_exceptions: ClassVar[tuple[type[BaseException], ...]] = (aiohttp.ClientError, TimeoutError, APIClientError)
+    default_cache_policy: ClassVar[CachePolicy] = CachePolicy(ttl=60)
+    cache_policies: ClassVar[dict[str, CachePolicy]] = {}
+    """Endpoint -> caching policy, for endpoints that need something other than `default_cache_policy`."""
+    cache_size: ClassVar[int] = 256
+    fields: ClassVar[dict[str, FieldSpec]] = {}
+    """Endpoint -> fields that the bot actually reads from the response.
+
+    The rest is dropped right after decoding, so big unused arrays don't stay in the caches.
+    Endpoints without a spec keep the whole response.
+    """
+    decoders: ClassVar[dict[str, Callable[[Any], Any]]] = {}
+    """Endpoint -> decoder of the (selected) response into an object, applied before caching."""
+    min_latency_samples: ClassVar[int] = 20
+    """Amount of latency samples of the endpoint needed before requests to it can be hedged."""
+
     def __init__(self, *, session: aiohttp.ClientSession) -> None:
         self.session: aiohttp.ClientSession = session
+        self.bucket: TokenBucket = TokenBucket(*self.rate_limit)
+        self.breaker: CircuitBreaker = CircuitBreaker()
+        self.stats: Counter[str] = Counter()
+        self.cache: ResponseCache = ResponseCache(self.cache_size, self.stats)
+        self.latencies: dict[str, deque[float]] = {}
+        """Endpoint -> latencies (in seconds) of the recent successful requests."""
+
+    async def invoke(self, endpoint: str, *, budget: float | None = None, hedge: bool = False, **params: Any) -> Any:
+        """Invoke a request to the API, with caching according to the endpoint's policy.
+
+        Parameters
+        ----------
+        budget
+            Max amount of seconds the caller is ready to wait for. The request itself keeps going after that,
+            so its response is cached for the next call.
+        hedge
+            Whether to hedge the request, see `hedged`. For interactive calls, i.e. chat commands.
+
+        Raises
+        ------
+        DeadlineExceededError
+            The response didn't arrive within `budget`.
+        """
+        policy = self.cache_policies.get(endpoint, self.default_cache_policy)
+        key = (endpoint, *sorted(params.items()))
+        deadline = None if budget is None else asyncio.get_running_loop().time() + budget
+
+        async def fetch() -> Any:
+            response = await self.send(endpoint, deadline=deadline, hedge=hedge, **params)
+            if (spec := self.fields.get(endpoint)) is not None:
+                response = select_fields(response, spec)
+            if (decoder := self.decoders.get(endpoint)) is not None:
+                response = decoder(response)
+            return response
+
+        timeout = asyncio.timeout_at(deadline)
+        try:
+            async with timeout:
+                return await self.cache.get_or_fetch(key, policy.ttl, fetch)
+        except TimeoutError:
+            if not timeout.expired():
+                # the request itself timed out
+                raise
+            self.stats["deadline_exceeded"] += 1
+            msg = f"{self.name} data is not ready yet, try again in a few seconds."
+            raise DeadlineExceededError(msg) from None
 
     @abc.abstractmethod
-    async def invoke(self, *args: Any, **kwargs: Any) -> Any: ...
+    async def request(self, endpoint: str, **params: Any) -> Any:
+        """Send a request to the API, no caching."""
+
+    async def send(self, endpoint: str, *, deadline: float | None, hedge: bool, **params: Any) -> Any:
+        """Send a request to the API, hedged if asked to.
+
+        Subclasses can override it to add retries that respect the `deadline` (event loop time).
+        """
+        if hedge and deadline is not None and (p90 := self.p90(endpoint)) is not None:
+            # the hedge would go out after the caller stopped waiting, so it would be a wasted request
+            hedge = asyncio.get_running_loop().time() + p90 < deadline
+        if hedge:
+            return await self.hedged(endpoint, lambda: self.request(endpoint, **params))
+        return await self.timed(endpoint, self.request(endpoint, **params))
+
+    async def timed[T](self, endpoint: str, attempt: Awaitable[T]) -> T:
+        """Await a request and record its latency if it succeeds."""
+        start = time.perf_counter()
+        result = await attempt
+        self.latencies.setdefault(endpoint, deque(maxlen=100)).append(time.perf_counter() - start)
+        return result
+
+    def p90(self, endpoint: str) -> float | None:
+        """90th percentile of the endpoint latency or `None` if there are not enough samples yet."""
+        samples = self.latencies.get(endpoint)
+        if not samples or len(samples) < self.min_latency_samples:
+            return None
+        return statistics.quantiles(samples, n=10)[-1]
+
+    async def hedged[T](self, endpoint: str, make_attempt: Callable[[], Awaitable[T]]) -> T:
+        """Send a request; if it's slower than p90 for the endpoint, send a second one and take whichever is first.
+
+        Costs ~10% extra requests but cuts the tail latency of interactive calls.
+        """
+        if (p90 := self.p90(endpoint)) is None:
+            return await self.timed(endpoint, make_attempt())
+
+        tasks = {asyncio.create_task(self.timed(endpoint, make_attempt()))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=p90)
+            if not done:
+                self.stats["hedged"] += 1
+                tasks.add(asyncio.create_task(self.timed(endpoint, make_attempt())))
+            while True:
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                # prefer a success; only give up once every attempt has failed
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    return done.pop().result()
+                tasks = pending
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def throttle(self) -> None:
+        """Wait for a token from the bucket."""
+        while not self.bucket.try_spend():
+            retry_after = self.bucket.retry_after()
+            if retry_after > self.max_throttle_wait:
+                self.stats["throttled"] += 1
+                msg = f"Too many {self.name} requests right now. Try again in {retry_after:.0f} sec."
+                raise RateLimitedError(msg)
+            self.stats["delayed"] += 1
+            await asyncio.sleep(retry_after)
+
+    @staticmethod
+    async def read_json(resp: aiohttp.ClientResponse) -> Any:
+        """Decode the JSON body with orjson, failing just like `resp.json` does.
+
+        orjson decodes utf-8 bytes directly, unlike `resp.json` which makes a `str` copy of the body first.
+        Error statuses raise `aiohttp.ClientResponseError` and non-JSON bodies (i.e. HTML 502 pages of a proxy)
+        raise `aiohttp.ContentTypeError` (its subclass), so callers and the circuit breaker see the same errors as before.
+        """
+        resp.raise_for_status()
+        if resp.content_type != "application/json":
+            raise aiohttp.ContentTypeError(
+                resp.request_info,
+                resp.history,
+                status=resp.status,
+                message=f"Attempt to decode JSON with unexpected mimetype: {resp.content_type}",
+                headers=resp.headers,
+            )
+        return orjson.loads(await resp.read())
+
+    def record_failure(self) -> None:
+        self.stats["failed"] += 1
+        was_open = self.breaker.is_open
+        self.breaker.record_failure()
+        if self.breaker.is_open and not was_open:
+            log.warning("%s circuit is open after %s failures in a row.", self.name, self.breaker.failures)
+
+    @contextlib.asynccontextmanager
+    async def guard(self) -> AsyncIterator[GuardedCall]:
+        """Rate-limit and circuit-break one request made within this context.
+
+        The request code sets `call.status` to the response status so 5xx and 429 responses count as failures
+        even if they don't raise.
+
+        Raises
+        ------
+        RateLimitedError
+            The request would be waiting for the rate limit for too long.
+        CircuitOpenError
+            The circuit is open because of previous failures.
+        """
+        if not self.breaker.allow():
+            self.stats["circuit_open"] += 1
+            msg = f"{self.name} is unavailable right now. Try again in {self.breaker.retry_after():.0f} sec."
+            raise CircuitOpenError(msg)
+
+        call = GuardedCall()
+        try:
+            # inside `try` so a half-open probe that never got sent is abandoned
+            await self.throttle()
+            self.stats["requests"] += 1
+            yield call
+        except RateLimitedError:
+            # our own limits, not the upstream's health
+            self.breaker.abandon()
+            raise
+        except aiohttp.ClientResponseError as exc:
+            call.status = exc.status
+            if call.failed or isinstance(exc, aiohttp.ContentTypeError):
+                self.record_failure()
+            else:
+                # 4xx: the upstream is alive and answered, it's the request that's wrong
+                self.breaker.record_success()
+            raise
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            if call.failed:
+                # i.e. an HTML 503 page that failed to decode - the status says enough
+                self.record_failure()
+            else:
+                self.breaker.abandon()
+            raise
+        else:
+            if call.abandoned:
+                self.breaker.abandon()
+            elif call.failed:
+                self.record_failure()
+            else:
+                self.breaker.record_success()
 
 
 class OpenDotaClient(APIClient):
     """A class for interacting with OpenDota API."""
 
+    name = "OpenDota"
+    # free tier: 60 calls per minute
+    rate_limit = (60, 1)
+
+    cache_policies: ClassVar[dict[str, CachePolicy]] = {
+        # unparsed matches get new data once OpenDota parses the replay
+        "matches": CachePolicy(ttl=5 * 60),
+    }
+    fields: ClassVar[dict[str, FieldSpec]] = {
+        # the full payload is megabytes of per-minute arrays, chat, teamfights, etc.
+        "matches": {
+            "match_id": None,
+            "lobby_type": None,
+            "game_mode": None,
+            "version": None,
+            "players": {
+                "account_id": None,
+                "player_slot": None,
+                "hero_id": None,
+                "abandons": None,
+                "leaver_status": None,
+                "kills": None,
+                "deaths": None,
+                "assists": None,
+            },
+        },
+    }
+
+    def __init__(self, *, session: aiohttp.ClientSession) -> None:
+        super().__init__(session=session)
+        # stored payloads only have `fields`, so the store is separate for every version of the spec
+        fingerprint = hashlib.sha1(
+            orjson.dumps(self.fields["matches"], option=orjson.OPT_SORT_KEYS), usedforsecurity=False
+        ).hexdigest()[:8]
+        self.match_store: MatchPayloadStore = MatchPayloadStore(pathlib.Path(f".temp/opendota_matches/{fingerprint}"))
+
     @override
-    async def invoke(self, endpoint: str, argument: int) -> Any:
-        """Invoke a request to OpenDota API."""
+    async def request(self, endpoint: str, *, argument: int) -> Any:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Send a request to OpenDota API."""
         url = f"https://api.opendota.com/api/{endpoint}/{argument}"
-        async with self.session.get(url=url) as resp:
-            return await resp.json(loads=orjson.loads)
+        async with self.guard() as call, self.session.get(url=url, timeout=self.timeout) as resp:
+            call.status = resp.status
+            return await self.read_json(resp)
 
     async def matches(self, match_id: int) -> OpendotaMatches:
-        """Get match from opendota API via GET matches endpoint."""
-        return await self.invoke("matches", match_id)
+        """Get match from opendota API via GET matches endpoint.
+
+        Parsed matches never change, so they are kept in `match_store` on disk and not requested again.
+        """
+        if (stored := await self.match_store.get(match_id)) is not None:
+            self.stats["store_hits"] += 1
+            return stored
+
+        match: OpendotaMatches = await self.invoke("matches", argument=match_id)
+        if match.get("version") is not None:
+            # `version` is only filled for matches that OpenDota has parsed the replay of
+            await self.match_store.put(match_id, match)
+        return match
+
+
+GRAPHQL_QUERY_PATTERN = re.compile(r"\s*query\s*\w*\s*\{(?P<selection>.*)\}\s*", re.DOTALL)
+GRAPHQL_FIELD_PATTERN = re.compile(r"(?:(?P<alias>\w+)\s*:\s*)?(?P<name>\w+)")
+
+
+@dataclass(frozen=True, slots=True)
+class GraphQLDocument:
+    """A GraphQL query split into top-level fields, so it can be merged with other queries into one request."""
+
+    digest: str
+    """SHA-256 of the query text."""
+    fields: tuple[tuple[str, str], ...]
+    """`(response key, field without alias)` for every top-level field of the query."""
+
+
+def _skip_block(text: str, start: int, opening: str, closing: str) -> int:
+    """Index right after the block that opens at `text[start]`, skipping string literals."""
+    depth = 0
+    index = start
+    while index < len(text):
+        char = text[index]
+        if char == '"':
+            index = text.index('"', index + 1)
+        elif char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if not depth:
+                return index + 1
+        index += 1
+    msg = f"Unbalanced {opening}{closing} in a GraphQL query."
+    raise ValueError(msg)
+
+
+def parse_document(query: str) -> GraphQLDocument | None:
+    """Split an anonymous or named `query` without variables/fragments into top-level fields.
+
+    Returns `None` for documents that can't be merged with others (variables, fragments, mutations, etc.).
+    """
+    if "$" in query or "..." in query or (match := GRAPHQL_QUERY_PATTERN.fullmatch(query)) is None:
+        return None
+
+    selection = match["selection"]
+    fields: list[tuple[str, str]] = []
+    index = 0
+    while index < len(selection):
+        if selection[index].isspace() or selection[index] == ",":
+            index += 1
+            continue
+        if (field_match := GRAPHQL_FIELD_PATTERN.match(selection, index)) is None:
+            return None
+        end = field_match.end()
+        for opening, closing in ("()", "{}"):
+            while end < len(selection) and selection[end].isspace():
+                end += 1
+            if end < len(selection) and selection[end] == opening:
+                end = _skip_block(selection, end, opening, closing)
+        key = field_match["alias"] or field_match["name"]
+        fields.append((key, selection[field_match.start("name") : end]))
+        index = end
+
+    digest = hashlib.sha256(query.encode()).hexdigest()
+    return GraphQLDocument(digest, tuple(fields)) if fields else None
+
+
+def merge_documents(documents: Sequence[GraphQLDocument]) -> str:
+    """Merge documents into one query; fields of the document `i` are aliased as `q{i}_{key}`."""
+    fields = (f"q{i}_{key}: {field}" for i, document in enumerate(documents) for key, field in document.fields)
+    return "query Batch {\n" + "\n".join(fields) + "\n}"
 
 
 class StratzClient(APIClient):
-    """A class for interacting with Stratz GraphQL API."""
+    """A class for interacting with Stratz GraphQL API.
+
+    Queries issued within `batch_window` of each other are merged into one aliased GraphQL request
+    and the response is split back per caller, i.e. daily storage refreshes take one round-trip instead of one each.
+    """
+
+    name = "Stratz"
+    # default token: 20 calls per second, 2000 calls per hour
+    rate_limit = (20, 2000 / 3600)
+    batch_window: ClassVar[float] = 0.05
+    """Seconds to wait for other queries to merge with."""
+    max_batch_size: ClassVar[int] = 10
 
     def __init__(self, *, bearer_token: str, session: aiohttp.ClientSession) -> None:
         super().__init__(session=session)
         self.bearer_token: str = bearer_token
+        self.documents: dict[str, GraphQLDocument | None] = {}
+        """Query text hash -> parsed document (`None` if it can't be batched); queries are parsed once."""
+        self.merged_documents: dict[tuple[str, ...], str] = {}
+        """Digests of merged documents -> merged query text."""
+        self.batch: list[tuple[GraphQLDocument, asyncio.Future[Any]]] = []
+        self.batch_tasks: set[asyncio.Task[None]] = set()
+        self.flush_scheduled: bool = False
+
+    cache_policies: ClassVar[dict[str, CachePolicy]] = {
+        # the version is the patch signal for `PatchWatcher`, it should be fresh
+        "GameVersions": CachePolicy(ttl=0),
+    }
+
+    def document(self, query: str) -> GraphQLDocument | None:
+        """Parsed query document, cached by the hash of the query text."""
+        key = hashlib.sha256(query.encode()).hexdigest()
+        if key not in self.documents:
+            self.documents[key] = parse_document(query)
+        return self.documents[key]
 
     @override
-    async def invoke(self, query: str) -> Any:
-        """Invoke a request to Stratz GraphQL API."""
-        async with self.session.post(
-            url="https://api.stratz.com/graphql",
-            json={"query": query},
-            headers={
-                "User-Agent": "STRATZ_API",
-                "Authorization": f"Bearer {self.bearer_token}",
-                "Content-Type": "application/json",
-            },
-        ) as resp:
-            return await resp.json(loads=orjson.loads)
+    async def request(self, endpoint: str, *, query: str) -> Any:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Send a query to Stratz GraphQL API, batched with other concurrent queries if possible.
+
+        `endpoint` is the name of the query operation.
+        """
+        if (document := self.document(query)) is None:
+            return await self.post(query)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self.batch.append((document, future))
+        if len(self.batch) >= self.max_batch_size:
+            self.spawn(self.send_batch(self.take_batch()))
+        elif not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.spawn(self.flush_later())
+        return await future
+
+    def spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
+
+    def take_batch(self) -> list[tuple[GraphQLDocument, asyncio.Future[Any]]]:
+        batch, self.batch = self.batch, []
+        return batch
+
+    async def flush_later(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        self.flush_scheduled = False
+        await self.send_batch(self.take_batch())
+
+    async def send_batch(self, batch: list[tuple[GraphQLDocument, asyncio.Future[Any]]]) -> None:
+        """Send queued queries as one request and resolve every caller's future with their part of the response."""
+        batch = [(document, future) for document, future in batch if not future.done()]
+        if not batch:
+            return
+
+        digests = tuple(document.digest for document, _ in batch)
+        if (query := self.merged_documents.get(digests)) is None:
+            query = self.merged_documents[digests] = merge_documents([document for document, _ in batch])
+        self.stats["batches"] += 1
+        self.stats["batched_queries"] += len(batch)
+
+        try:
+            response = await self.post(query)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001 # it's the callers' exception
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        data = response.get("data") or {}
+        errors = response.get("errors") or []
+        for i, (document, future) in enumerate(batch):
+            if future.done():
+                continue
+            prefix = f"q{i}_"
+            part: dict[str, Any] = {"data": {key: data.get(prefix + key) for key, _ in document.fields}}
+            if own_errors := [
+                error for error in errors if not error.get("path") or str(error["path"][0]).startswith(prefix)
+            ]:
+                part["errors"] = own_errors
+            future.set_result(part)
+
+    async def post(self, query: str) -> Any:
+        """Post a GraphQL query to Stratz."""
+        async with (
+            self.guard() as call,
+            self.session.post(
+                url="https://api.stratz.com/graphql",
+                timeout=self.timeout,
+                json={"query": query},
+                headers={
+                    "User-Agent": "STRATZ_API",
+                    "Authorization": f"Bearer {self.bearer_token}",
+                    "Content-Type": "application/json",
+                },
+            ) as resp,
+        ):
+            call.status = resp.status
+            return await self.read_json(resp)
 
     async def get_items(self) -> StratzItems:
         """Get Constants for Dota 2 Items."""
@@ -76,7 +710,40 @@ query Items {
     }
 }
         """
-        return await self.invoke(query)
+        return await self.invoke("Items", query=query)
+
+    async def get_heroes(self) -> StratzHeroes:
+        """Get Constants for Dota 2 Heroes."""
+        query = """
+query Heroes {
+    constants {
+        heroes {
+            id
+            displayName
+        }
+    }
+}
+        """
+        return await self.invoke("Heroes", query=query)
+
+    async def get_game_versions(self) -> StratzGameVersions:
+        """Get Constants for Dota 2 Game Versions (patches)."""
+        query = """
+query GameVersions {
+    constants {
+        gameVersions {
+            id
+            name
+        }
+    }
+}
+        """
+        return await self.invoke("GameVersions", query=query)
+
+    async def get_latest_game_version(self) -> int:
+        """Get ID of the current Dota 2 game version; a cheap signal that game constants might have changed."""
+        versions = await self.get_game_versions()
+        return max(version["id"] for version in versions["data"]["constants"]["gameVersions"])
 
 
 class SteamWebAPIClient(APIClient):
@@ -84,46 +751,150 @@ class SteamWebAPIClient(APIClient):
 
     Parameters
     ----------
-    api_key: str
-        Steam Web API Key. Needed for all requests.
+    api_keys: Sequence[str]
+        Steam Web API Keys. Needed for all requests; every key has its own daily quota,
+        so requests are spread between them with `APIKeyPool`.
     """
 
-    def __init__(self, *, api_key: str, session: aiohttp.ClientSession) -> None:
+    name = "Steam Web API"
+    # 100 000 calls per day per key; the bucket spreads them over the day, `daily_quota` does the counting
+    rate_limit = (50, 100_000 / 86_400)
+    daily_quota: ClassVar[int] = 100_000
+    key_cooldown: ClassVar[float] = 300
+    """Seconds to keep a key out of rotation after 429 Too Many Requests (unless Steam says `Retry-After`)."""
+    forbidden_key_cooldown: ClassVar[float] = 3600
+    """Seconds to keep a key out of rotation after 403 Forbidden, i.e. the key got revoked."""
+
+    def __init__(self, *, api_keys: Sequence[str], session: aiohttp.ClientSession) -> None:
         super().__init__(session=session)
-        self.api_key: str = api_key
+        self.keys: APIKeyPool = APIKeyPool(api_keys, self.rate_limit, self.daily_quota)
+        # per-key quotas are in the pool, the client-wide bucket only smooths out bursts
+        capacity, rate = self.rate_limit
+        self.bucket = TokenBucket(capacity, rate * len(self.keys))
+
+    cache_policies: ClassVar[dict[str, CachePolicy]] = {
+        # the match data itself updates every ~10 seconds
+        "IDOTA2MatchStats_570/GetRealtimeStats/v1": CachePolicy(ttl=5),
+    }
+    fields: ClassVar[dict[str, FieldSpec]] = {
+        # no need for `buildings`, `graph_data`, players' positions and abilities
+        "IDOTA2MatchStats_570/GetRealtimeStats/v1": {
+            "match": {
+                "server_steam_id": None,
+                "match_id": None,
+                "game_mode": None,
+                "lobby_type": None,
+                "start_timestamp": None,
+            },
+            "teams": {
+                "team_number": None,
+                "score": None,
+                "net_worth": None,
+                "players": {
+                    "accountid": None,
+                    "playerid": None,
+                    "name": None,
+                    "team": None,
+                    "heroid": None,
+                    "level": None,
+                    "kill_count": None,
+                    "death_count": None,
+                    "assists_count": None,
+                    "lh_count": None,
+                    "net_worth": None,
+                    "items": None,
+                    "team_slot": None,
+                },
+            },
+        },
+    }
+    decoders: ClassVar[dict[str, Callable[[Any], Any]]] = {
+        "IDOTA2MatchStats_570/GetRealtimeStats/v1": RealTimeStats.decode,
+    }
+
+    max_retry_time: ClassVar[float] = 60
+    """Default deadline (seconds) for retrying empty responses, for callers without a latency budget."""
+    max_backoff: ClassVar[float] = 8
+    """Cap of a single backoff sleep between retries."""
 
     @override
-    async def invoke(self, endpoint: str, **kwargs: Any) -> Any:
-        """Invoke a request to Steam Web API."""
-        queries = "&".join(f"{k}={v}" for k, v in kwargs.items())
-        url = f"https://api.steampowered.com/{endpoint}/?key={self.api_key}&{queries}"
-        max_failures = 10
-        for attempt in range(max_failures):
-            async with self.session.get(url) as resp:
+    async def request(self, endpoint: str, **params: Any) -> Any:
+        """Send a single request to Steam Web API with the best key from the pool.
+
+        A throttled key is taken out of rotation and the request is sent again with another one.
+        """
+        queries = "&".join(f"{k}={v}" for k, v in params.items())
+        while (key := self.keys.acquire()) is not None:
+            url = f"https://api.steampowered.com/{endpoint}/?key={key.value}&{queries}"
+            async with self.guard() as call, self.session.get(url, timeout=self.timeout) as resp:
+                call.status = resp.status
+                if resp.status == 429:
+                    retry_after = resp.headers.get("Retry-After", "")
+                    self.keys.cooldown(key, float(retry_after) if retry_after.isdigit() else self.key_cooldown)
+                    self.stats["key_throttled"] += 1
+                    # the key is throttled, not the API - says nothing about the API's health
+                    call.abandoned = True
+                    continue
+                if resp.status == 403:
+                    self.keys.cooldown(key, self.forbidden_key_cooldown)
+                    self.stats["key_forbidden"] += 1
+                    call.abandoned = True
+                    continue
+                # don't decode error pages as data; raises so 5xx count as failures for the circuit breaker
+                resp.raise_for_status()
                 # encoding='utf-8' errored out one day, it seems Valve have misconfigured some servers' content types
                 # Or maybe they have to because all the unique characters in player names?
                 # I'm not sure if this "ISO-8859-1" encoding solves all problems;
                 # meta shows utf-8 though so idk.
-                result = await resp.json(loads=orjson.loads, content_type=None, encoding="ISO-8859-1")
-                if result:
-                    break
-                # Valve, why does it return an empty dict `{}` on the very first request for every match...
-                # It's a problem even in the actual game client.
-                # So we have to ask again hence this silly for loop.
-                # some lazy exp backoff:
-                await asyncio.sleep(0.49 * 1.7**attempt)
-                continue
-        else:
-            msg = f'Response "{url}" was empty {max_failures} times in a row.'
-            raise APIClientError(msg)
+                return await resp.json(loads=orjson.loads, content_type=None, encoding="ISO-8859-1")
 
-        return result
+        self.stats["keys_exhausted"] += 1
+        msg = f"{self.name} quota is used up right now. Try again in {self.keys.retry_after():.0f} sec."
+        raise RateLimitedError(msg)
+
+    @override
+    async def send(self, endpoint: str, *, deadline: float | None, hedge: bool, **params: Any) -> Any:
+        """Send a request to Steam Web API, retrying empty responses until the `deadline`.
+
+        Valve, why does it return an empty dict `{}` on the very first request for every match...
+        It's a problem even in the actual game client. So we have to ask again.
+        Sleeps are exponential with "equal jitter" so several commands don't hammer the API in sync;
+        we give up as soon as the next sleep would cross the deadline.
+        """
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + self.max_retry_time
 
-    async def get_real_time_stats(self, server_steam_id: int) -> SteamWebRealTimeStats:
+        for attempt in itertools.count():
+            result = await super().send(endpoint, deadline=deadline, hedge=hedge, **params)
+            if result:
+                return result
+
+            backoff = min(self.max_backoff, 0.49 * 1.7**attempt)
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+            if loop.time() + delay >= deadline:
+                self.stats["retries_exhausted"] += 1
+                msg = f'Response from "{endpoint}" was still empty after {attempt + 1} attempts.'
+                raise APIClientError(msg)
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+        raise AssertionError  # unreachable, `itertools.count` is infinite
+
+    async def get_real_time_stats(
+        self, server_steam_id: int, *, budget: float | None = None, hedge: bool = False
+    ) -> RealTimeStats:
         """Get Real Time Stats from Steam Web API.
 
+        Parameters
+        ----------
+        budget, hedge
+            See `APIClient.invoke`.
+
         Links
         -----
         * https://steamapi.xpaw.me/#IDOTA2MatchStats_570/GetRealtimeStats.
         """
-        return await self.invoke("IDOTA2MatchStats_570/GetRealtimeStats/v1", server_steam_id=server_steam_id)
+        return await self.invoke(
+            "IDOTA2MatchStats_570/GetRealtimeStats/v1", budget=budget, hedge=hedge, server_steam_id=server_steam_id
+        )
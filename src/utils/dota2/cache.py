@@ -0,0 +1,186 @@
+"""Caches for responses of `utils.dota2.api_clients`."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import orjson
+import zstandard
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections import Counter
+    from collections.abc import Awaitable, Callable, Hashable
+
+__all__ = ("CachePolicy", "MatchPayloadStore", "ResponseCache")
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """Caching policy of an API endpoint."""
+
+    ttl: float
+    """Seconds to keep a response for. `0` disables caching, but concurrent identical requests are still shared."""
+
+
+class ResponseCache:
+    """In-memory LRU cache of API responses with per-entry TTL and single-flight.
+
+    Concurrent calls with the same key share one in-flight request.
+    Exceptions are not cached. Cached responses are shared between callers, so they shouldn't be mutated.
+
+    Parameters
+    ----------
+    maxsize
+        Max amount of cached responses; the least recently used ones are evicted first.
+    stats
+        Counter to record `cache_hits`, `cache_misses` and `cache_shared` into, usually `APIClient.stats`.
+    """
+
+    def __init__(self, maxsize: int, stats: Counter[str]) -> None:
+        self.maxsize: int = maxsize
+        self.stats: Counter[str] = stats
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        """`key -> (expires_at, response)` in LRU order."""
+        self.in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def get_or_fetch(self, key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Get a cached response by `key` or `fetch` it (once for all concurrent callers)."""
+        if (entry := self.entries.get(key)) is not None:
+            expires_at, response = entry
+            if monotonic() < expires_at:
+                self.entries.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return response
+            del self.entries[key]
+
+        if (task := self.in_flight.get(key)) is not None:
+            self.stats["cache_shared"] += 1
+        else:
+            self.stats["cache_misses"] += 1
+            task = asyncio.create_task(self._fetch(key, ttl, fetch))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # shield so one cancelled caller doesn't cancel the request for everybody else
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        response = await fetch()
+        if ttl > 0:
+            self.entries[key] = (monotonic() + ttl, response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self.entries.clear()
+
+
+class MatchPayloadStore:
+    """Disk-backed, size-bounded store of immutable match payloads keyed by match ID.
+
+    Once OpenDota parses a match its `/matches/{id}` payload never changes, so there is no point in
+    asking for it again. Payloads are kept zstd-compressed as `{match_id}.json.zst` files and
+    the least recently used ones are evicted once the files take more than `max_bytes` in total.
+    LRU order survives restarts via files' mtime.
+    All file I/O is done in threads.
+    """
+
+    def __init__(self, directory: pathlib.Path, *, max_bytes: int = 256 * 1024 * 1024, level: int = 10) -> None:
+        self.directory: pathlib.Path = directory
+        self.max_bytes: int = max_bytes
+        self.level: int = level
+        self.index: OrderedDict[int, int] = OrderedDict()
+        """`match_id -> file size` in LRU order."""
+        self.total_bytes: int = 0
+        self.loaded: bool = False
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def path(self, match_id: int) -> pathlib.Path:
+        return self.directory / f"{match_id}.json.zst"
+
+    def _scan(self) -> list[tuple[int, int]]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files: list[tuple[float, int, int]] = []
+        for path in self.directory.glob("*.json.zst"):
+            try:
+                match_id = int(path.name.removesuffix(".json.zst"))
+                stat = path.stat()
+            except ValueError, FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, match_id, stat.st_size))
+        return [(match_id, size) for _, match_id, size in sorted(files)]
+
+    async def load(self) -> None:
+        """Build the index from the files on disk (only once)."""
+        async with self.lock:
+            if self.loaded:
+                return
+            for match_id, size in await asyncio.to_thread(self._scan):
+                self.index[match_id] = size
+                self.total_bytes += size
+            self.loaded = True
+            log.debug("Match store %s: %s payloads, %s bytes", self.directory, len(self.index), self.total_bytes)
+
+    def _read(self, match_id: int) -> Any:
+        path = self.path(match_id)
+        raw = path.read_bytes()
+        os.utime(path)  # bump LRU position for the next restart
+        return orjson.loads(zstandard.decompress(raw))
+
+    async def get(self, match_id: int) -> Any | None:
+        """Get a stored payload or `None`."""
+        await self.load()
+        if match_id not in self.index:
+            return None
+        try:
+            payload = await asyncio.to_thread(self._read, match_id)
+        except (FileNotFoundError, zstandard.ZstdError, orjson.JSONDecodeError) as exc:
+            log.warning("Match store %s: dropping broken payload %s: %r", self.directory, match_id, exc)
+            await self.discard(match_id)
+            return None
+        if match_id in self.index:
+            self.index.move_to_end(match_id)
+        return payload
+
+    def _write(self, match_id: int, payload: Any) -> int:
+        raw = zstandard.ZstdCompressor(level=self.level).compress(orjson.dumps(payload))
+        path = self.path(match_id)
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(raw)
+        temp_path.replace(path)
+        return len(raw)
+
+    async def put(self, match_id: int, payload: Any) -> None:
+        """Store a payload; it's supposed to be final (i.e. fully parsed match)."""
+        await self.load()
+        size = await asyncio.to_thread(self._write, match_id, payload)
+        self.total_bytes += size - self.index.pop(match_id, 0)
+        self.index[match_id] = size
+
+        evicted: list[int] = []
+        while self.total_bytes > self.max_bytes and len(self.index) > 1:
+            old_match_id, old_size = self.index.popitem(last=False)
+            self.total_bytes -= old_size
+            evicted.append(old_match_id)
+        if evicted:
+            await asyncio.to_thread(self._unlink, evicted)
+
+    def _unlink(self, match_ids: list[int]) -> None:
+        for match_id in match_ids:
+            self.path(match_id).unlink(missing_ok=True)
+
+    async def discard(self, match_id: int) -> None:
+        """Remove a payload from the store."""
+        self.total_bytes -= self.index.pop(match_id, 0)
+        await asyncio.to_thread(self._unlink, [match_id])
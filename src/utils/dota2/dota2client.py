@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any, NamedTuple, override
 
+from discord.backoff import ExponentialBackoff
 from steam import PersonaState
 from steam.ext import dota2
 
 from config import env
 
 from .api_clients import OpenDotaClient, SteamWebAPIClient, StratzClient
-from .storage import Items
+from .storage import Heroes, Items, PatchWatcher
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
     from core import IreBot
 
 log = logging.getLogger(__name__)
 
-__all__ = ("Dota2Client", "SteamUserUpdate")
+__all__ = ("Dota2Client", "Dota2ClientPool", "SteamUserUpdate")
 
 
 class SteamUserUpdate(NamedTuple):
@@ -30,29 +35,86 @@ class Dota2Client(dota2.Client):
     """Subclass for SteamIO's Client.
 
     Used to communicate with Dota 2 Game Coordinator in order to track information about my profile real-time.
+
+    Parameters
+    ----------
+    shard
+        Index of this client in `Dota2ClientPool`. Only the primary client (shard 0) runs helper services.
+    credentials
+        `(username, password)` for the Steam account. Defaults to IrenesBot/IrenesTest account from `.env`.
+    helpers_from
+        Client to take API clients and storages from instead of creating new ones, see `recreate`.
     """
 
-    def __init__(self, twitch_bot: IreBot) -> None:
+    def __init__(
+        self,
+        twitch_bot: IreBot,
+        *,
+        shard: int = 0,
+        credentials: tuple[str, str] | None = None,
+        helpers_from: Dota2Client | None = None,
+    ) -> None:
         persona_state = PersonaState.Online  # if not twitch_bot.test else PersonaState.Invisible
         super().__init__(state=persona_state)
         self.bot: IreBot = twitch_bot
         self.started: bool = False
+        self.shard: int = shard
+        self.credentials: tuple[str, str] | None = credentials
+        self.in_flight: int = 0
+        """Amount of Game Coordinator requests currently routed to this client by `Dota2ClientPool`."""
+        self.disconnected: asyncio.Event = asyncio.Event()
+        """Set when the client loses its connection to Steam CM servers; watched by `Dota2ClientPool.supervise`."""
+        self.gc_disconnected: asyncio.Event = asyncio.Event()
+        """Set when Game Coordinator drops the session (while CM connection can be still up)."""
+        self.gc_reconnected: asyncio.Event = asyncio.Event()
+        """Set when Game Coordinator gets ready again after `gc_disconnected`."""
+
+        if helpers_from:
+            self.opendota, self.stratz, self.web_api = helpers_from.opendota, helpers_from.stratz, helpers_from.web_api
+            self.items, self.heroes = helpers_from.items, helpers_from.heroes
+            self.patch_watcher = helpers_from.patch_watcher
+            self.started = helpers_from.started
+            return
 
         self.opendota = OpenDotaClient(session=self.bot.session)
         self.stratz = StratzClient(bearer_token=env.STRATZ_BEARER, session=self.bot.session)
-        self.web_api = SteamWebAPIClient(api_key=env.STEAM_API_KEY, session=self.bot.session)
+        self.web_api = SteamWebAPIClient(api_keys=[env.STEAM_API_KEY, *env.STEAM_API_EXTRA_KEYS], session=self.bot.session)
 
         self.items = Items(twitch_bot)
+        self.heroes = Heroes(twitch_bot)
+        self.patch_watcher = PatchWatcher(twitch_bot, [self.items, self.heroes])
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} shard={self.shard} in_flight={self.in_flight}>"
 
     async def start_helpers(self) -> None:
         """Start helping services for steam."""
-        if not self.started:
+        if not self.started and self.shard == 0:
             self.items.start()
+            self.heroes.start()
+            self.patch_watcher.start()
+            self.started = True
+            storages = (self.items, self.heroes)
+            self.bot.startup.track("storage_warmup", asyncio.gather(*(s.wait_for_warm_start() for s in storages)))
+
+    def recreate(self) -> Dota2Client:
+        """Create a fresh client for the same Steam account.
+
+        The new client takes over helpers of this one, so storages do not lose their cache on reconnects.
+        """
+        return Dota2Client(self.bot, shard=self.shard, credentials=self.credentials, helpers_from=self)
+
+    async def disconnect(self) -> None:
+        """Close the connection to Steam, unlike `close` which only stops the helpers."""
+        await super().close()
 
     @override
     async def login(self, *args: Any, **kwargs: Any) -> None:
         await self.start_helpers()
-        if self.bot.test_subset_mode:
+        if self.credentials:
+            username, password = self.credentials
+        elif self.bot.test_subset_mode:
             username, password = env.STEAM_IRENESTEST_USERNAME, env.STEAM_IRENESTEST_PASSWORD
         else:
             username, password = env.STEAM_IRENESBOT_USERNAME, env.STEAM_IRENESBOT_PASSWORD
@@ -60,13 +122,32 @@ class Dota2Client(dota2.Client):
 
     @override
     async def close(self) -> None:
+        self.patch_watcher.close()
         self.items.close()
+        self.heroes.close()
 
     @override
     async def on_ready(self) -> None:
-        log.info("Dota 2 Client: Ready %s, now waiting till Game Coordinator is ready;", self.user.name)
+        log.info("Dota 2 Client #%s: Ready %s, now waiting till Game Coordinator is ready;", self.shard, self.user.name)
         await self.wait_until_gc_ready()
-        log.info("Dota 2 Game Coordinator: Ready")
+        log.info("Dota 2 Game Coordinator #%s: Ready", self.shard)
+
+    @override
+    async def on_disconnect(self) -> None:
+        log.warning("Dota 2 Client #%s: Disconnected from Steam.", self.shard)
+        self.disconnected.set()
+
+    @override
+    async def on_gc_disconnect(self) -> None:
+        log.warning("Dota 2 Game Coordinator #%s: Disconnected.", self.shard)
+        self.gc_reconnected.clear()
+        self.gc_disconnected.set()
+
+    @override
+    async def on_gc_ready(self) -> None:
+        if self.gc_disconnected.is_set():
+            self.gc_disconnected.clear()
+            self.gc_reconnected.set()
 
     @override
     async def on_user_update(self, before: dota2.User, after: dota2.User) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -74,6 +155,216 @@ class Dota2Client(dota2.Client):
 
         The information from this event is redirected to `self.bot` events
         so we can process it in the bot components' listeners.
+        All clients of the pool dispatch into the same event, so the listeners see one merged stream of updates.
         """
         payload = SteamUserUpdate(before=before, after=after)
         self.bot.dispatch("steam_user_update", payload)
+
+
+class Dota2ClientPool:
+    """A pool of Dota 2 Clients, each one logged into its own Steam account.
+
+    Steam caps the size of a friend list, so tracked streamers are sharded between several bot accounts:
+    a streamer adds any of them into their friends and the client of that account becomes the friend's owner.
+    Rich Presence updates from all clients are merged into one `steam_user_update` event.
+
+    Game Coordinator requests should go through `acquire` so they are routed to the owning client
+    (when the request is about a specific friend) or to the least-loaded client otherwise.
+
+    The primary client (`self.primary`, also available as `bot.dota2`) owns helpers
+    like API clients and game data storages.
+
+    Each client is watched by `supervise` which reconnects it in-process after CM/GC disconnects
+    (i.e. infamous Tuesday Steam maintenance) without restarting the whole bot.
+    Game Coordinator is given `GC_READY_TIMEOUT` to come back on its own before the client is re-logged in.
+    Readiness is tracked per shard by the pool, so `wait_until_ready` and `wait_until_gc_ready`
+    keep waiting for the replacement when a client is swapped out.
+
+    Parameters
+    ----------
+    clients
+        Clients to pool instead of the ones for Steam accounts from `.env`.
+    """
+
+    GC_READY_TIMEOUT: float = 11 * 60
+    """Seconds to wait for Game Coordinator to get ready before assuming the connection is dead."""
+
+    def __init__(self, bot: IreBot, *, clients: list[Dota2Client] | None = None) -> None:
+        self.bot: IreBot = bot
+        self.closed: bool = False
+        self.login_tasks: dict[int, asyncio.Task[None]] = {}
+        """Shard -> current login task of its client, cancelled in `close`."""
+        if clients is None:
+            # test subset mode always uses the single IrenesTest account
+            shards = [] if bot.test_subset_mode else env.STEAM_IRENESBOT_SHARDS
+            clients = [Dota2Client(bot)]
+            clients += (Dota2Client(bot, shard=i, credentials=credentials) for i, credentials in enumerate(shards, start=1))
+        self.clients: list[Dota2Client] = clients
+        self.logged_in: list[asyncio.Event] = [asyncio.Event() for _ in clients]
+        """Shard -> set while its current client is logged into Steam."""
+        self.gc_ready: list[asyncio.Event] = [asyncio.Event() for _ in clients]
+        """Shard -> set while Game Coordinator is ready for its current client."""
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} clients={len(self.clients)}>"
+
+    @property
+    def primary(self) -> Dota2Client:
+        """The primary client, i.e. the one that owns helper services."""
+        return self.clients[0]
+
+    async def login(self) -> None:
+        """Login all clients of the pool and keep them connected."""
+        await asyncio.gather(*(self.supervise(shard) for shard in range(len(self.clients))))
+
+    async def supervise(self, shard: int) -> None:
+        """Login the client under `shard` index and reconnect it whenever it loses Steam or Game Coordinator.
+
+        Only this Steam client gets re-logged in: the twitch side of the bot keeps running.
+        Components are notified with `dota2_reconnecting` and `dota2_reconnected` events (payload is the client)
+        so they can pause and resume their features around the reconnect.
+        """
+        backoff = ExponentialBackoff()
+        reconnecting = False
+        while not self.closed:
+            client = self.clients[shard]
+            login_task = self.login_tasks[shard] = asyncio.create_task(client.login())
+            if await self.wait_until_connected(client, login_task):
+                if reconnecting:
+                    log.info("🟢 Dota 2 Client #%s: Reconnected. 🟢", shard)
+                    self.bot.dispatch("dota2_reconnected", client)
+                    reconnecting = False
+                backoff = ExponentialBackoff()
+                await self.wait_until_lost(client, login_task)
+
+            if self.closed:
+                login_task.cancel()
+                return
+
+            if login_task.done() and not login_task.cancelled() and (exc := login_task.exception()):  # noqa: LOG004
+                # A potential workaround for steam login issues: just try again a bit later
+                # https://github.com/Gobot1234/steam.py/issues/446
+                log.warning("🔴 Dota 2 Client #%s: Login failed with `%s`. 🔴", shard, exc.__class__.__name__, exc_info=exc)
+
+            self.logged_in[shard].clear()
+            self.gc_ready[shard].clear()
+            if not reconnecting:
+                reconnecting = True
+                self.bot.dispatch("dota2_reconnecting", client)
+
+            login_task.cancel()
+            try:
+                await client.disconnect()
+            except Exception:
+                log.exception("Dota 2 Client #%s: Failed to cleanly disconnect.", shard)
+
+            self.clients[shard] = client.recreate()
+            if shard == 0:
+                self.bot.dota2 = self.primary
+
+            delay = backoff.delay()
+            log.warning("Dota 2 Client #%s: Reconnecting in %.1f seconds.", shard, delay)
+            await asyncio.sleep(delay)
+
+    async def wait_until_connected(self, client: Dota2Client, login_task: asyncio.Task[None]) -> bool:
+        """Wait until `client` is logged in and Game Coordinator is ready for it; `False` if login ended or it took too long.
+
+        Sets the shard's `logged_in` and `gc_ready` events along the way.
+        """
+        steps = (
+            (client.wait_until_ready, self.logged_in[client.shard]),
+            (client.wait_until_gc_ready, self.gc_ready[client.shard]),
+        )
+        try:
+            async with asyncio.timeout(self.GC_READY_TIMEOUT):
+                for wait, event in steps:
+                    waiter = asyncio.create_task(wait())
+                    try:
+                        await asyncio.wait((login_task, waiter), return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        waiter.cancel()
+                    if not waiter.done() or waiter.cancelled():
+                        return False
+                    event.set()
+        except TimeoutError:
+            log.warning("🔴 Dota 2 Client #%s: Game Coordinator didn't get ready in time. 🔴", client.shard)
+            return False
+        return True
+
+    async def wait_until_lost(self, client: Dota2Client, login_task: asyncio.Task[None]) -> None:
+        """Wait until `client` needs to be re-logged in.
+
+        That is when login ended, CM connection is lost or Game Coordinator dropped
+        and didn't come back within `GC_READY_TIMEOUT`.
+        """
+        while not login_task.done():
+            lost = (asyncio.create_task(client.disconnected.wait()), asyncio.create_task(client.gc_disconnected.wait()))
+            try:
+                await asyncio.wait((login_task, *lost), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in lost:
+                    task.cancel()
+            if login_task.done() or client.disconnected.is_set():
+                return
+
+            log.warning("Dota 2 Client #%s: Waiting for Game Coordinator to come back.", client.shard)
+            try:
+                async with asyncio.timeout(self.GC_READY_TIMEOUT):
+                    await client.gc_reconnected.wait()
+            except TimeoutError:
+                log.warning("🔴 Dota 2 Client #%s: Game Coordinator didn't come back in time. 🔴", client.shard)
+                return
+            log.info("Dota 2 Game Coordinator #%s: Back again.", client.shard)
+
+    async def close(self) -> None:
+        """Close all clients of the pool: stop helpers, disconnect from Steam and stop supervising."""
+        self.closed = True
+        await asyncio.gather(*(client.close() for client in self.clients))
+        results = await asyncio.gather(*(client.disconnect() for client in self.clients), return_exceptions=True)
+        for client, result in zip(self.clients, results, strict=True):
+            if isinstance(result, Exception):
+                log.warning("Dota 2 Client #%s: Failed to cleanly disconnect: %r", client.shard, result)
+        for task in self.login_tasks.values():
+            task.cancel()
+
+    async def wait_until_ready(self) -> None:
+        """Wait until all clients of the pool are logged in (including clients that replace failed ones)."""
+        await asyncio.gather(*(event.wait() for event in self.logged_in))
+
+    async def wait_until_gc_ready(self) -> None:
+        """Wait until Game Coordinator is ready for all clients of the pool."""
+        await asyncio.gather(*(event.wait() for event in self.gc_ready))
+
+    async def friends(self) -> list[dota2.Friend]:
+        """Get merged friend list of all clients of the pool."""
+        friend_lists = await asyncio.gather(*(client.user.friends() for client in self.clients))
+        return [friend for friends in friend_lists for friend in friends]
+
+    def owner_of(self, friend_id: int) -> Dota2Client | None:
+        """Get the client that has a steam user under `friend_id` in its friend list."""
+        return next((client for client in self.clients if client.user.get_friend(friend_id)), None)
+
+    def least_loaded(self) -> Dota2Client:
+        """Get the client with the least amount of in-flight Game Coordinator requests."""
+        return min(self.clients, key=lambda client: client.in_flight)
+
+    @asynccontextmanager
+    async def acquire(self, friend_id: int | None = None) -> AsyncGenerator[Dota2Client]:
+        """Acquire a client to send Game Coordinator requests with.
+
+        Parameters
+        ----------
+        friend_id
+            If provided, the request is routed to the client that owns this friend (if any).
+        """
+        client = (self.owner_of(friend_id) if friend_id else None) or self.least_loaded()
+        client.in_flight += 1
+        try:
+            yield client
+        finally:
+            client.in_flight -= 1
+
+    def get_user(self, user_id: int) -> dota2.User | None:
+        """Get a user from the internal cache of any client in the pool."""
+        return next((user for client in self.clients if (user := client.get_user(user_id))), None)
@@ -0,0 +1,110 @@
+"""Decoded API responses.
+
+Responses that are read in hot paths (i.e. chat commands) are decoded once into compact slotted objects
+with precomputed lookups instead of being indexed as nested dicts every time.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from types_.dota_api_schemas import SteamWebRealTimeStats, SteamWebRealTimeStatsTeam, SteamWebRealTimeStatsTeamPlayer
+
+__all__ = ("RealTimeStats", "RealTimeStatsPlayer", "RealTimeStatsTeam")
+
+
+@dataclass(slots=True)
+class RealTimeStatsPlayer:
+    account_id: int
+    name: str
+    hero_id: int
+    level: int
+    kills: int
+    deaths: int
+    assists: int
+    last_hits: int
+    net_worth: int
+    items: tuple[int, ...]
+    """Item IDs, `-1` for empty slots."""
+
+    @classmethod
+    def decode(cls, data: SteamWebRealTimeStatsTeamPlayer) -> Self:
+        return cls(
+            account_id=data["accountid"],
+            name=data["name"],
+            hero_id=data["heroid"],
+            level=data["level"],
+            kills=data["kill_count"],
+            deaths=data["death_count"],
+            assists=data["assists_count"],
+            last_hits=data["lh_count"],
+            net_worth=data["net_worth"],
+            items=tuple(data["items"]),
+        )
+
+
+@dataclass(slots=True)
+class RealTimeStatsTeam:
+    team_number: int
+    score: int
+    net_worth: int
+    players: tuple[RealTimeStatsPlayer, ...]
+
+    @classmethod
+    def decode(cls, data: SteamWebRealTimeStatsTeam) -> Self:
+        return cls(
+            team_number=data["team_number"],
+            score=data["score"],
+            net_worth=data["net_worth"],
+            players=tuple(RealTimeStatsPlayer.decode(player) for player in data["players"]),
+        )
+
+
+@dataclass(slots=True)
+class RealTimeStats:
+    """Decoded `GetRealtimeStats` response."""
+
+    match_id: int
+    lobby_type: int
+    game_mode: int
+    start_timestamp: int
+    teams: tuple[RealTimeStatsTeam, ...]
+    players: tuple[RealTimeStatsPlayer, ...]
+    """All players in the team order, so the index is the player slot."""
+    players_by_hero: dict[int, RealTimeStatsPlayer]
+    """Hero ID -> player."""
+
+    @classmethod
+    def decode(cls, data: SteamWebRealTimeStats) -> Self:
+        # the amount of players in the team can be variable in Custom and Event Games
+        teams = tuple(RealTimeStatsTeam.decode(team) for team in data["teams"])
+        players = tuple(itertools.chain.from_iterable(team.players for team in teams))
+        players_by_hero: dict[int, RealTimeStatsPlayer] = {}
+        for player in players:
+            # heroes are not picked yet (`hero_id=0`) in the early draft; keep the first player then
+            players_by_hero.setdefault(player.hero_id, player)
+        return cls(
+            match_id=int(data["match"]["match_id"]),
+            lobby_type=data["match"]["lobby_type"],
+            game_mode=data["match"]["game_mode"],
+            start_timestamp=data["match"]["start_timestamp"],
+            teams=teams,
+            players=players,
+            players_by_hero=players_by_hero,
+        )
+
+    @property
+    def radiant(self) -> RealTimeStatsTeam:
+        return self.teams[0]
+
+    @property
+    def dire(self) -> RealTimeStatsTeam:
+        return self.teams[1]
+
+    @property
+    def net_worth_lead(self) -> int:
+        """Radiant's net worth lead (negative if Dire is leading)."""
+        return self.radiant.net_worth - self.dire.net_worth
@@ -2,27 +2,38 @@ from __future__ import annotations
 
 import abc
 import asyncio
-import json
 import logging
 import pathlib
-import random
 import time
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, TypedDict, override
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, TypedDict, override
 
 import aiohttp
 import discord
+import orjson
+import zstandard
 
 from core import ireloop
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
     from core import IreBot
 
     class DotaCacheDict(TypedDict):
         item_by_id: dict[int, str]  # id -> item name
 
 
-__all__ = ("GameDataStorage", "Items")
+__all__ = (
+    "DenseGameDataStorage",
+    "DenseIdMap",
+    "GameDataStorage",
+    "Heroes",
+    "Items",
+    "PatchWatcher",
+    "Snapshot",
+)
 
 
 log = logging.getLogger(__name__)
@@ -32,19 +43,40 @@ log.setLevel(logging.INFO)
 CDN_REACT = "https://cdn.akamai.steamstatic.com/apps/dota2/images/dota_react/"
 
 
+class Snapshot[VT](NamedTuple):
+    """Storage data together with when and for which game version it was fetched."""
+
+    fetched_at: float
+    version: int | None
+    data: Mapping[int, VT]
+
+
 class GameDataStorage[VT, PseudoVT](abc.ABC):
     """Game Data Storage.
 
     Used for fetching and storing data from public API and JSONs.
-    The concept is the data gets updated/refreshed once a day.
+    The concept is the data only gets refreshed when `PatchWatcher` detects a new game version
+    (or the data is older than `max_snapshot_age`, just in case).
 
     if KeyError arises - there is an attempt to refresh the data, otherwise it's assumed that the data is fine enough
-    (yes, it can backfire with an update where, for example, some item icon changes,
-    but we still update storage once per day, so whatever).
+    (yes, it can backfire with an update where, for example, some item icon changes without a patch,
+    but we still refresh storage once per `max_snapshot_age`, so whatever).
+
+    After each refresh a snapshot of the data is written into `.temp/` by a background task.
+    On `start()` the storage serves the data from the last snapshot right away (stale-while-revalidate).
     """
 
     if TYPE_CHECKING:
-        cached_data: dict[int, VT]
+        cached_data: Mapping[int, VT]
+
+    snapshot_compression: ClassVar[bool] = True
+    """Whether to compress snapshots with zstd."""
+    max_snapshot_age: ClassVar[float] = 7 * 24 * 60 * 60
+    """Data older than this (in seconds) gets refreshed by `PatchWatcher` even without a new patch."""
+    unknown_cooldown: ClassVar[float] = 60 * 60
+    """For how long (in seconds) a confirmed-unknown ID doesn't trigger another refresh."""
+    report_cooldown: ClassVar[float] = 24 * 60 * 60
+    """For how long (in seconds) the same unknown ID isn't reported to the developers again."""
 
     def __init__(self, bot: IreBot) -> None:
         """__init__.
@@ -52,69 +84,216 @@ class GameDataStorage[VT, PseudoVT](abc.ABC):
         Parameters
         ----------
         bot
-            need it just so @ireloop task can use `exc_manager` to send an error notification.
+            need it for API clients and to send unknown value reports.
         """
         self.bot: IreBot = bot
         self.lock: asyncio.Lock = asyncio.Lock()
+        self.snapshot_task: asyncio.Task[None] | None = None
+        self.warm_start_task: asyncio.Task[None] | None = None
+        self.fetched_at: float = 0.0
+        """Unix timestamp of when `cached_data` was fetched from the source."""
+        self.version: int | None = None
+        """Game version (Stratz `gameVersions` id) that `cached_data` was fetched for."""
+        self.refresh_task: asyncio.Task[bool] | None = None
+        self.unknown_ids: dict[int, float] = {}
+        """Negative cache: `object_id -> time.monotonic()` of when the refresh confirmed it's unknown."""
+        self.reported_ids: dict[int, float] = {}
+        """`object_id -> time.monotonic()` of the last unknown value report."""
 
     def start(self) -> None:
-        """Start the storage tasks."""
-        # self.update_data.add_exception_type(errors.ResponseNotOK)
-        # random times just so we don't have a possibility of all cache being updated at the same time
-        self.update_data.change_interval(hours=24, minutes=random.randint(1, 59))
-        self.update_data.start()
+        """Start the storage tasks.
+
+        Refreshes are scheduled by `PatchWatcher`.
+        """
+        self.warm_start_task = asyncio.create_task(self.warm_start())
 
     def close(self) -> None:
         """Cancel the storage tasks."""
-        self.update_data.cancel()
+        if self.warm_start_task:
+            self.warm_start_task.cancel()
+        if self.refresh_task:
+            self.refresh_task.cancel()
+
+    async def warm_start(self) -> None:
+        """Load the data from the last snapshot so the storage can serve it before the first refresh."""
+        try:
+            snapshot = await self.read_snapshot()
+        except FileNotFoundError:
+            log.debug("Storage %s has no snapshot to warm start from.", self.__class__.__name__)
+            return
+        except (orjson.JSONDecodeError, zstandard.ZstdError, KeyError, TypeError) as exc:
+            log.warning("Storage %s snapshot is broken: %r", self.__class__.__name__, exc)
+            return
+
+        if not hasattr(self, "cached_data"):
+            # the source might have been faster than the disk
+            self.cached_data, self.fetched_at, self.version = snapshot.data, snapshot.fetched_at, snapshot.version
+            log.debug("Storage %s is warm started from a snapshot %.0fs old.", self.__class__.__name__, self.age)
+
+    async def wait_for_warm_start(self) -> None:
+        """Wait until the snapshot is loaded (if it's being loaded)."""
+        if self.warm_start_task and not self.warm_start_task.done():
+            await asyncio.shield(self.warm_start_task)
+
+    @property
+    def age(self) -> float:
+        """How old `cached_data` is, in seconds."""
+        return time.time() - self.fetched_at
 
     @abc.abstractmethod
-    async def fill_data(self) -> dict[int, VT]:
+    async def fill_data(self) -> Mapping[int, VT]:
         """Fill self.cached_data with the data from various json data.
 
         This function is supposed to be implemented by subclasses.
         We get the data and sort it out into a convenient dictionary to cache.
         """
 
-    @ireloop()
-    async def update_data(self) -> None:
-        """The task responsible for keeping the data up-to-date."""
+    def is_outdated(self, version: int) -> bool:
+        """Whether the storage needs a refresh given the current game `version`."""
+        return not hasattr(self, "cached_data") or self.version != version or self.age > self.max_snapshot_age
+
+    async def update_data(self) -> bool:
+        """Download the data from the source and swap it in.
+
+        Returns
+        -------
+        bool
+            Whether the data was actually refreshed (`fill_data` can fall back to the data we already have).
+        """
         log.debug("Updating Storage %s.", self.__class__.__name__)
         async with self.lock:
             start_time = time.perf_counter()
-            self.cached_data = await self.fill_data()
+            previous = getattr(self, "cached_data", None)
+            self.cached_data = data = await self.fill_data()
+            if data is previous:
+                # `fill_data` fell back to the data we already have, so there is nothing new to back up
+                return False
+            self.fetched_at = time.time()
+            snapshot = Snapshot(self.fetched_at, self.version, data)
             log.debug(
                 "Storage %s %s is updated in %.3fs",
                 __package__.split(".")[-1].capitalize() if __package__ else "",
                 self.__class__.__name__,
                 time.perf_counter() - start_time,
             )
-            # Make a back up for fun
-            await asyncio.sleep(60 * 60)
-            with pathlib.Path(f".temp/{self.__class__.__name__}.json").open("w", encoding="utf-8") as f:  # noqa: ASYNC230
-                json.dump(self.cached_data, f, ensure_ascii=False, indent=4, default=str)
 
-    async def get_cached_data(self) -> dict[int, VT]:
+        # Make a back up outside of the lock so `get_value` misses never wait on the disk
+        if self.snapshot_task and not self.snapshot_task.done():
+            self.snapshot_task.cancel()
+        self.snapshot_task = asyncio.create_task(self.write_snapshot(snapshot))
+        self.snapshot_task.add_done_callback(self._log_snapshot_error)
+        return True
+
+    @property
+    def snapshot_path(self) -> pathlib.Path:
+        """Path to the snapshot (backup) file of the storage data."""
+        suffix = ".json.zst" if self.snapshot_compression else ".json"
+        return pathlib.Path(f".temp/{self.__class__.__name__}{suffix}")
+
+    def _write_snapshot(self, snapshot: Snapshot[VT]) -> None:
+        data = snapshot.data if isinstance(snapshot.data, dict) else dict(snapshot.data)
+        raw = orjson.dumps(
+            {"fetched_at": snapshot.fetched_at, "version": snapshot.version, "data": data},
+            option=orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        if self.snapshot_compression:
+            raw = zstandard.compress(raw)
+
+        path = self.snapshot_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write into a temporary file first, so a crash mid-write never leaves a broken snapshot
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(raw)
+        temp_path.replace(path)
+
+    async def write_snapshot(self, snapshot: Snapshot[VT]) -> None:
+        """Serialize and write the snapshot in a thread."""
+        await asyncio.to_thread(self._write_snapshot, snapshot)
+        log.debug("Storage %s snapshot is written to %s", self.__class__.__name__, self.snapshot_path)
+
+    def _log_snapshot_error(self, task: asyncio.Task[None]) -> None:
+        if not task.cancelled() and (exc := task.exception()):
+            log.error("Failed to write %s snapshot", self.__class__.__name__, exc_info=exc)
+
+    async def read_snapshot(self) -> Snapshot[VT]:
+        """Read the snapshot file (in a thread).
+
+        Raises
+        ------
+        FileNotFoundError
+            There is no snapshot yet.
+        """
+
+        def read() -> Any:
+            raw = self.snapshot_path.read_bytes()
+            return orjson.loads(zstandard.decompress(raw) if self.snapshot_compression else raw)
+
+        snapshot = await asyncio.to_thread(read)
+        return Snapshot(snapshot["fetched_at"], snapshot.get("version"), self.from_snapshot(snapshot["data"]))
+
+    @abc.abstractmethod
+    def from_snapshot(self, data: dict[str, Any]) -> Mapping[int, VT]:
+        """Restore storage data from the deserialized snapshot JSON.
+
+        This function is supposed to be implemented by subclasses.
+        """
+
+    async def refresh(self) -> bool:
+        """Refresh the data with single-flight: concurrent callers share one in-flight `update_data`."""
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.create_task(self.update_data())
+        # shield so one cancelled caller doesn't cancel the refresh for everybody else
+        return await asyncio.shield(self.refresh_task)
+
+    async def get_cached_data(self) -> Mapping[int, VT]:
         """Get the whole cached data."""
         try:
             return self.cached_data
         except AttributeError:
-            await self.update_data()
+            await self.wait_for_warm_start()
+            if not hasattr(self, "cached_data"):
+                await self.refresh()
             return self.cached_data
 
     async def get_value(self, object_id: int) -> VT:
-        """Get value by the `key` from `self.cached_data`."""
+        """Get value by the `key` from `self.cached_data`.
+
+        Raises
+        ------
+        KeyError
+            The object is unknown even after a refresh (or was confirmed unknown recently).
+        """
+        data = await self.get_cached_data()
         try:
-            return self.cached_data[object_id]
-        except KeyError, AttributeError:
-            # let's try to update the cache in case it's a KeyError due to
-            # * new patch or something
-            # * the data is not initialized then we will get stuck in self.lock waiting for the data.
-            await self.update_data()
-            return self.cached_data[object_id]
+            return data[object_id]
+        except KeyError:
+            confirmed_at = self.unknown_ids.get(object_id)
+            if confirmed_at is not None and time.monotonic() - confirmed_at < self.unknown_cooldown:
+                raise
+
+        # let's try to update the cache in case it's a KeyError due to new patch or something
+        await self.refresh()
+        try:
+            value = self.cached_data[object_id]
+        except KeyError:
+            self.unknown_ids[object_id] = time.monotonic()
+            raise
+        else:
+            self.unknown_ids.pop(object_id, None)
+            return value
 
     async def send_unknown_value_report(self, object_id: int) -> None:
-        """Send a notification to the developers when unknown value appears to be requested."""
+        """Send a notification to the developers when unknown value appears to be requested.
+
+        Rate-limited per ID with `report_cooldown` so a new patch item doesn't flood the webhook.
+        """
+        now = time.monotonic()
+        reported_at = self.reported_ids.get(object_id)
+        if reported_at is not None and now - reported_at < self.report_cooldown:
+            return
+        self.reported_ids[object_id] = now
+
         embed = discord.Embed(
             color=discord.Colour.red(),
             title=f"Unknown {self.__class__.__name__} appeared!",
@@ -132,6 +311,7 @@ class GameDataStorage[VT, PseudoVT](abc.ABC):
         try:
             storage_object = await self.get_value(object_id)
         except KeyError:
+            await self.send_unknown_value_report(object_id)
             return self.generate_unknown_object(object_id)
         else:
             return storage_object
@@ -167,11 +347,15 @@ class Items(GameDataStorage[Item, Item]):
         except aiohttp.ClientResponseError as err:
             log.exception("%s", err.__class__.__name__, exc_info=err)
             try:
-                with pathlib.Path(f".temp/{self.__class__.__name__}.json").open(encoding="utf-8") as f:  # noqa: ASYNC230
-                    return json.load(f)
-            except FileNotFoundError:
+                # keep serving the data we have (it's at least the warm start snapshot)
+                return self.cached_data
+            except AttributeError:
                 raise err from None
 
+    @override
+    def from_snapshot(self, data: dict[str, Any]) -> dict[int, Item]:
+        return {int(item_id): Item(**item) for item_id, item in data.items()}
+
     @override
     @staticmethod
     def generate_unknown_object(object_id: int) -> Item:
@@ -184,3 +368,169 @@ class Items(GameDataStorage[Item, Item]):
         if object_id == 0:
             return Item(0, "Empty Slot")
         return await super().by_id(object_id)
+
+
+class DenseIdMap[VT](Mapping[int, VT]):
+    """Read-only `Mapping[int, VT]` backed by a plain list indexed by ID.
+
+    Dota 2 constant IDs (heroes, abilities) are small and mostly dense integers,
+    so a list with `None` holes is several times smaller than a dict and a lookup is just an index.
+
+    Raises
+    ------
+    ValueError
+        An ID is negative or above `MAX_ID` - this keeps the memory bounded if the source ever sends garbage.
+    """
+
+    __slots__ = ("_length", "_values")
+
+    MAX_ID: ClassVar[int] = 1 << 16
+
+    def __init__(self, pairs: Iterable[tuple[int, VT]]) -> None:
+        values: list[VT | None] = []
+        for object_id, value in pairs:
+            if not 0 <= object_id < self.MAX_ID:
+                msg = f"ID {object_id} doesn't fit into {self.__class__.__name__} (0 <= id < {self.MAX_ID})."
+                raise ValueError(msg)
+            if object_id >= len(values):
+                values.extend([None] * (object_id + 1 - len(values)))
+            values[object_id] = value
+        self._values: list[VT | None] = values
+        self._length: int = sum(value is not None for value in values)
+
+    @override
+    def __getitem__(self, object_id: int) -> VT:
+        if object_id < 0:
+            raise KeyError(object_id)
+        try:
+            value = self._values[object_id]
+        except IndexError:
+            raise KeyError(object_id) from None
+        if value is None:
+            raise KeyError(object_id)
+        return value
+
+    @override
+    def __iter__(self) -> Iterator[int]:
+        return (object_id for object_id, value in enumerate(self._values) if value is not None)
+
+    @override
+    def __len__(self) -> int:
+        return self._length
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={self._length} slots={len(self._values)}>"
+
+
+class DenseGameDataStorage[PseudoVT](GameDataStorage[str, PseudoVT]):
+    """Game Data Storage for constants that only need a display name per small dense ID.
+
+    The data is kept in `DenseIdMap[str]` instead of a dict of dataclasses.
+    Abilities would fit here too, but nothing renders ability names, so there is no storage for them.
+    """
+
+    if TYPE_CHECKING:
+        cached_data: DenseIdMap[str]
+
+    @abc.abstractmethod
+    async def fetch_names(self) -> Iterable[tuple[int, str]]:
+        """Fetch `(id, display_name)` pairs from the source.
+
+        This function is supposed to be implemented by subclasses.
+        """
+
+    @override
+    async def fill_data(self) -> DenseIdMap[str]:
+        try:
+            return DenseIdMap(await self.fetch_names())
+        except aiohttp.ClientResponseError as err:
+            log.exception("%s", err.__class__.__name__, exc_info=err)
+            try:
+                # keep serving the data we have (it's at least the warm start snapshot)
+                return self.cached_data
+            except AttributeError:
+                raise err from None
+
+    @override
+    def from_snapshot(self, data: dict[str, Any]) -> DenseIdMap[str]:
+        return DenseIdMap((int(object_id), name) for object_id, name in data.items())
+
+    def name(self, object_id: int) -> str | PseudoVT:
+        """Get the display name from memory only, i.e. for chat commands.
+
+        Unlike `by_id` it never refreshes the storage over the network for an unknown ID:
+        unknown IDs (and a storage that isn't warm yet) get `generate_unknown_object` instead.
+        """
+        try:
+            return self.cached_data[object_id]
+        except AttributeError, KeyError:
+            return self.generate_unknown_object(object_id)
+
+
+class Heroes(DenseGameDataStorage[str]):
+    """Storage for Dota 2 Hero display names.
+
+    Unlike `dota2.Hero` enum from steam.py, it doesn't need a library update to know about a new hero.
+    """
+
+    @override
+    async def fetch_names(self) -> Iterable[tuple[int, str]]:
+        heroes = await self.bot.dota2.stratz.get_heroes()
+        return ((hero["id"], hero["displayName"]) for hero in heroes["data"]["constants"]["heroes"])
+
+    @override
+    @staticmethod
+    def generate_unknown_object(object_id: int) -> str:
+        return f"Unknown Hero #{object_id}"
+
+
+class PatchWatcher:
+    """Refresh game-data storages only when Dota 2 gets a new patch.
+
+    Polls a cheap Stratz `gameVersions` query instead of re-downloading every storage each day,
+    and once a new version shows up all storages are refreshed together.
+    Stratz GraphQL is a POST endpoint, so there is no ETag/Last-Modified to lean on.
+    """
+
+    def __init__(self, bot: IreBot, storages: Sequence[GameDataStorage[Any, Any]]) -> None:
+        self.bot: IreBot = bot
+        self.storages: Sequence[GameDataStorage[Any, Any]] = storages
+        self.version: int | None = None
+        """The latest known game version."""
+
+    def start(self) -> None:
+        """Start watching for patches."""
+        self.check_version.start()
+
+    def close(self) -> None:
+        """Stop watching for patches."""
+        self.check_version.cancel()
+
+    @ireloop(minutes=15)
+    async def check_version(self) -> None:
+        """Refresh all outdated storages together if the game version changed."""
+        self.version = version = await self.bot.dota2.stratz.get_latest_game_version()
+        outdated = [storage for storage in self.storages if storage.is_outdated(version)]
+        if not outdated:
+            return
+
+        log.info("Game version %s: refreshing %s", version, ", ".join(s.__class__.__name__ for s in outdated))
+        previous_versions = [storage.version for storage in outdated]
+        for storage in outdated:
+            # the snapshot is written with `storage.version` so it has to be set before the refresh
+            storage.version = version
+        results = await asyncio.gather(*(storage.refresh() for storage in outdated), return_exceptions=True)
+
+        for storage, previous_version, result in zip(outdated, previous_versions, results, strict=True):
+            if result is not True:
+                # let the next check try again
+                storage.version = previous_version
+            if isinstance(result, BaseException):
+                embed = discord.Embed(title=f"Failed to refresh {storage.__class__.__name__}", colour=0x1A7A8A)
+                await self.bot.error_manager.register(result, embed)
+
+    @check_version.before_loop
+    async def before_check_version(self) -> None:
+        """Let storages warm start from their snapshots first, so up-to-date ones are not re-downloaded."""
+        await asyncio.gather(*(storage.wait_for_warm_start() for storage in self.storages))
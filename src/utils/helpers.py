@@ -6,10 +6,10 @@ Some utilities that I could not categorize anywhere really.
 from __future__ import annotations
 
 import logging
-from time import perf_counter
+from time import monotonic, perf_counter
 from typing import Self
 
-__all__ = ("measure_time",)
+__all__ = ("CircuitBreaker", "TokenBucket", "measure_time")
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
@@ -60,3 +60,99 @@ class measure_time:  # noqa: N801 # it's fine to call classes lowercase if they
 
     async def __aexit__(self, *_: object) -> None:
         self.measure_time()
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per second.
+    Every action spends some tokens (its cost), so bursts are allowed up to `capacity`
+    while the sustained rate is limited by `rate`.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float) -> None:
+        self.capacity: float = capacity
+        self.rate: float = rate
+        self.tokens: float = capacity
+        self.updated: float = monotonic()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_spend(self, cost: float = 1.0) -> bool:
+        """Spend `cost` tokens if the bucket has enough of them."""
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def remaining(self) -> float:
+        """Tokens available right now."""
+        self._refill()
+        return self.tokens
+
+    def retry_after(self, cost: float = 1.0) -> float:
+        """Seconds until the bucket has enough tokens to spend `cost`."""
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Circuit breaker for calls into a flaky upstream.
+
+    * closed - calls go through; `threshold` consecutive failures open the circuit;
+    * open - calls fail fast for `reset_timeout` seconds;
+    * half-open - after that a single probe call is let through: success closes the circuit, failure opens it again.
+    """
+
+    __slots__ = ("failures", "opened_at", "probing", "reset_timeout", "threshold")
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.threshold: int = threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self.opened_at: float | None = None
+        self.probing: bool = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is open or half-open (i.e. not fully trusted)."""
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call is allowed to go through right now."""
+        if self.opened_at is None:
+            return True
+        if self.probing or monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        # half-open: let one probe through
+        self.probing = True
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe call through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        """Record a successful call; closes the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def abandon(self) -> None:
+        """Forget a call that neither succeeded nor failed (i.e. it was cancelled)."""
+        self.probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call; opens the circuit after `threshold` failures in a row or a failed probe."""
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            self.opened_at = monotonic()
+            self.probing = False
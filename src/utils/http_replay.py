@@ -0,0 +1,224 @@
+"""HTTP record/replay for the shared `aiohttp.ClientSession`.
+
+Dota API clients, storages, the emote checker and `translate` all talk to live services,
+so they can't be tested or benchmarked offline as they are. These are client middlewares for the session:
+
+* `HTTPRecorder` captures request/response pairs into a zstd-compressed JSON-lines log
+  (the bot does it with `--record-http`, only for `RECORDED_HOSTS`);
+* `HTTPReplayer` serves recorded responses locally with injected latency, never touching the network.
+
+Secrets are never written: API keys in query strings are masked and request headers are not recorded at all.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import pathlib
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp.helpers import TimerNoop
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .jsonl import ZstdJSONLinesWriter, read_zstd_json_lines
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+
+    from aiohttp import ClientHandlerType, ClientRequest, ClientResponse
+    from yarl import URL
+
+__all__ = ("RECORDED_HOSTS", "HTTPRecord", "HTTPRecorder", "HTTPReplayer", "read_http_records")
+
+RECORDED_HOSTS: frozenset[str] = frozenset(
+    {
+        "api.steampowered.com",
+        "api.opendota.com",
+        "api.stratz.com",
+        "7tv.io",
+        "api.frankerfacez.com",
+        "api.betterttv.net",
+        "clients5.google.com",
+    }
+)
+"""Hosts recorded by default. Discord isn't here on purpose - webhook URLs contain tokens."""
+
+SECRET_QUERY_PARAMS: frozenset[str] = frozenset({"key", "access_token", "client_secret", "token"})
+"""Query parameters that are masked in recorded URLs."""
+
+RECORDED_HEADERS: tuple[str, ...] = ("Content-Type", "Retry-After")
+"""Response headers worth keeping; the rest (cookies, etc.) are dropped."""
+
+
+def mask_url(url: URL) -> str:
+    """Mask secret query parameters so the URL is safe to write down and still matches on replay."""
+    query = [(k, "***" if k in SECRET_QUERY_PARAMS else v) for k, v in url.query.items()]
+    return str(url.with_query(query))
+
+
+def request_key(method: str, url: str, body: bytes) -> tuple[str, str, str]:
+    """Key to match a replayed request with recorded ones."""
+    return method, url, hashlib.sha1(body, usedforsecurity=False).hexdigest() if body else ""
+
+
+async def request_body(request: ClientRequest) -> bytes:
+    """Body of the request as bytes; requests without a body have `b""` instead of a payload."""
+    body = request.body
+    return body if isinstance(body, bytes) else await body.as_bytes()
+
+
+@dataclass(slots=True)
+class HTTPRecord:
+    """One recorded request/response pair."""
+
+    timestamp: float
+    method: str
+    url: str
+    """URL with secrets masked, see `mask_url`."""
+    body_hash: str
+    """SHA-1 of the request body or empty string if there was no body."""
+    status: int
+    reason: str | None
+    headers: dict[str, str]
+    body: str
+    """Response body; bytes as latin-1 text so any payload round-trips through JSON."""
+    elapsed: float
+    """Seconds it took to get the full response."""
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.method, self.url, self.body_hash
+
+
+class HTTPRecorder(ZstdJSONLinesWriter):
+    """Client middleware that records request/response pairs into a zstd-compressed JSON-lines log.
+
+    Just like `RichPresenceRecorder`, records are buffered and flushed as separate zstd frames,
+    here every `flush_every` records.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | None = None,
+        *,
+        hosts: Collection[str] = RECORDED_HOSTS,
+        flush_every: int = 50,
+        level: int = 3,
+    ) -> None:
+        now = datetime.datetime.now(datetime.UTC)
+        super().__init__(path or pathlib.Path(f".temp/http_records_{now:%Y%m%d_%H%M}.jsonl.zst"), level=level)
+        self.hosts: Collection[str] = hosts
+        self.flush_every: int = flush_every
+        self.flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def __call__(self, request: ClientRequest, handler: ClientHandlerType) -> ClientResponse:
+        if request.url.host not in self.hosts:
+            return await handler(request)
+
+        body_bytes = await request_body(request)
+        start = time.perf_counter()
+        response = await handler(request)
+        # `read` keeps the body in the response, so the caller can read it again
+        body = await response.read()
+        method, url, body_hash = request_key(request.method, mask_url(request.url), body_bytes)
+        record = HTTPRecord(
+            timestamp=time.time(),
+            method=method,
+            url=url,
+            body_hash=body_hash,
+            status=response.status,
+            reason=response.reason,
+            headers={name: value for name in RECORDED_HEADERS if (value := response.headers.get(name)) is not None},
+            body=body.decode("latin-1"),
+            elapsed=time.perf_counter() - start,
+        )
+        self.write(record)
+        if len(self.buffer) >= self.flush_every:
+            task = asyncio.create_task(self.flush())
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+        return response
+
+
+def read_http_records(path: pathlib.Path) -> Iterator[HTTPRecord]:
+    """Read records from a log written by `HTTPRecorder`."""
+    for record in read_zstd_json_lines(path):
+        yield HTTPRecord(**record)
+
+
+class HTTPReplayer:
+    """Client middleware that serves recorded responses instead of sending requests.
+
+    Several responses recorded for the same request are served in the recorded order, then the last one repeats
+    (i.e. Steam's empty `{}` followed by the actual real time stats).
+    Requests that were never recorded fail with `aiohttp.ClientConnectionError` as if the network was down.
+
+    Parameters
+    ----------
+    records
+        Recorded request/response pairs, i.e. `read_http_records(path)`.
+    latency
+        Injected latency in seconds; `None` replays the recorded latency of every response.
+    jitter
+        Standard deviation of random latency on top of `latency`.
+    seed
+        Seed for the jitter, so runs are deterministic.
+    """
+
+    def __init__(
+        self, records: Iterable[HTTPRecord], *, latency: float | None = 0.0, jitter: float = 0.0, seed: int = 0
+    ) -> None:
+        self.responses: defaultdict[tuple[str, str, str], list[HTTPRecord]] = defaultdict(list)
+        for record in records:
+            self.responses[record.key].append(record)
+        self.served: Counter[tuple[str, str, str]] = Counter()
+        self.stats: Counter[str] = Counter()
+        self.latency: float | None = latency
+        self.jitter: float = jitter
+        self.rng: random.Random = random.Random(seed)
+
+    async def __call__(self, request: ClientRequest, handler: ClientHandlerType) -> ClientResponse:  # noqa: ARG002
+        key = request_key(request.method, mask_url(request.url), await request_body(request))
+        if not (recorded := self.responses.get(key)):
+            self.stats["misses"] += 1
+            msg = f"No recorded response for {request.method} {key[1]}"
+            raise aiohttp.ClientConnectionError(msg)
+
+        record = recorded[min(self.served[key], len(recorded) - 1)]
+        self.served[key] += 1
+        self.stats["hits"] += 1
+
+        latency = record.elapsed if self.latency is None else self.latency
+        if self.jitter:
+            latency += abs(self.rng.gauss(0, self.jitter))
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return self.build_response(request, record)
+
+    @staticmethod
+    def build_response(request: ClientRequest, record: HTTPRecord) -> ClientResponse:
+        """Build a response with an already read body, so it never touches a connection."""
+        response = aiohttp.ClientResponse(
+            request.method,
+            request.url,
+            writer=None,
+            continue100=None,
+            timer=TimerNoop(),
+            request_info=request.request_info,
+            traces=[],
+            loop=asyncio.get_running_loop(),
+            session=None,  # pyright: ignore[reportArgumentType]
+        )
+        response.status = record.status
+        response.reason = record.reason
+        headers = CIMultiDict(record.headers)
+        response._headers = CIMultiDictProxy(headers)
+        response._raw_headers = tuple((k.encode(), v.encode()) for k, v in headers.items())
+        response._body = record.body.encode("latin-1")
+        return response
@@ -0,0 +1,69 @@
+"""Append-only zstd-compressed JSON-lines logs.
+
+Shared by recorders of live traffic (`RichPresenceRecorder`, `utils.http_replay.HTTPRecorder`)
+that are replayed offline later.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+from typing import TYPE_CHECKING, Any
+
+import orjson
+import zstandard
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+__all__ = ("ZstdJSONLinesWriter", "read_zstd_json_lines")
+
+log = logging.getLogger(__name__)
+
+
+class ZstdJSONLinesWriter:
+    """Buffered writer of a zstd-compressed JSON-lines log.
+
+    Records are buffered in memory and written by `flush`, each flush appends a separate zstd frame,
+    so the file stays readable even if the bot crashes mid-recording.
+    """
+
+    def __init__(self, path: pathlib.Path, *, level: int = 3) -> None:
+        self.path: pathlib.Path = path
+        self.compressor: zstandard.ZstdCompressor = zstandard.ZstdCompressor(level=level)
+        self.buffer: list[bytes] = []
+        self.recorded: int = 0
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def write(self, record: Any) -> None:
+        """Buffer a record (anything `orjson` can serialize, i.e. a dataclass)."""
+        self.buffer.append(orjson.dumps(record) + b"\n")
+        self.recorded += 1
+
+    def _append(self, data: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            f.write(self.compressor.compress(data))
+
+    async def flush(self) -> None:
+        """Compress and append buffered records to the log file (in a thread)."""
+        async with self.lock:
+            if not self.buffer:
+                return
+            data, self.buffer = b"".join(self.buffer), []
+            await asyncio.to_thread(self._append, data)
+            log.debug("Flushed %s bytes of records into %s", len(data), self.path)
+
+
+def read_zstd_json_lines(path: pathlib.Path) -> Iterator[Any]:
+    """Read decoded records from a log written by `ZstdJSONLinesWriter`."""
+    with (
+        path.open("rb") as f,
+        zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader,
+        io.TextIOWrapper(reader, encoding="utf-8") as lines,
+    ):
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
@@ -0,0 +1,153 @@
+"""Benchmark decoding of big API payloads with and without `APIClient.fields` selection.
+
+Usage: `PYTHONPATH=src uv run python -m tests.decode_benchmark --minutes 60`.
+
+Payloads are synthetic, but shaped like OpenDota's parsed `/matches/{id}` and Steam's `GetRealtimeStats`.
+Reports decode time, peak memory while decoding and memory retained by the result (i.e. what stays in caches).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import click
+import orjson
+
+from utils.dota2.api_clients import OpenDotaClient, SteamWebAPIClient, select_fields
+
+if TYPE_CHECKING:
+    from utils.dota2.api_clients import FieldSpec
+
+__all__ = ("DecodeResult", "measure_decode", "synthetic_opendota_match", "synthetic_real_time_stats")
+
+
+def synthetic_opendota_match(minutes: int, *, seed: int = 570) -> bytes:
+    """JSON bytes of a parsed OpenDota match `minutes` long."""
+    rng = random.Random(seed)
+    per_minute = lambda: [rng.randint(0, 40_000) for _ in range(minutes)]  # noqa: E731
+    players = [
+        {
+            "account_id": rng.randint(1, 1_000_000_000),
+            "player_slot": slot if slot < 5 else 123 + slot,
+            "hero_id": rng.randint(1, 145),
+            "abandons": 0,
+            "leaver_status": 0,
+            "kills": rng.randint(0, 20),
+            "deaths": rng.randint(0, 20),
+            "assists": rng.randint(0, 30),
+            "gold_t": per_minute(),
+            "xp_t": per_minute(),
+            "lh_t": per_minute(),
+            "dn_t": per_minute(),
+            "times": list(range(0, minutes * 60, 60)),
+            "purchase_log": [{"time": rng.randint(0, minutes * 60), "key": "item_tango"} for _ in range(minutes)],
+            "damage": {f"npc_dota_hero_{i}": rng.randint(0, 10_000) for i in range(40)},
+            "ability_uses": {f"ability_{i}": rng.randint(0, 100) for i in range(20)},
+        }
+        for slot in range(10)
+    ]
+    match = {
+        "match_id": 8_000_000_000,
+        "lobby_type": 7,
+        "game_mode": 22,
+        "version": 21,
+        "players": players,
+        "radiant_gold_adv": per_minute(),
+        "radiant_xp_adv": per_minute(),
+        "chat": [{"time": rng.randint(0, minutes * 60), "type": "chat", "key": "gg wp" * 5} for _ in range(minutes * 4)],
+        "teamfights": [{"start": i * 60, "end": i * 60 + 30, "deaths": rng.randint(1, 10)} for i in range(minutes // 2)],
+        "objectives": [{"time": i * 60, "type": "CHAT_MESSAGE_TOWER_KILL"} for i in range(minutes // 3)],
+    }
+    return orjson.dumps(match)
+
+
+def synthetic_real_time_stats(*, seed: int = 570) -> bytes:
+    """JSON bytes of a `GetRealtimeStats` response in the late game."""
+    rng = random.Random(seed)
+    player = lambda: {  # noqa: E731
+        "accountid": rng.randint(1, 1_000_000_000),
+        "playerid": 0,
+        "name": "player",
+        "team": 2,
+        "heroid": rng.randint(1, 145),
+        "level": 25,
+        "kill_count": 1,
+        "death_count": 1,
+        "assists_count": 1,
+        "denies_count": 1,
+        "lh_count": 300,
+        "gold": 1000,
+        "x": rng.random(),
+        "y": rng.random(),
+        "net_worth": 20_000,
+        "abilities": [rng.randint(1, 9000) for _ in range(20)],
+        "items": [rng.randint(1, 300) for _ in range(9)],
+        "team_slot": 0,
+    }
+    stats = {
+        "match": {"server_steam_id": "1", "match_id": "1", "game_mode": 22, "lobby_type": 7, "start_timestamp": 0},
+        "teams": [
+            {"team_number": n, "score": 10, "net_worth": 100_000, "players": [player() for _ in range(5)]} for n in (2, 3)
+        ],
+        "buildings": [{"team": 2, "heading": 0.0, "type": 0, "lane": 0, "tier": 1, "x": 0.0, "y": 0.0} for _ in range(36)],
+        "graph_data": {"graph_gold": [rng.randint(-20_000, 20_000) for _ in range(60 * 60)]},
+    }
+    return orjson.dumps(stats)
+
+
+@dataclass
+class DecodeResult:
+    seconds: float
+    peak_bytes: int
+    retained_bytes: int
+
+
+def measure_decode(raw: bytes, spec: FieldSpec | None, *, number: int = 20) -> DecodeResult:
+    """Decode `raw` JSON (keeping only `spec` fields if given) and measure time and memory."""
+
+    def decode() -> Any:
+        data = orjson.loads(raw)
+        return data if spec is None else select_fields(data, spec)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        decode()
+    seconds = (time.perf_counter() - start) / number
+
+    tracemalloc.start()
+    try:
+        result = decode()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return DecodeResult(seconds, peak, retained)
+
+
+@click.command()
+@click.option("--minutes", type=int, default=60, help="Duration of the synthetic OpenDota match.")
+def main(minutes: int) -> None:
+    """Print decode time and memory for full vs selective decoding."""
+    payloads = {
+        "OpenDota matches": (synthetic_opendota_match(minutes), OpenDotaClient.fields["matches"]),
+        "GetRealtimeStats": (
+            synthetic_real_time_stats(),
+            SteamWebAPIClient.fields["IDOTA2MatchStats_570/GetRealtimeStats/v1"],
+        ),
+    }
+    for label, (raw, spec) in payloads.items():
+        click.echo(f"{label} ({len(raw) / 1024:.0f} KiB of JSON)")
+        for mode, mode_spec in (("full", None), ("selective", spec)):
+            result = measure_decode(raw, mode_spec)
+            click.echo(
+                f"    {mode:>9}: {result.seconds * 1e3:6.2f} ms, peak {result.peak_bytes / 1024:7.0f} KiB, "
+                f"retained {result.retained_bytes / 1024:7.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,503 @@
+"""Local stand-in for Steam and Dota 2 Game Coordinator.
+
+Used to exercise `Dota2RichPresenceFlow` offline, i.e. for throughput and soak testing with hundreds of friends.
+`FakeDota2Client` implements only the surface of `utils.dota2.Dota2Client` that the flow uses:
+* `user.friends()`, `user.get_friend()`, `get_user()`, `fetch_user()`;
+* `live_matches()`, `create_partial_user().dota2_profile_card()`, `create_partial_match().minimal()`;
+* `match_history()` of friend users;
+* `on_user_update` that dispatches `steam_user_update` into the bot.
+
+Synthetic friends move their Rich Presence through realistic game lifecycles
+(main menu -> finding -> hero selection -> strategy -> pre-game -> playing -> main menu, sometimes spectating).
+GC requests have configurable latency and error rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import datetime
+import itertools
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from steam.ext import dota2
+
+from core.startup import StartupTimeline
+from utils.dota2 import RealTimeStats, Status, SteamUserUpdate
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+
+__all__ = ("FakeDota2Client", "FakeDota2ClientPool", "FakeSteamConfig", "StubBot")
+
+HEROES = [hero for hero in dota2.Hero if hero]
+DOTA_APP_ID = 570
+
+
+@dataclass
+class FakeSteamConfig:
+    """Knobs for the fake Steam.
+
+    Attributes
+    ----------
+    latency
+        Mean latency of a Game Coordinator request in seconds.
+    jitter
+        Standard deviation of a Game Coordinator request latency in seconds.
+    error_rate
+        Probability for a Game Coordinator request to raise `TimeoutError` (like steam.py does on no response).
+    speed
+        Time multiplier for Rich Presence lifecycles, i.e. `60` makes a 40 minute game last 40 seconds.
+    seed
+        Seed for the random generator so runs are reproducible.
+    synthesize_matches
+        Whether `live_matches` should make up a match for unknown lobby IDs, i.e. when replaying recorded updates.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    speed: float = 60.0
+    seed: int = 570
+    synthesize_matches: bool = False
+
+
+@dataclass
+class FakeApp:
+    id: int
+
+
+@dataclass
+class FakeRankTier:
+    division: str
+    stars: int
+
+
+@dataclass
+class FakeProfileCard:
+    lifetime_games: int
+    rank_tier: FakeRankTier
+    leaderboard_rank: int
+
+
+@dataclass
+class FakePlayer:
+    id: int
+    hero: dota2.Hero
+    kills: int = 0
+    deaths: int = 0
+    assists: int = 0
+
+
+@dataclass
+class FakeLiveMatch:
+    id: int
+    server_steam_id: int
+    average_mmr: int
+    lobby_type: dota2.LobbyType
+    game_mode: dota2.GameMode
+    start_time: datetime.datetime
+    players: list[FakePlayer]
+
+    @property
+    def heroes(self) -> list[dota2.Hero]:
+        return [player.hero for player in self.players]
+
+
+@dataclass
+class FakeMinimalMatch:
+    id: int
+    outcome: dota2.MatchOutcome
+    lobby_type: dota2.LobbyType
+    game_mode: dota2.GameMode
+    start_time: datetime.datetime
+    duration: datetime.timedelta
+    players: list[FakePlayer]
+
+
+@dataclass
+class FakeUser:
+    """Fake `dota2.User`; it's also used as a fake `dota2.Friend` via `_user` attribute."""
+
+    client: FakeDota2Client
+    id: int
+    name: str
+    rich_presence: dict[str, str] | None = None
+    app: FakeApp | None = None
+
+    @property
+    def _user(self) -> FakeUser:
+        return self
+
+    async def dota2_profile_card(self) -> FakeProfileCard:
+        return await self.client.create_partial_user(self.id).dota2_profile_card()
+
+    async def match_history(self) -> list[Any]:
+        await self.client.gc_request("match_history")
+        return []
+
+
+class FakePartialUser:
+    def __init__(self, client: FakeDota2Client, user_id: int) -> None:
+        self.client: FakeDota2Client = client
+        self.id: int = user_id
+
+    async def dota2_profile_card(self) -> FakeProfileCard:
+        await self.client.gc_request("dota2_profile_card")
+        rng = random.Random(self.id)
+        return FakeProfileCard(
+            lifetime_games=rng.randint(0, 15_000),
+            rank_tier=FakeRankTier(division=rng.choice(["Herald", "Crusader", "Archon", "Legend", "Ancient"]), stars=1),
+            leaderboard_rank=0,
+        )
+
+
+class FakePartialMatch:
+    def __init__(self, client: FakeDota2Client, match_id: int) -> None:
+        self.client: FakeDota2Client = client
+        self.id: int = match_id
+
+    async def minimal(self) -> FakeMinimalMatch:
+        await self.client.gc_request("minimal")
+        match = self.client.matches_by_id.get(self.id)
+        if match is None:
+            # steam.py raises `ValueError` for matches GC doesn't know about (yet)
+            msg = f"Match {self.id} not found"
+            raise ValueError(msg)
+        return FakeMinimalMatch(
+            id=match.id,
+            outcome=dota2.MatchOutcome.RadiantVictory if self.id % 2 else dota2.MatchOutcome.DireVictory,
+            lobby_type=match.lobby_type,
+            game_mode=match.game_mode,
+            start_time=match.start_time,
+            duration=datetime.timedelta(minutes=40),
+            players=match.players,
+        )
+
+
+class FakeClientUser:
+    def __init__(self, client: FakeDota2Client) -> None:
+        self.client: FakeDota2Client = client
+        self.name: str = f"FakeIrenesBot#{client.shard}"
+
+    async def friends(self) -> list[FakeUser]:
+        await self.client.gc_request("friends")
+        return list(self.client.friends.values())
+
+    def get_friend(self, friend_id: int) -> FakeUser | None:
+        return self.client.friends.get(friend_id)
+
+
+class FakeDota2Client:
+    """Fake `utils.dota2.Dota2Client` with synthetic friends."""
+
+    def __init__(self, bot: Any, config: FakeSteamConfig, *, friends: int, shard: int = 0) -> None:
+        self.bot: Any = bot
+        self.config: FakeSteamConfig = config
+        self.shard: int = shard
+        self.in_flight: int = 0
+        self.disconnected: asyncio.Event = asyncio.Event()
+        self.rng: random.Random = random.Random(config.seed + shard)
+
+        self.user: FakeClientUser = FakeClientUser(self)
+        first_id = 100_000_000 * (shard + 1)
+        self.friends: dict[int, FakeUser] = {
+            friend_id: FakeUser(self, friend_id, f"Synthetic #{friend_id}")
+            for friend_id in range(first_id, first_id + friends)
+        }
+        self.matches_by_lobby: dict[int, FakeLiveMatch] = {}
+        self.matches_by_id: dict[int, FakeLiveMatch] = {}
+        self.calls: Counter[str] = Counter()
+        """Amount of GC requests per method."""
+        self.errors: Counter[str] = Counter()
+        """Amount of injected GC errors per method."""
+
+        self._ids = itertools.count(7_000_000_000)
+
+    async def gc_request(self, method: str) -> None:
+        """Emulate Game Coordinator request latency and errors."""
+        self.calls[method] += 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.config.latency, self.config.jitter)))
+            if self.rng.random() < self.config.error_rate:
+                self.errors[method] += 1
+                raise TimeoutError
+        finally:
+            self.in_flight -= 1
+
+    async def wait_until_ready(self) -> None: ...
+
+    async def wait_until_gc_ready(self) -> None: ...
+
+    def get_user(self, user_id: int) -> FakeUser | None:
+        return self.friends.get(user_id)
+
+    async def fetch_user(self, user_id: int) -> FakeUser:
+        await self.gc_request("fetch_user")
+        return self.friends.get(user_id) or FakeUser(self, user_id, f"Stranger #{user_id}")
+
+    def create_partial_user(self, user_id: int) -> FakePartialUser:
+        return FakePartialUser(self, user_id)
+
+    def create_partial_match(self, match_id: int) -> FakePartialMatch:
+        return FakePartialMatch(self, match_id)
+
+    async def live_matches(self, *, lobby_ids: list[int]) -> list[FakeLiveMatch]:
+        await self.gc_request("live_matches")
+        if self.config.synthesize_matches:
+            for lobby_id in lobby_ids:
+                if lobby_id not in self.matches_by_lobby:
+                    self.create_match(None, lobby_id=lobby_id)
+        return [match for lobby_id in lobby_ids if (match := self.matches_by_lobby.get(lobby_id))]
+
+    async def on_user_update(self, before: FakeUser, after: FakeUser) -> None:
+        self.bot.dispatch("steam_user_update", SteamUserUpdate(before=before, after=after))  # pyright: ignore[reportArgumentType]
+
+    # SYNTHETIC LIFECYCLES
+
+    def create_match(self, friend: FakeUser | None, *, lobby_id: int | None = None) -> tuple[int, FakeLiveMatch]:
+        """Create a synthetic live match with `friend` (if any) in a random slot.
+
+        Returns a tuple of lobby ID (i.e. `WatchableGameID`) and the match.
+        """
+        players = [FakePlayer(self.rng.randint(1, 1_000_000_000), hero) for hero in self.rng.sample(HEROES, 10)]
+        if friend:
+            players[self.rng.randrange(10)].id = friend.id
+        match = FakeLiveMatch(
+            id=next(self._ids),
+            server_steam_id=90_000_000_000_000_000 + next(self._ids),
+            average_mmr=self.rng.randint(1000, 8000),
+            lobby_type=self.rng.choice([dota2.LobbyType.Ranked, dota2.LobbyType.Unranked]),
+            game_mode=dota2.GameMode.AllDraft,
+            start_time=datetime.datetime.now(datetime.UTC),
+            players=players,
+        )
+        lobby_id = lobby_id or next(self._ids)
+        self.matches_by_lobby[lobby_id] = match
+        self.matches_by_id[match.id] = match
+        return lobby_id, match
+
+    async def set_rich_presence(
+        self, friend: FakeUser, rich_presence: dict[str, str] | None, *, in_dota: bool = True
+    ) -> None:
+        """Change friend's rich presence and dispatch the update like steam.py would."""
+        before = copy.copy(friend)
+        friend.rich_presence = rich_presence
+        friend.app = FakeApp(DOTA_APP_ID) if in_dota else None
+        await self.on_user_update(before, friend)
+
+    async def lifecycle(self, friend: FakeUser, *, stop: asyncio.Event) -> None:
+        """Move friend's rich presence through realistic game lifecycles until `stop` is set."""
+
+        async def stay(min_seconds: float, max_seconds: float) -> None:
+            await asyncio.sleep(self.rng.uniform(min_seconds, max_seconds) / self.config.speed)
+
+        # desync friends from each other
+        await stay(0, 60)
+        while not stop.is_set():
+            await self.set_rich_presence(friend, {"status": Status.MainMenu.value})
+            await stay(10, 120)
+            roll = self.rng.random()
+            if roll < 0.1:
+                # closes Dota 2 for a while
+                await self.set_rich_presence(friend, None, in_dota=False)
+                await stay(60, 600)
+                continue
+            if roll < 0.2:
+                server = f"[A:1:{self.rng.randint(1, 4_000_000_000)}:{self.rng.randint(1, 40_000)}]"
+                await self.set_rich_presence(friend, {"status": Status.Spectating.value, "watching_server": server})
+                await stay(120, 900)
+                continue
+
+            await self.set_rich_presence(friend, {"status": Status.Finding.value})
+            await stay(30, 300)
+
+            lobby_id, match = self.create_match(friend)
+            hero = next(player.hero for player in match.players if player.id == friend.id)
+            in_match = {"WatchableGameID": str(lobby_id), "param2": f"#npc_dota_hero_{hero.name.lower()}"}
+            for status, min_seconds, max_seconds in (
+                (Status.HeroSelection, 30, 90),
+                (Status.Strategy, 15, 45),
+                (Status.PreGame, 60, 90),
+            ):
+                await self.set_rich_presence(friend, {"status": status.value, **in_match})
+                await stay(min_seconds, max_seconds)
+            for level in range(1, 26, 3):
+                # `param1` (hero level) changes are supposed to be ignored by the flow
+                await self.set_rich_presence(friend, {"status": Status.Playing.value, "param1": str(level), **in_match})
+                await stay(120, 360)
+            self.matches_by_lobby.pop(lobby_id, None)
+
+
+class FakeDota2ClientPool:
+    """Fake `utils.dota2.Dota2ClientPool` over `FakeDota2Client` shards."""
+
+    def __init__(self, clients: list[FakeDota2Client]) -> None:
+        self.clients: list[FakeDota2Client] = clients
+
+    @property
+    def primary(self) -> FakeDota2Client:
+        return self.clients[0]
+
+    async def wait_until_ready(self) -> None: ...
+
+    async def wait_until_gc_ready(self) -> None: ...
+
+    async def friends(self) -> list[FakeUser]:
+        friend_lists = await asyncio.gather(*(client.user.friends() for client in self.clients))
+        return [friend for friends in friend_lists for friend in friends]
+
+    def owner_of(self, friend_id: int) -> FakeDota2Client | None:
+        return next((client for client in self.clients if client.user.get_friend(friend_id)), None)
+
+    @asynccontextmanager
+    async def acquire(self, friend_id: int | None = None) -> AsyncGenerator[FakeDota2Client]:
+        yield (self.owner_of(friend_id) if friend_id else None) or min(self.clients, key=lambda c: c.in_flight)
+
+    def get_user(self, user_id: int) -> FakeUser | None:
+        return next((user for client in self.clients if (user := client.get_user(user_id))), None)
+
+    async def run_lifecycles(self, *, stop: asyncio.Event) -> None:
+        """Run synthetic lifecycles of all friends of all clients until `stop` is set."""
+        async with asyncio.TaskGroup() as tg:
+            for client in self.clients:
+                for friend in client.friends.values():
+                    tg.create_task(client.lifecycle(friend, stop=stop))
+
+
+class FakeWebAPI:
+    """Fake `SteamWebAPIClient` that serves real time stats for any server."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng: random.Random = rng
+
+    async def get_real_time_stats(
+        self,
+        server_steam_id: int,
+        *,
+        budget: float | None = None,  # noqa: ARG002
+        hedge: bool = False,  # noqa: ARG002
+    ) -> RealTimeStats:
+        players = [
+            {
+                "accountid": self.rng.randint(1, 1_000_000_000),
+                "heroid": hero.value,
+                "name": "?",
+                "level": 1,
+                "kill_count": 0,
+                "death_count": 0,
+                "assists_count": 0,
+                "lh_count": 0,
+                "net_worth": 0,
+                "items": [-1] * 9,
+            }
+            for hero in self.rng.sample(HEROES, 10)
+        ]
+        return RealTimeStats.decode(
+            {  # pyright: ignore[reportArgumentType]
+                "match": {
+                    "match_id": str(server_steam_id % 10**10),
+                    "lobby_type": dota2.LobbyType.Ranked.value,
+                    "game_mode": dota2.GameMode.AllDraft.value,
+                    "start_timestamp": int(datetime.datetime.now(datetime.UTC).timestamp()),
+                },
+                "teams": [
+                    {"team_number": 2, "players": players[:5], "net_worth": 0, "score": 0},
+                    {"team_number": 3, "players": players[5:], "net_worth": 0, "score": 0},
+                ],
+            }
+        )
+
+
+class StubDatabasePool:
+    """Stub `asyncpg.Pool` that counts queries and returns empty results."""
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+
+    async def execute(self, _query: str, *_args: Any) -> str:
+        self.calls["execute"] += 1
+        return ""
+
+    async def fetch(self, _query: str, *_args: Any) -> list[Any]:
+        self.calls["fetch"] += 1
+        return []
+
+    async def fetchrow(self, _query: str, *_args: Any) -> None:
+        self.calls["fetchrow"] += 1
+
+    async def fetchval(self, _query: str, *_args: Any) -> None:
+        self.calls["fetchval"] += 1
+
+
+@dataclass
+class StubErrorManager:
+    errors: list[BaseException] = field(default_factory=list)
+
+    async def register(self, error: BaseException, embed: Any, *, mention: bool = True) -> None:  # noqa: ARG002
+        self.errors.append(error)
+
+
+class StubWebhook:
+    async def send(self, *args: Any, **kwargs: Any) -> None: ...
+
+
+class StubBot:
+    """The bare minimum of `IreBot` for `Dota2RichPresenceFlow` to run against fake Steam.
+
+    Events dispatched into it are delivered straight into listeners added with `add_listener`.
+    """
+
+    def __init__(self, config: FakeSteamConfig, *, friends: int, shards: int = 1) -> None:
+        self.pool: StubDatabasePool = StubDatabasePool()
+        self.error_manager: StubErrorManager = StubErrorManager()
+        self.error_webhook: StubWebhook = StubWebhook()
+        self.error_ping: str = ""
+        self.owner_id: str = "0"
+        self.bot_id: str = "0"
+        self.modules_to_load: tuple[str, ...] = ("modules.dev.required", "modules.public.d9kmmrbot")
+        self.streamers: dict[str, Any] = {}
+        self.streamers_index_ready: asyncio.Event = asyncio.Event()
+        self.friends_index_ready: asyncio.Event = asyncio.Event()
+        self.streamers_index_ready.set()
+        self.startup: StartupTimeline = StartupTimeline()
+
+        per_shard = -(-friends // shards)  # ceil
+        self.dota2_pool: FakeDota2ClientPool = FakeDota2ClientPool(
+            [FakeDota2Client(self, config, friends=per_shard, shard=shard) for shard in range(shards)]
+        )
+        self.dota2: FakeDota2Client = self.dota2_pool.primary
+        self.dota2.web_api = FakeWebAPI(self.dota2.rng)  # pyright: ignore[reportAttributeAccessIssue]
+
+        self.listeners: dict[str, list[Callable[..., Any]]] = {}
+        self.dispatched: Counter[str] = Counter()
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    async def wait_until_ready(self) -> None: ...
+
+    def add_listener(self, listener: Callable[..., Any], *, event: str) -> None:
+        self.listeners.setdefault(event.removeprefix("event_"), []).append(listener)
+
+    def dispatch(self, event: str, payload: Any = None) -> None:
+        self.dispatched[event] += 1
+        for listener in self.listeners.get(event, []):
+            task = asyncio.create_task(self._run_listener(listener, payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_listener(self, listener: Callable[..., Any], payload: Any) -> None:
+        # mirror `IreBot.event_error`
+        try:
+            await listener(payload)
+        except Exception as error:  # noqa: BLE001
+            await self.error_manager.register(error, embed=None)
+
+    async def wait_for_listeners(self) -> None:
+        """Wait for all dispatched listener calls to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,124 @@
+"""Benchmark Dota API clients offline against recorded HTTP traffic.
+
+Traffic is recorded live with `--record-http` (see `utils.http_replay`).
+Usage: `PYTHONPATH=src uv run python -m tests.http_benchmark .temp/http_records_20261020_2000.jsonl.zst --rounds 3`.
+
+Every recorded real time stats / OpenDota match request is called again through the clients (Stratz constants once)
+for `rounds` rounds, so the report shows decode cost, retry behaviour and cache hit rates with no network at all.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import statistics
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import click
+from yarl import URL
+
+from utils.dota2.api_clients import APIClientError, OpenDotaClient, SteamWebAPIClient, StratzClient
+from utils.dota2.cache import MatchPayloadStore
+from utils.http_replay import HTTPRecord, HTTPReplayer, read_http_records
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterable
+
+    from utils.dota2.api_clients import APIClient
+
+__all__ = ("HTTPBenchmarkReport", "benchmark")
+
+
+@dataclass
+class HTTPBenchmarkReport:
+    calls: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+    client_stats: dict[str, Counter[str]] = field(default_factory=dict)
+    replay_stats: Counter[str] = field(default_factory=Counter)
+
+    def __str__(self) -> str:
+        quantiles = statistics.quantiles(self.latencies, n=10) if len(self.latencies) > 1 else [0.0] * 9
+        lines = [
+            f"Calls: {self.calls} in {self.seconds:.2f}s",
+            f"Latency p50: {quantiles[4] * 1e3:.1f} ms, p90: {quantiles[8] * 1e3:.1f} ms",
+            f"Errors: {self.errors.most_common()}",
+            f"Replayed responses: {dict(self.replay_stats)}",
+            *(f"{name}: {dict(stats)}" for name, stats in self.client_stats.items()),
+        ]
+        return "\n".join(lines)
+
+
+def workload(
+    records: Iterable[HTTPRecord], web_api: SteamWebAPIClient, opendota: OpenDotaClient, stratz: StratzClient
+) -> list[Callable[[], Coroutine[Any, Any, Any]]]:
+    """Client calls that reproduce the recorded requests (once per unique request)."""
+    calls: dict[tuple[str, str], Callable[[], Coroutine[Any, Any, Any]]] = {}
+    for record in records:
+        url = URL(record.url)
+        if url.host == "api.steampowered.com" and url.path.endswith("GetRealtimeStats/v1/"):
+            server_steam_id = int(url.query["server_steam_id"])
+            calls[record.method, record.url] = lambda s=server_steam_id: web_api.get_real_time_stats(s)
+        elif url.host == "api.opendota.com" and url.parts[-2] == "matches":
+            match_id = int(url.parts[-1])
+            calls[record.method, record.url] = lambda m=match_id: opendota.matches(m)
+        elif url.host == "api.stratz.com":
+            # GraphQL requests are told apart by the body, just ask for all the constants
+            for getter in (stratz.get_items, stratz.get_heroes, stratz.get_game_versions):
+                calls["POST", getter.__name__] = getter
+    return list(calls.values())
+
+
+async def benchmark(records: list[HTTPRecord], *, rounds: int = 1, latency: float | None = None) -> HTTPBenchmarkReport:
+    """Replay the recorded workload `rounds` times through the API clients."""
+    replayer = HTTPReplayer(records, latency=latency)
+    report = HTTPBenchmarkReport()
+
+    async with aiohttp.ClientSession(middlewares=(replayer,)) as session:
+        web_api = SteamWebAPIClient(api_keys=["***"], session=session)
+        opendota = OpenDotaClient(session=session)
+        stratz = StratzClient(bearer_token="", session=session)
+        clients: list[APIClient] = [web_api, opendota, stratz]
+
+        with tempfile.TemporaryDirectory() as directory:
+            # the real store would answer everything from disk after the first run
+            opendota.match_store = MatchPayloadStore(pathlib.Path(directory))
+            calls = workload(records, web_api, opendota, stratz)
+
+            async def timed(call: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+                start = time.perf_counter()
+                try:
+                    await call()
+                except (APIClientError, aiohttp.ClientError) as exc:
+                    report.errors[exc.__class__.__name__] += 1
+                report.latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                await asyncio.gather(*(timed(call) for call in calls))
+            report.seconds = time.perf_counter() - start
+
+    report.calls = len(report.latencies)
+    report.client_stats = {client.name: client.stats for client in clients}
+    report.replay_stats = replayer.stats
+    return report
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@click.option("--rounds", type=int, default=1, help="How many times to repeat the workload (later rounds hit caches).")
+@click.option("--latency", type=float, default=None, help="Injected latency in seconds (default: recorded latency).")
+def main(path: pathlib.Path, rounds: int, latency: float | None) -> None:
+    """Replay recorded HTTP traffic through the Dota API clients and print the benchmark report."""
+    report = asyncio.run(benchmark(list(read_http_records(path)), rounds=rounds, latency=latency))
+    click.echo(str(report))
+
+
+if __name__ == "__main__":
+    main()
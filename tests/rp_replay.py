@@ -0,0 +1,122 @@
+"""Replay recorded rich presence updates through `Dota2RichPresenceFlow` against fake Steam.
+
+Logs are recorded live with `!rp_record` (see `modules.public.d9kmmrbot.recorder`).
+Usage: `PYTHONPATH=src uv run python -m tests.rp_replay .temp/rp_records_20261020_2000.jsonl.zst --speed 10`.
+
+The report shows events/sec, activity transitions and Game Coordinator / database calls per event,
+so RP-flow changes can be benchmarked and regression-tested on real traffic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import math
+import pathlib
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import click
+
+from modules.public.d9kmmrbot.recorder import read_records
+from modules.public.d9kmmrbot.rp_flow import Dota2RichPresenceFlow
+from utils.dota2 import SteamUserUpdate
+
+from .fake_steam import DOTA_APP_ID, FakeApp, FakeSteamConfig, FakeUser, StubBot
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from modules.public.d9kmmrbot.recorder import RichPresenceRecord
+
+__all__ = ("ReplayReport", "replay")
+
+
+@dataclass
+class ReplayReport:
+    events: int = 0
+    seconds: float = 0.0
+    gc_calls: int = 0
+    db_calls: int = 0
+    transitions: Counter[tuple[str, str]] = field(default_factory=Counter)
+    """Activity transitions `(before, after)` by activity class names."""
+    errors: list[BaseException] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else math.inf
+
+    def __str__(self) -> str:
+        per_event = max(self.events, 1)
+        lines = [
+            f"Events: {self.events} in {self.seconds:.2f}s ({self.events_per_second:.1f} events/sec)",
+            f"GC calls/event: {self.gc_calls / per_event:.3f}, DB calls/event: {self.db_calls / per_event:.3f}",
+            f"Errors: {len(self.errors)} {Counter(e.__class__.__name__ for e in self.errors).most_common()}",
+            "Activity transitions:",
+            *(f"    {before} -> {after}: {count}" for (before, after), count in self.transitions.most_common()),
+        ]
+        return "\n".join(lines)
+
+
+async def replay(
+    records: Iterable[RichPresenceRecord], *, speed: float = math.inf, config: FakeSteamConfig | None = None
+) -> ReplayReport:
+    """Feed recorded events through `Dota2RichPresenceFlow.steam_user_update` at `speed`x speed.
+
+    `speed=math.inf` replays as fast as possible.
+    """
+    bot = StubBot(config or FakeSteamConfig(latency=0.0, jitter=0.0, synthesize_matches=True), friends=0)
+    client = bot.dota2
+    flow = Dota2RichPresenceFlow(bot)  # pyright: ignore[reportArgumentType]
+    report = ReplayReport()
+
+    previous_timestamp: float | None = None
+    start = time.perf_counter()
+    for record in records:
+        if previous_timestamp is not None and math.isfinite(speed):
+            await asyncio.sleep(max(0.0, record.timestamp - previous_timestamp) / speed)
+        previous_timestamp = record.timestamp
+
+        user = client.friends.setdefault(record.friend_id, FakeUser(client, record.friend_id, f"#{record.friend_id}"))
+        before = copy.copy(user)
+        before.rich_presence = record.before
+        user.rich_presence = record.after
+        user.app = FakeApp(DOTA_APP_ID) if record.in_dota else None
+
+        old = flow.friends[user.id].activity.__class__.__name__ if user.id in flow.friends else "None"
+        try:
+            await flow.steam_user_update(SteamUserUpdate(before=before, after=user))  # pyright: ignore[reportArgumentType]
+        except Exception as error:  # noqa: BLE001
+            report.errors.append(error)
+        new = flow.friends[user.id].activity.__class__.__name__ if user.id in flow.friends else "None"
+        if old != new:
+            report.transitions[old, new] += 1
+        report.events += 1
+
+    report.seconds = time.perf_counter() - start
+
+    for match in [*flow.play_matches_index.values(), *flow.watch_matches_index.values()]:
+        match.update_data.cancel()
+    flow.process_pending_matches.cancel()
+
+    report.gc_calls = sum(client.calls.values())
+    report.db_calls = sum(bot.pool.calls.values())
+    report.errors += bot.error_manager.errors
+    return report
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@click.option("--speed", type=float, default=math.inf, help="Replay speed multiplier (default: as fast as possible).")
+@click.option("--latency", type=float, default=0.0, help="Mean fake Game Coordinator latency in seconds.")
+def main(path: pathlib.Path, speed: float, latency: float) -> None:
+    """Replay a rich presence log and print the benchmark report."""
+    config = FakeSteamConfig(latency=latency, jitter=latency / 3, synthesize_matches=True)
+    report = asyncio.run(replay(read_records(path), speed=speed, config=config))
+    click.echo(str(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure memory of game-data storage layouts.
+
+Usage: `PYTHONPATH=src uv run python -m tests.storage_benchmark --ids 10000 --fill 0.7`.
+
+Compares the classic `dict[int, Item]` layout of `GameDataStorage` against `DenseIdMap[str]`
+of `DenseGameDataStorage` for the same (synthetic) constants.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import click
+
+from utils.dota2.storage import DenseIdMap, Item
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+__all__ = ("LAYOUTS", "measure", "synthetic_names")
+
+
+def synthetic_names(ids: int, fill: float, *, seed: int = 570) -> dict[int, str]:
+    """Generate `id -> display name` constants with `ids` slots, `fill` of which are occupied."""
+    rng = random.Random(seed)
+    return {object_id: f"Constant #{object_id}" for object_id in range(ids) if rng.random() < fill}
+
+
+LAYOUTS: dict[str, Callable[[dict[int, str]], Mapping[int, object]]] = {
+    "dict[int, Item]": lambda names: {object_id: Item(object_id, name) for object_id, name in names.items()},
+    "dict[int, str]": dict,
+    "DenseIdMap[str]": lambda names: DenseIdMap(names.items()),
+}
+
+
+def measure(layout: Callable[[dict[int, str]], Mapping[int, object]], names: dict[int, str]) -> int:
+    """Bytes allocated to build the `layout` container (display names themselves are shared and not counted)."""
+    tracemalloc.start()
+    try:
+        container = layout(names)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del container
+    return size
+
+
+@click.command()
+@click.option("--ids", type=int, default=10_000, help="Amount of ID slots (max ID + 1).")
+@click.option("--fill", type=float, default=0.7, help="Share of the slots that are occupied.")
+def main(ids: int, fill: float) -> None:
+    """Print memory and lookup time for each storage layout."""
+    names = synthetic_names(ids, fill)
+    keys = list(names)
+    click.echo(f"{len(names)} constants in {ids} ID slots")
+    for label, layout in LAYOUTS.items():
+        size = measure(layout, names)
+        container = layout(names)
+        lookup = timeit.timeit(lambda c=container: [c[k] for k in keys], number=20) / 20 / max(len(keys), 1)
+        per_entry = size / max(len(names), 1)
+        click.echo(f"{label:>16}: {size / 1024:8.1f} KiB ({per_entry:5.1f} B/entry), {lookup * 1e9:5.1f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
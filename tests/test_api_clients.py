@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from collections import Counter
+from typing import TYPE_CHECKING, Any, override
+
+import aiohttp
+import orjson
+import pytest
+from yarl import URL
+
+from utils.dota2.api_clients import (
+    APIClientError,
+    APIKeyPool,
+    CircuitOpenError,
+    DeadlineExceededError,
+    OpenDotaClient,
+    RateLimitedError,
+    SteamWebAPIClient,
+    StratzClient,
+    select_fields,
+)
+from utils.dota2.cache import MatchPayloadStore, ResponseCache
+from utils.dota2.models import RealTimeStats
+from utils.http_replay import HTTPRecord, HTTPReplayer, mask_url
+
+from .decode_benchmark import measure_decode, synthetic_opendota_match, synthetic_real_time_stats
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Awaitable, Callable
+
+
+def test_response_cache_single_flight_ttl_and_lru() -> None:
+    """Test that identical concurrent calls share one fetch, hits are served from cache and LRU evicts."""
+    fetches: Counter[str] = Counter()
+
+    def fetcher(key: str) -> Callable[[], Awaitable[str]]:
+        async def fetch() -> str:
+            fetches[key] += 1
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        return fetch
+
+    async def main() -> Counter[str]:
+        stats: Counter[str] = Counter()
+        cache = ResponseCache(maxsize=2, stats=stats)
+        results = await asyncio.gather(*(cache.get_or_fetch("a", 60, fetcher("a")) for _ in range(5)))
+        assert results == ["A"] * 5
+        assert await cache.get_or_fetch("a", 60, fetcher("a")) == "A"
+
+        # "a" is the least recently used one when "c" comes in
+        await cache.get_or_fetch("b", 60, fetcher("b"))
+        await cache.get_or_fetch("c", 60, fetcher("c"))
+        assert list(cache.entries) == ["b", "c"]
+        # ttl=0 isn't stored
+        await cache.get_or_fetch("d", 0, fetcher("d"))
+        assert "d" not in cache.entries
+        return stats
+
+    stats = asyncio.run(main())
+    assert fetches == {"a": 1, "b": 1, "c": 1, "d": 1}
+    assert stats == {"cache_misses": 4, "cache_shared": 4, "cache_hits": 1}
+
+
+def test_match_payload_store_roundtrip_and_lru_by_bytes(tmp_path: pathlib.Path) -> None:
+    """Test that stored payloads are read back and the least recently used ones are evicted by total bytes."""
+
+    async def main() -> MatchPayloadStore:
+        store = MatchPayloadStore(tmp_path, max_bytes=1)
+        await store.put(1, {"match_id": 1, "version": 21})
+        store.max_bytes = store.total_bytes * 2
+        await store.put(2, {"match_id": 2, "version": 21})
+        assert await store.get(1) == {"match_id": 1, "version": 21}
+        # 1 was used more recently than 2
+        await store.put(3, {"match_id": 3, "version": 21})
+        return store
+
+    store = asyncio.run(main())
+    assert list(store.index) == [1, 3]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["1.json.zst", "3.json.zst"]
+    assert asyncio.run(MatchPayloadStore(tmp_path).get(3)) == {"match_id": 3, "version": 21}
+
+
+def test_selective_decode_keeps_only_declared_fields() -> None:
+    """Test that `select_fields` keeps what the bot reads and drops the heavy arrays."""
+    raw = synthetic_opendota_match(minutes=60)
+    spec = OpenDotaClient.fields["matches"]
+    match = select_fields(orjson.loads(raw), spec)
+    assert set(match) == {"match_id", "lobby_type", "game_mode", "version", "players"}
+    assert set(match["players"][0]) == set(spec["players"] or {})
+
+    full = measure_decode(raw, None, number=1)
+    selective = measure_decode(raw, spec, number=1)
+    assert selective.retained_bytes < full.retained_bytes / 20
+
+
+def test_real_time_stats_decoder() -> None:
+    """Test that `GetRealtimeStats` decodes into slotted objects with hero lookups and the lead precomputed."""
+    endpoint = "IDOTA2MatchStats_570/GetRealtimeStats/v1"
+    data = select_fields(orjson.loads(synthetic_real_time_stats()), SteamWebAPIClient.fields[endpoint])
+    stats = SteamWebAPIClient.decoders[endpoint](data)
+    assert isinstance(stats, RealTimeStats)
+    assert len(stats.players) == 10
+    assert all(stats.players_by_hero[player.hero_id].hero_id == player.hero_id for player in stats.players)
+    assert stats.net_worth_lead == 0
+    assert not hasattr(stats.players[0], "__dict__")
+
+
+def test_steam_retries_stop_at_deadline_and_hedge_slow_requests() -> None:
+    """Test that empty responses are retried only within the budget and slow requests get a hedged twin."""
+
+    class FakeSteam(SteamWebAPIClient):
+        def __init__(self, delays: list[float]) -> None:
+            super().__init__(api_keys=[""], session=None)  # pyright: ignore[reportArgumentType]
+            self.delays: list[float] = delays
+            self.requests: int = 0
+
+        @override
+        async def request(self, endpoint: str, **params: Any) -> Any:
+            self.requests += 1
+            delay = self.delays[min(self.requests, len(self.delays)) - 1]
+            await asyncio.sleep(delay)
+            return {"ok": self.requests} if delay else {}
+
+    async def main() -> None:
+        steam = FakeSteam([0])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(APIClientError, match="still empty"):
+            await steam.send("Empty", deadline=start + 0.5, hedge=False)
+        assert loop.time() - start < 0.5
+        assert steam.stats["retries_exhausted"] == 1
+
+        with pytest.raises(DeadlineExceededError):
+            await FakeSteam([10]).invoke("Hanging", budget=0.2)
+
+        # p90 ~10ms; the first request hangs so the hedged second one wins
+        steam = FakeSteam([0.01] * steam.min_latency_samples + [10, 0.01])
+        for _ in range(steam.min_latency_samples):
+            await steam.send("Slow", deadline=None, hedge=False)
+        assert await steam.send("Slow", deadline=None, hedge=True) == {"ok": steam.min_latency_samples + 2}
+        assert steam.stats["hedged"] == 1
+
+    asyncio.run(main())
+
+
+def test_circuit_breaker_counts_error_statuses_and_frees_unsent_probes() -> None:
+    """Test that 5xx/429 responses open the circuit and a half-open probe stopped by the rate limit is abandoned."""
+
+    async def main() -> None:
+        client = OpenDotaClient(session=None)  # pyright: ignore[reportArgumentType]
+        client.breaker.reset_timeout = 0
+        for status in (404, 503, 429, 502, 500, 500):
+            async with client.guard() as call:
+                call.status = status
+        assert client.breaker.is_open
+        assert client.stats["failed"] == 5
+
+        client.bucket.tokens = 0
+        client.bucket.rate = 0.001
+        with pytest.raises(RateLimitedError):
+            async with client.guard():
+                pass
+        assert not client.breaker.probing
+        assert client.breaker.allow()
+
+    asyncio.run(main())
+
+
+def test_steam_error_pages_open_the_circuit() -> None:
+    """Test that 503 responses with an HTML body count as failures and open the circuit instead of being decoded."""
+    endpoint = "IDOTA2MatchStats_570/GetRealtimeStats/v1"
+    url = mask_url(URL(f"https://api.steampowered.com/{endpoint}/?key=SECRET&server_steam_id=1"))
+    headers = {"Content-Type": "text/html"}
+    records = [HTTPRecord(0, "GET", url, "", 503, "Service Unavailable", headers, "<html>503</html>", 0.01)]
+
+    async def main() -> SteamWebAPIClient:
+        async with aiohttp.ClientSession(middlewares=(HTTPReplayer(records),)) as session:
+            web_api = SteamWebAPIClient(api_keys=["SECRET"], session=session)
+            for _ in range(web_api.breaker.threshold):
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await web_api.request(endpoint, server_steam_id=1)
+            with pytest.raises(CircuitOpenError):
+                await web_api.request(endpoint, server_steam_id=1)
+        return web_api
+
+    web_api = asyncio.run(main())
+    assert web_api.stats["failed"] == web_api.breaker.threshold
+
+
+def test_replayed_steam_traffic_is_retried_and_decoded_offline() -> None:
+    """Test that recorded responses are served in order (empty `{}` first) and secrets never reach the records."""
+    endpoint = "IDOTA2MatchStats_570/GetRealtimeStats/v1"
+    url = mask_url(URL(f"https://api.steampowered.com/{endpoint}/?key=SECRET&server_steam_id=1"))
+    assert "SECRET" not in url
+    records = [
+        HTTPRecord(0, "GET", url, "", 200, "OK", {"Content-Type": "application/json"}, body.decode("latin-1"), 0.01)
+        for body in (b"{}", synthetic_real_time_stats())
+    ]
+
+    async def main() -> tuple[RealTimeStats, Counter[str], Counter[str]]:
+        replayer = HTTPReplayer(records)
+        async with aiohttp.ClientSession(middlewares=(replayer,)) as session:
+            web_api = SteamWebAPIClient(api_keys=["SECRET"], session=session)
+            stats = await web_api.get_real_time_stats(1)
+            assert await web_api.get_real_time_stats(1) is stats  # cached
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await web_api.request(endpoint, server_steam_id=2)
+        return stats, web_api.stats, replayer.stats
+
+    stats, client_stats, replay_stats = asyncio.run(main())
+    assert len(stats.players) == 10
+    assert client_stats["retries"] == 1
+    assert replay_stats == {"hits": 2, "misses": 1}
+
+
+def test_api_key_pool_rotates_and_cools_down_throttled_keys() -> None:
+    """Test that keys rotate while they have equal quota and a throttled key is out of rotation for its cooldown."""
+    pool = APIKeyPool(["a", "b", "c"], rate_limit=(10, 0.001))
+    keys = [pool.acquire() for _ in range(3)]
+    assert [key and key.value for key in keys] == ["a", "b", "c"]
+
+    b = pool.keys[1]
+    pool.cooldown(b, 60)
+    picked = [pool.acquire() for _ in range(18)]
+    assert b not in picked
+    assert pool.acquire() is None  # "a" and "c" used up all their 10 tokens
+    assert 0 < pool.retry_after() <= 60
+
+
+def test_api_key_pool_skips_keys_out_of_daily_quota_until_next_utc_day() -> None:
+    """Test that a key that made `daily_quota` requests today is skipped and is back once the UTC day changes."""
+    pool = APIKeyPool(["a", "b"], rate_limit=(100, 100), daily_quota=2)
+    picked = [pool.acquire() for _ in range(5)]
+    assert picked[-1] is None
+    assert [key.used_today for key in pool.keys] == [2, 2]
+    assert 0 < pool.retry_after() <= 86_400
+
+    pool.day -= datetime.timedelta(days=1)
+    key = pool.acquire()
+    assert key is not None
+    assert key.used_today == 1
+
+
+def test_stratz_merges_concurrent_queries_into_one_request() -> None:
+    """Test that concurrent queries become one aliased request and every caller gets their own part back."""
+
+    class FakeStratz(StratzClient):
+        def __init__(self) -> None:
+            super().__init__(bearer_token="", session=None)  # pyright: ignore[reportArgumentType]
+            self.posted: list[str] = []
+
+        @override
+        async def post(self, query: str) -> Any:
+            self.posted.append(query)
+            assert "q0_constants: constants" in query
+            assert "q1_constants: constants" in query
+            return {"data": {"q0_constants": {"items": []}, "q1_constants": {"heroes": []}}}
+
+    async def main() -> FakeStratz:
+        stratz = FakeStratz()
+        items, heroes = await asyncio.gather(stratz.get_items(), stratz.get_heroes())
+        assert items == {"data": {"constants": {"items": []}}}
+        assert heroes == {"data": {"constants": {"heroes": []}}}
+        return stratz
+
+    stratz = asyncio.run(main())
+    assert len(stratz.posted) == 1
+    assert stratz.stats["batched_queries"] == 2
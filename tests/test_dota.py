@@ -1,6 +1,14 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 from steam.ext import dota2
 
+from modules.public.d9kmmrbot.budget import ChannelBudget, Cost
+from utils.dota2 import dota2client
 from utils.dota2.tools import extract_hero_index
 
 # pyright bug: if I do `from steam.ext.dota2 import Hero` it will fail to find stubs:
@@ -34,3 +42,82 @@ MATCH_1_HEROES = [
 def test_fuzzy_extract_hero_index(argument: str, expected_hero: Hero, heroes_in_match: list[Hero]) -> None:
     """Test whether `extract_hero_index` function returns expected values."""
     assert extract_hero_index(argument, heroes_in_match)[0] == expected_hero
+
+
+def test_channel_budget_reuses_recent_responses_per_command_argument() -> None:
+    """Test that over-budget requests get the cached response for the same command and argument, bounded by LRU and TTL."""
+
+    def ctx(text: str, command: str = "stats", broadcaster: str = "1") -> Any:
+        return SimpleNamespace(
+            broadcaster=SimpleNamespace(id=broadcaster),
+            command=SimpleNamespace(qualified_name=command),
+            message=SimpleNamespace(text=text),
+        )
+
+    budget = ChannelBudget(capacity=0, rate=0.001, cache_size=2)
+    assert not budget.try_spend(ctx("!stats pa"), Cost.WebAPI)
+    budget.remember(ctx("!stats pa"), "PA: 10/0/5")
+    budget.remember(ctx("!stats cm"), "CM: 1/9/20")
+    assert budget.over_budget_response(ctx("!stats   PA"), Cost.WebAPI) == "[cached] PA: 10/0/5"
+    assert not budget.try_spend(ctx("!stats pa", broadcaster="2"), Cost.WebAPI)
+    assert budget.over_budget_response(ctx("!stats pa", broadcaster="2"), Cost.WebAPI).startswith("Too many")
+
+    # "cm" is the least recently used one; long arguments are cut in the key
+    budget.remember(ctx("!stats " + "x" * 500), "?")
+    assert list(budget.responses) == [("1", "stats", "pa"), ("1", "stats", "x" * budget.max_argument_length)]
+
+    budget.cache_ttl = -1
+    budget.remember(ctx("!stats pa"), "PA: 10/0/5")
+    assert budget.cached_response(ctx("!stats pa")) is None
+
+
+class FlakyLoginClient:
+    """Stands in for `Dota2Client` in the pool: login fails (i.e. `NoCMsFound`) unless it's a recreated client."""
+
+    def __init__(self, *, fail: bool, shard: int = 0) -> None:
+        self.shard = shard
+        self.fail = fail
+        self.ready = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.gc_disconnected = asyncio.Event()
+        self.gc_reconnected = asyncio.Event()
+
+    async def login(self) -> None:
+        if self.fail:
+            raise ConnectionError
+        self.ready.set()
+        await asyncio.Event().wait()  # stay connected
+
+    async def wait_until_ready(self) -> None:
+        await self.ready.wait()
+
+    async def wait_until_gc_ready(self) -> None:
+        await self.ready.wait()
+
+    async def disconnect(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def recreate(self) -> FlakyLoginClient:
+        return FlakyLoginClient(fail=False, shard=self.shard)
+
+
+def test_dota2_pool_gets_ready_when_first_login_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that waiting for the pool started before a failed login is done once the recreated client is ready."""
+    monkeypatch.setattr(dota2client, "ExponentialBackoff", lambda: SimpleNamespace(delay=lambda: 0.0))
+
+    async def main() -> None:
+        bot: Any = SimpleNamespace(dispatch=lambda *_: None, dota2=None)
+        first = FlakyLoginClient(fail=True)
+        pool = dota2client.Dota2ClientPool(bot, clients=[first])  # pyright: ignore[reportArgumentType]
+        waiters = asyncio.gather(pool.wait_until_ready(), pool.wait_until_gc_ready())
+        login = asyncio.create_task(pool.login())
+        async with asyncio.timeout(5):
+            await waiters
+        assert pool.primary is not first
+        assert bot.dota2 is pool.primary
+
+        await pool.close()
+        await login
+
+    asyncio.run(main())
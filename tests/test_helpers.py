@@ -0,0 +1,31 @@
+from utils.helpers import CircuitBreaker, TokenBucket
+
+
+def test_token_bucket_burst_and_retry_after() -> None:
+    """Test that `TokenBucket` allows a burst up to its capacity and then asks to wait."""
+    bucket = TokenBucket(capacity=10, rate=0.001)
+    assert bucket.try_spend(5)
+    assert bucket.try_spend(3)
+    assert not bucket.try_spend(3)
+    # ~2 tokens left, so 3 more tokens take ~1000 seconds at 0.001 tokens/sec
+    assert 900 < bucket.retry_after(3) <= 1000
+
+
+def test_circuit_breaker_opens_and_probes() -> None:
+    """Test that `CircuitBreaker` opens after consecutive failures and lets a single half-open probe through."""
+    breaker = CircuitBreaker(threshold=3, reset_timeout=0.0)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.is_open
+
+    # reset_timeout=0 so it's half-open right away: one probe at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
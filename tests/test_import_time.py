@@ -0,0 +1,58 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+SRC = pathlib.Path(__file__).parents[1] / "src"
+
+HEAVY_PACKAGES = ("discord", "twitchio", "steam", "asyncpg", "aiohttp")
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run python with `-X importtime` and return top-level package -> its cumulative import time in microseconds."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, env=env, cwd=SRC, check=True
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        package = name.strip().split(".")[0]
+        times[package] = max(times.get(package, 0), int(cumulative))
+    return times
+
+
+# absolute timings depend on the machine (and its load), so budgets are only checked when asked for, i.e. on the VPS
+budgets = pytest.mark.skipif(not os.environ.get("IMPORT_TIME_BUDGETS"), reason="set IMPORT_TIME_BUDGETS=1 to check")
+
+
+def test_cli_help_does_not_import_heavy_dependencies() -> None:
+    """Test that `main.py --help` is answered without importing the bot's heavy dependencies."""
+    times = import_times("main.py", "--help")
+    assert not set(HEAVY_PACKAGES) & times.keys()
+
+
+@pytest.mark.parametrize("module", ["core", "utils"])
+def test_import_does_not_pull_steam(module: str) -> None:
+    """Test that importing bot's core doesn't pull `steam` in (only the dota module needs it)."""
+    assert "steam" not in import_times("-c", f"import {module}")
+
+
+@budgets
+@pytest.mark.parametrize(
+    ("args", "package", "budget"),
+    [
+        (("main.py", "--help"), None, 1_500_000),  # generous, it's ~100ms locally
+        (("-c", "import core"), "core", 3_000_000),
+        (("-c", "import utils"), "utils", 50_000),
+    ],
+)
+def test_import_time_budget(args: tuple[str, ...], package: str | None, budget: int) -> None:
+    """Test that imports stay within their time budget (in microseconds); `None` package means the total."""
+    times = import_times(*args)
+    assert (sum(times.values()) if package is None else times[package]) < budget
@@ -0,0 +1,7 @@
+from modules import module_graph
+
+
+def test_module_graph_adds_declared_dependencies() -> None:
+    """Test that dependencies declared as `DEPENDENCIES` are read without importing and added to the graph."""
+    graph = module_graph(["modules.public.d9kmmrbot"])
+    assert graph == {"modules.public.d9kmmrbot": ("modules.dev.required",), "modules.dev.required": ()}
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+import pytest
+
+from modules.public.d9kmmrbot.rp_flow import Dota2RichPresenceFlow
+
+from .fake_steam import FakeSteamConfig, StubBot
+
+log = logging.getLogger(__name__)
+
+
+async def soak(bot: StubBot, duration: float) -> Dota2RichPresenceFlow:
+    """Run the flow against synthetic friends for `duration` seconds."""
+    flow = Dota2RichPresenceFlow(bot)  # pyright: ignore[reportArgumentType]
+    await flow.starting_fill_friends()
+    bot.add_listener(flow.steam_user_update, event="event_steam_user_update")
+
+    runner = asyncio.create_task(bot.dota2_pool.run_lifecycles(stop=asyncio.Event()))
+    await asyncio.sleep(duration)
+    runner.cancel()
+    await bot.wait_for_listeners()
+
+    for match in [*flow.play_matches_index.values(), *flow.watch_matches_index.values()]:
+        match.update_data.cancel()
+    flow.process_pending_matches.cancel()
+    return flow
+
+
+@pytest.mark.parametrize(("friends", "shards"), [(50, 1), (300, 3)])
+def test_rich_presence_flow_soak(friends: int, shards: int) -> None:
+    """Test that the flow keeps up with hundreds of friends going through game lifecycles without errors."""
+    duration = 3.0
+    bot = StubBot(FakeSteamConfig(latency=0.005, jitter=0.002, speed=300), friends=friends, shards=shards)
+    flow = asyncio.run(soak(bot, duration))
+
+    events = bot.dispatched["steam_user_update"]
+    gc_calls = sum(sum(client.calls.values()) for client in bot.dota2_pool.clients)
+    log.info(
+        "%s friends: %.1f events/sec, %.2f GC calls/event, %.2f DB calls/event",
+        friends,
+        events / duration,
+        gc_calls / max(events, 1),
+        sum(bot.pool.calls.values()) / max(events, 1),
+    )
+    assert len(flow.friends) == friends
+    assert events > friends
+    assert not bot.error_manager.errors
+    assert flow.play_matches_index
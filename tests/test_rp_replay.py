@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from modules.public.d9kmmrbot.recorder import RichPresenceRecorder, read_records
+from utils.dota2 import Status, SteamUserUpdate
+
+from .fake_steam import DOTA_APP_ID, FakeApp, FakeSteamConfig, FakeUser, StubBot
+from .rp_replay import replay
+
+if TYPE_CHECKING:
+    import pathlib
+
+LIFECYCLE: list[dict[str, str] | None] = [
+    {"status": Status.MainMenu.value},
+    {"status": Status.Finding.value},
+    {"status": Status.HeroSelection.value, "WatchableGameID": "26628083923497984"},
+    {"status": Status.Playing.value, "WatchableGameID": "26628083923497984", "param1": "1"},
+    {"status": Status.Playing.value, "WatchableGameID": "26628083923497984", "param1": "2"},
+    {"status": Status.MainMenu.value},
+    None,
+]
+
+
+def record_lifecycle(path: pathlib.Path) -> int:
+    """Record one friend's game lifecycle with `RichPresenceRecorder`; return amount of recorded updates."""
+    client = StubBot(FakeSteamConfig(), friends=0).dota2
+    recorder = RichPresenceRecorder(path)
+    before = FakeUser(client, 1, "Irene")
+    for rich_presence in LIFECYCLE:
+        after = FakeUser(client, 1, "Irene", rich_presence, FakeApp(DOTA_APP_ID) if rich_presence else None)
+        recorder.record(SteamUserUpdate(before=before, after=after))  # pyright: ignore[reportArgumentType]
+        before = after
+        # flush every update so the log consists of several zstd frames
+        asyncio.run(recorder.flush())
+    return recorder.recorded
+
+
+def test_rich_presence_recorder_roundtrip(tmp_path: pathlib.Path) -> None:
+    """Test that recorded updates are read back in order and intact."""
+    path = tmp_path / "rp.jsonl.zst"
+    assert record_lifecycle(path) == len(LIFECYCLE)
+
+    records = list(read_records(path))
+    assert [r.after for r in records] == LIFECYCLE
+    assert [r.in_dota for r in records] == [bool(rp) for rp in LIFECYCLE]
+
+
+def test_rich_presence_replay(tmp_path: pathlib.Path) -> None:
+    """Test that a recorded lifecycle replays through the flow with expected activity transitions."""
+    path = tmp_path / "rp.jsonl.zst"
+    record_lifecycle(path)
+
+    report = asyncio.run(replay(read_records(path)))
+    assert report.events == len(LIFECYCLE)
+    assert not report.errors
+    assert report.transitions["Dashboard", "PlayingPartial"] == 1
+    assert report.transitions["PlayingPartial", "Dashboard"] == 1
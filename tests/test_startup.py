@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from core.startup import StartupTimeline
+
+
+def test_startup_timeline_is_ready_after_expected_phases() -> None:
+    """Test that the timeline is ready once every expected phase is done and only the first run of a phase counts."""
+
+    async def main() -> StartupTimeline:
+        timeline = StartupTimeline(started=0.0)
+        timeline.expect("pool", "modules")
+        timeline.record("pool", 1.0, 2.0)
+        timeline.record("pool", 5.0, 9.0)  # i.e. reconnect
+        assert not timeline.ready.is_set()
+
+        with pytest.raises(RuntimeError), timeline.phase("modules"):
+            raise RuntimeError
+        assert "modules" not in timeline.phases
+        assert not timeline.ready.is_set()
+
+        with timeline.phase("modules"):
+            pass
+        return timeline
+
+    timeline = asyncio.run(main())
+    assert timeline.ready.is_set()
+    assert list(timeline.durations()) == ["pool", "modules"]
+    assert timeline.durations()["pool"] == 1.0
+    assert timeline.total == timeline.phases["modules"][1]
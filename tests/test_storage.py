@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, override
+
+from utils.dota2.storage import DenseIdMap, GameDataStorage, Item, PatchWatcher, Snapshot
+
+from .fake_steam import StubErrorManager, StubWebhook
+from .storage_benchmark import LAYOUTS, measure, synthetic_names
+
+
+class FakeItems(GameDataStorage[Item, Item]):
+    """`Items`-like storage that counts how many times the source is hit."""
+
+    def __init__(self) -> None:
+        bot = type("StubBot", (), {"error_webhook": StubWebhook(), "error_manager": StubErrorManager()})()
+        super().__init__(bot)  # pyright: ignore[reportArgumentType]
+        self.fills: int = 0
+
+    @override
+    async def fill_data(self) -> dict[int, Item]:
+        self.fills += 1
+        await asyncio.sleep(0.01)
+        return {1: Item(1, "Blink Dagger")}
+
+    @override
+    async def write_snapshot(self, snapshot: Snapshot[Item]) -> None:
+        pass
+
+    @override
+    def from_snapshot(self, data: dict[str, Any]) -> dict[int, Item]:
+        return {int(k): Item(**v) for k, v in data.items()}
+
+    @override
+    @staticmethod
+    def generate_unknown_object(object_id: int) -> Item:
+        return Item(object_id, "Unknown Item")
+
+
+def test_unknown_ids_share_one_refresh_and_are_negative_cached() -> None:
+    """Test that concurrent misses share one refresh and a confirmed-unknown ID doesn't refresh again."""
+
+    async def main() -> FakeItems:
+        storage = FakeItems()
+        storage.cached_data = {}
+        items = await asyncio.gather(*(storage.by_id(1) for _ in range(5)), *(storage.by_id(2) for _ in range(5)))
+        assert [item.display_name for item in items] == ["Blink Dagger"] * 5 + ["Unknown Item"] * 5
+        assert await storage.by_id(2) == Item(2, "Unknown Item")
+        return storage
+
+    storage = asyncio.run(main())
+    assert storage.fills == 1
+    assert list(storage.unknown_ids) == [2]
+    assert list(storage.reported_ids) == [2]
+
+
+def test_dense_id_map_memory_is_bounded() -> None:
+    """Test that `DenseIdMap` behaves like the dict it replaces and stays within ~a pointer per ID slot."""
+    names = synthetic_names(ids=10_000, fill=0.7)
+    dense = DenseIdMap(names.items())
+    assert dict(dense) == names
+    assert 10_001 not in dense
+    assert -1 not in dense
+
+    dense_size = measure(LAYOUTS["DenseIdMap[str]"], names)
+    assert dense_size < measure(LAYOUTS["dict[int, Item]"], names) / 4
+    assert dense_size < 10 * 10_000 + 4096
+
+
+def test_patch_watcher_refreshes_only_on_new_version() -> None:
+    """Test that storages are downloaded once per game version and not on every check."""
+
+    async def main() -> FakeItems:
+        storage = FakeItems()
+        versions = iter([170, 170, 171])
+        storage.bot.dota2 = SimpleNamespace(  # pyright: ignore[reportAttributeAccessIssue]
+            stratz=SimpleNamespace(get_latest_game_version=lambda: asyncio.sleep(0, next(versions))),
+        )
+        watcher = PatchWatcher(storage.bot, [storage])
+        for _ in range(3):
+            await watcher.check_version()
+        return storage
+
+    storage = asyncio.run(main())
+    assert storage.fills == 2
+    assert storage.version == 171